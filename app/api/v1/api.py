@@ -1,7 +1,13 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import integration, datasets
+from app.api.v1.endpoints import integration, datasets, cron, query, rankings, timeseries, quality, approx
 
 api_router = APIRouter()
 
 api_router.include_router(integration.router, prefix="/integration", tags=["powerbi-integration"])
 api_router.include_router(datasets.router, prefix="/datasets", tags=["datasets"])
+api_router.include_router(cron.router, prefix="/cron", tags=["cron"])
+api_router.include_router(query.router, prefix="/query", tags=["query"])
+api_router.include_router(rankings.router, prefix="/rankings", tags=["rankings"])
+api_router.include_router(timeseries.router, prefix="/timeseries", tags=["timeseries"])
+api_router.include_router(quality.router, prefix="/quality", tags=["quality"])
+api_router.include_router(approx.router, prefix="/approx", tags=["approx"])
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.artifacts import get_columnar_store
+from app.dependencies import validate_api_key
+
+router = APIRouter()
+
+LEVEL_PATTERN = "^(national|state|district)$"
+
+
+def _require_sketches(store):
+    if not store.has_sketches():
+        raise HTTPException(status_code=404, detail="This release has no sketches; re-run process_data.py.")
+
+
+async def _timed(compute):
+    def execute():
+        started = time.perf_counter()
+        try:
+            results = compute()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Dates must be YYYY-MM or YYYY-MM-DD.")
+        return {"results": results, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+    return await asyncio.to_thread(execute)
+
+
+@router.get("/distinct", dependencies=[Depends(validate_api_key)])
+async def get_distinct_pincodes(
+    level: str = Query("national", pattern=LEVEL_PATTERN),
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    start: Optional[str] = Query(None, description="First month, inclusive (YYYY-MM)"),
+    end: Optional[str] = Query(None, description="Last month, inclusive (YYYY-MM)"),
+    by_month: bool = Query(False, description="One result per month as well"),
+):
+    """
+    Approximate number of distinct pincodes with activity per state/district
+    (or nationally), optionally per month, merged from per-(district, month)
+    HyperLogLog sketches (about 1.6% standard error) without scanning rows.
+    """
+    store = await get_columnar_store()
+    _require_sketches(store)
+    result = await _timed(lambda: store.distinct_pincodes(level, state, district, start, end, by_month))
+    return {"level": level, **result}
+
+
+@router.get("/quantiles", dependencies=[Depends(validate_api_key)])
+async def get_quantiles(
+    metric: str = "total_activity",
+    q: str = Query("0.5,0.95", description="Comma separated quantiles in [0, 1]"),
+    level: str = Query("national", pattern=LEVEL_PATTERN),
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    start: Optional[str] = Query(None, description="First month, inclusive (YYYY-MM)"),
+    end: Optional[str] = Query(None, description="Last month, inclusive (YYYY-MM)"),
+    by_month: bool = Query(False, description="One result per month as well"),
+):
+    """
+    Approximate quantiles of a metric's daily district totals (e.g. p95 daily
+    enrolment of a district), pooled over the districts and days of each
+    state/district/national group. Merged from per-(district, month) sketches
+    with 1% relative accuracy.
+    """
+    store = await get_columnar_store()
+    _require_sketches(store)
+    metrics = store.describe()["sketch_metrics"]
+    if metric not in metrics:
+        raise HTTPException(status_code=400, detail=f"No sketches for '{metric}'. Available: {metrics}")
+    try:
+        qs = [float(v) for v in q.split(",") if v.strip()]
+    except ValueError:
+        qs = []
+    if not qs or any(not 0 <= v <= 1 for v in qs):
+        raise HTTPException(status_code=400, detail="q must be comma separated numbers in [0, 1].")
+
+    result = await _timed(lambda: store.quantiles(metric, qs, level, state, district, start, end, by_month))
+    return {"metric": metric, "level": level, **result}
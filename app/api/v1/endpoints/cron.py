@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from app.core.prewarm import run_prewarm
+from app.dependencies import validate_cron_secret
+
+router = APIRouter()
+
+@router.get("/prewarm", dependencies=[Depends(validate_cron_secret)])
+async def prewarm():
+    """
+    Warms release metadata, artifacts and pooled upstream connections.
+    
+    Triggered daily by the Vercel cron in vercel.json so the first real
+    request after a deploy or cold start skips the setup latency.
+    """
+    return await run_prewarm()
@@ -1,16 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
-import os
-import httpx
+import asyncio
+import time
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import FileResponse, Response
+
+from app.core.artifacts import fetch_artifact, get_changes_manifest, get_samples_manifest
+from app.core.changes import compose, delta_chain, read_delta, write_rows
+from app.core.config import settings
+from app.core.github import get_asset_url, get_client, github_headers
+from app.core.metrics import DATASET_BYTES, UPSTREAM_ERRORS, UPSTREAM_LATENCY
+from app.core.relay import RelayStreamingResponse, relay
 from app.dependencies import validate_api_key
 
 router = APIRouter()
 
-# Config
-STORAGE_REPO = "sreecharan-desu/uidai-data-storage"
-GH_PAT = os.getenv("GH_PAT") or os.getenv("GH_TOKEN")
-
 # Dataset Maps
 PROCESSED_DATASET_MAP = {
     "biometric": "biometric_full.csv",
@@ -20,6 +24,14 @@ PROCESSED_DATASET_MAP = {
     "master": "master_dataset_final.csv"
 }
 
+# source_dataset value of each processed dataset's rows (master: all)
+DATASET_SOURCES = {
+    "biometric_full.csv": "Biometric",
+    "enrollment_full.csv": "Enrollment",
+    "demographic_full.csv": "Demographic",
+    "master_dataset_final.csv": None
+}
+
 RAW_DATASET_MAP = {
     "biometric": "biometric.csv",
     "enrollment": "enrolment.csv",
@@ -29,54 +41,37 @@ RAW_DATASET_MAP = {
 
 async def stream_from_github(filename: str, tag: str):
     """Streams a file from a private GitHub release using async httpx."""
-    if not GH_PAT:
-        raise HTTPException(status_code=500, detail="Server configuration error: Missing GitHub Token.")
+    # 1. Resolve the asset url (cached release metadata, pooled connection)
+    asset_url = await get_asset_url(filename, tag)
 
-    headers = {
-        "Authorization": f"token {GH_PAT}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
-    asset_url = None
-    
-    # 1. Get Asset ID (Fast one-off request)
-    async with httpx.AsyncClient() as client:
-        # Get Release Assets
-        api_url = f"https://api.github.com/repos/{STORAGE_REPO}/releases/tags/{tag}"
-        resp = await client.get(api_url, headers=headers)
-        
-        if resp.status_code != 200:
-            print(f"GitHub API Error: {resp.text}")
-            raise HTTPException(status_code=404, detail="Release not found.")
-            
-        assets = resp.json().get("assets", [])
-        for asset in assets:
-            if asset["name"] == filename:
-                asset_url = asset["url"] # This is the API url for the asset
-                break
-                
-        if not asset_url:
-            raise HTTPException(status_code=404, detail=f"File '{filename}' not found in release '{tag}'.")
-
-    # 2. Define Stream Generator (Manages its own client)
-    async def iterfile():
-        # Use a fresh client for the stream to ensure context is kept open during iteration
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-             # We need to set Accept header for binary stream
-            stream_headers = headers.copy()
-            stream_headers["Accept"] = "application/octet-stream"
-            
-            # Using client.stream context manager ensures proper cleanup
-            req = client.build_request("GET", asset_url, headers=stream_headers)
-            r = await client.send(req, stream=True)
-            r.raise_for_status()
-            
-            async for chunk in r.aiter_bytes():
-                yield chunk
-            
+    # We need to set Accept header for binary stream
+    stream_headers = github_headers(accept="application/octet-stream")
+
+    # Resolve the metric child once; per-chunk accounting is a single add
+    bytes_streamed = DATASET_BYTES.labels(filename, tag)
+
+    # 2. Open the upstream lazily (reuses the shared pooled client); the relay
+    # owns it from here and closes it on completion, disconnect or stall
+    async def open_upstream():
+        client = get_client()
+        req = client.build_request("GET", asset_url, headers=stream_headers)
+        started = time.perf_counter()
+        r = await client.send(req, stream=True)
+        UPSTREAM_LATENCY.labels("asset_stream_open").observe(time.perf_counter() - started)
+        if r.is_error:
+            UPSTREAM_ERRORS.labels("asset_stream", r.status_code).inc()
             await r.aclose()
+            r.raise_for_status()
+        return r
 
-    return StreamingResponse(iterfile(), media_type="text/csv", headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+    body = relay(
+        open_upstream,
+        chunk_size=settings.STREAM_CHUNK_SIZE,
+        buffer_chunks=settings.STREAM_BUFFER_CHUNKS,
+        stall_timeout=settings.STREAM_STALL_TIMEOUT,
+        on_chunk=bytes_streamed.inc
+    )
+    return RelayStreamingResponse(body, media_type="text/csv", headers={"Content-Disposition": f'attachment; filename="{filename}"'})
 
 @router.get("/raw/{dataset_name}", dependencies=[Depends(validate_api_key)])
 async def get_raw_dataset(dataset_name: str):
@@ -90,6 +85,83 @@ async def get_raw_dataset(dataset_name: str):
     
     return await stream_from_github(RAW_DATASET_MAP[clean_name], tag="dataset-raw")
 
+def _read_deltas(paths, source):
+    if not paths:
+        return None, []
+    header, deltas = None, []
+    for path in paths:
+        with open(path, "rb") as f:
+            header, rows = read_delta(f.read())
+        if source is not None:
+            at = header.index("source_dataset")
+            rows = [row for row in rows if row[at] == source]
+        deltas.append(rows)
+    return header, compose(header, deltas)
+
+
+@router.get("/{dataset_name}/changes", dependencies=[Depends(validate_api_key)])
+async def get_dataset_changes(
+    dataset_name: str,
+    since: Optional[str] = Query(None, description="Dataset version the client holds; omit to get the current version"),
+):
+    """
+    Rows added, removed or changed in a processed dataset since the release
+    `since`, as CSV: `op`, `occurrence` (ordinal among rows with the same
+    date/state/district/pincode/source_dataset key), then the dataset row.
+    Without `since`, returns the current version and the available deltas.
+    A `since` older than the kept history answers 410: download the full
+    dataset again.
+    """
+    clean_name = dataset_name.lower().replace(".csv", "")
+    if clean_name not in PROCESSED_DATASET_MAP:
+        raise HTTPException(status_code=404, detail=f"Processed dataset '{dataset_name}' not found.")
+
+    manifest = await get_changes_manifest()
+    if since is None:
+        return {"dataset": clean_name, "version": manifest["version"], "history": manifest["history"]}
+
+    chain = delta_chain(manifest, since)
+    if chain is None:
+        raise HTTPException(
+            status_code=410,
+            detail=f"No change history from version '{since}' to '{manifest['version']}'. Download /api/datasets/{clean_name} again."
+        )
+
+    paths = await asyncio.gather(*(fetch_artifact(entry["asset"]) for entry in chain))
+    header, rows = await asyncio.to_thread(_read_deltas, paths, DATASET_SOURCES[PROCESSED_DATASET_MAP[clean_name]])
+    headers = {"X-Dataset-Version": manifest["version"], "X-Since-Version": since}
+    if header is None:
+        return Response("", media_type="text/csv", headers=headers)
+    return Response(write_rows(header, rows), media_type="text/csv", headers=headers)
+
+
+@router.get("/{dataset_name}/sample", dependencies=[Depends(validate_api_key)])
+async def get_dataset_sample(
+    dataset_name: str,
+    rate: float = Query(0.01, description="Sampling rate: 0.001, 0.01 or 0.1"),
+):
+    """
+    Deterministic sample of a processed dataset, stratified by state x
+    source_dataset, for previews and notebooks. Samples are nested (the 0.1%
+    rows are in the 1% sample, which is in the 10%), identical across
+    requests, and carry a `sample_weight` column (stratum rows per sampled
+    row) for scaling sums back up.
+    """
+    clean_name = dataset_name.lower().replace(".csv", "")
+    if clean_name not in PROCESSED_DATASET_MAP:
+        raise HTTPException(status_code=404, detail=f"Processed dataset '{dataset_name}' not found.")
+    if clean_name == "enrolment":
+        clean_name = "enrollment"
+
+    manifest = await get_samples_manifest()
+    entry = manifest["files"][clean_name].get(f"{rate:g}")
+    if entry is None:
+        raise HTTPException(status_code=400, detail=f"No {rate:g} sample. Available rates: {manifest['rates']}")
+
+    path = await fetch_artifact(entry["asset"])
+    return FileResponse(path, media_type="text/csv", filename=entry["asset"])
+
+
 @router.get("/{dataset_name}", dependencies=[Depends(validate_api_key)])
 async def get_processed_dataset(dataset_name: str):
     """
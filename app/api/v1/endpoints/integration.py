@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse, RedirectResponse
 
 
+from app.core.artifacts import fetch_artifact, get_partition_manifest
+from app.core.config import settings
+from app.core.partitions import date_window, iter_partition, parse_bound, select_partitions
+from app.core.relay import RelayStreamingResponse
 from app.dependencies import validate_api_key
 
 router = APIRouter()
@@ -31,3 +38,53 @@ async def get_powerbi_master_data():
         print(f"Error serving Master CSV: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.get("/powerbi/incremental", dependencies=[Depends(validate_api_key)])
+async def get_powerbi_incremental(
+    range_start: str = Query(..., alias="RangeStart", description="Window start, inclusive (ISO date or datetime)"),
+    range_end: str = Query(..., alias="RangeEnd", description="Window end, exclusive (ISO date or datetime)"),
+):
+    """
+    Master Dataset rows with RangeStart <= date < RangeEnd, for PowerBI
+    incremental refresh. Rows come from the month-partitioned release assets,
+    so refreshing one month reads one month file instead of the full CSV.
+
+    In Power Query pass the parameters as ISO text, e.g.
+    `Web.Contents(url, [Query = [RangeStart = DateTime.ToText(RangeStart, "yyyy-MM-ddTHH:mm:ss"), ...]])`.
+    """
+    try:
+        start, end = parse_bound(range_start), parse_bound(range_end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="RangeStart and RangeEnd must be ISO dates or datetimes.")
+    if end < start:
+        raise HTTPException(status_code=400, detail="RangeEnd must not be before RangeStart.")
+
+    manifest = await get_partition_manifest()
+    lo, hi = date_window(start, end)
+    selected = select_partitions(manifest, lo, hi)
+    # Fetch every month up front so a missing asset fails the request, not the stream
+    paths = await asyncio.gather(*(fetch_artifact(partition["asset"]) for partition, _ in selected))
+
+    async def body():
+        # One reader thread per response: reads run in order, and the final
+        # close() queues behind a read still in flight after a disconnect
+        reader = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        chunks = None
+        try:
+            yield (manifest["header"] + "\n").encode()
+            for path, (_, inside) in zip(paths, selected):
+                chunks = iter_partition(path, None if inside else lo, None if inside else hi, settings.STREAM_CHUNK_SIZE)
+                while True:
+                    chunk = await loop.run_in_executor(reader, next, chunks, None)
+                    if chunk is None:
+                        break
+                    yield chunk
+        finally:
+            # Synchronous on purpose: this can run inside a cancelled scope
+            if chunks is not None:
+                reader.submit(chunks.close)
+            reader.shutdown(wait=False)
+
+    filename = f"master_{lo}_{hi}.csv"
+    return RelayStreamingResponse(body(), media_type="text/csv", headers={"Content-Disposition": f'attachment; filename="{filename}"'})
@@ -0,0 +1,42 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.artifacts import get_quality_report
+from app.dependencies import validate_api_key
+
+router = APIRouter()
+
+
+@router.get("", dependencies=[Depends(validate_api_key)])
+async def get_data_quality(
+    source: Optional[str] = Query(None, description="Only this source: Biometric, Enrollment or Demographic"),
+    state: Optional[str] = Query(None, description="Only this state"),
+    top: int = Query(50, ge=0, le=50, description="How many unmapped spellings to list"),
+):
+    """
+    Data-quality report of the latest processing run: per-source and per-state
+    rates of invalid states, Unknown districts, pincode recoveries, unparseable
+    dates and negative/outlier counts, plus the most frequent raw district and
+    state spellings that no alias matched and the fuzzy-matched ones.
+    """
+    report = await get_quality_report()
+    lists = ("unmapped_districts", "unmapped_states", "fuzzy_matched_districts")
+    result = {k: v for k, v in report.items() if k not in ("by_source", "by_state") + lists}
+    for key, value in (("by_source", source), ("by_state", state)):
+        if value is None:
+            result[key] = report[key]
+            continue
+        matches = {k: v for k, v in report[key].items() if k.lower() == value.lower()}
+        if not matches:
+            raise HTTPException(status_code=404, detail=f"No quality data for '{value}'. Available: {list(report[key])}")
+        result[key] = matches
+
+    # The district lists keep the top spellings of every state, most frequent
+    # first: filter to the state before truncating
+    for key in lists:
+        entries = report.get(key, [])
+        if state is not None and key != "unmapped_states":
+            entries = [entry for entry in entries if str(entry["state"]).lower() == state.lower()]
+        result[key] = entries[:top]
+    return result
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.artifacts import get_columnar_store
+from app.dependencies import validate_api_key
+
+router = APIRouter()
+
+# Same as app.core.columnar.GROUP_COLUMNS, repeated so startup does not import numpy
+GROUP_COLUMNS = ("state", "district", "source_dataset", "pincode", "month", "date")
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+@router.get("/meta", dependencies=[Depends(validate_api_key)])
+async def get_query_meta():
+    """
+    Describes the queryable store: row count, metrics, group-by columns, date range and states.
+    """
+    store = await get_columnar_store()
+    return store.describe()
+
+
+@router.get("", dependencies=[Depends(validate_api_key)])
+async def run_query(
+    metrics: str = Query("total_activity", description="Comma separated metric columns to sum"),
+    group_by: Optional[str] = Query(None, description="Comma separated: state, district, source_dataset, pincode, month, date"),
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    source: Optional[str] = Query(None, description="Biometric, Enrollment or Demographic"),
+    pincode: Optional[int] = Query(None, ge=0, le=999999, description="6-digit pincode"),
+    start: Optional[str] = Query(None, description="Inclusive start date (YYYY-MM-DD or YYYY-MM)"),
+    end: Optional[str] = Query(None, description="Inclusive end date (YYYY-MM-DD or YYYY-MM)"),
+    sort: Optional[str] = Query(None, description="Metric to sort groups by (default: first metric)"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=10000),
+):
+    """
+    Filters and aggregates the processed dataset over the memory-mapped
+    columnar store, e.g. total_activity per district of a state in a month.
+    Filters are resolved through the secondary indexes, so only matching rows are read.
+    """
+    store = await get_columnar_store()
+
+    metric_list = _split(metrics)
+    unknown = [m for m in metric_list if m not in store.metrics]
+    if not metric_list or unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics {unknown}. Available: {store.metrics}")
+    group_list = _split(group_by)
+    unknown = [g for g in group_list if g not in GROUP_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot group by {unknown}. Available: {list(GROUP_COLUMNS)}")
+    sort_key = sort or metric_list[0]
+    if sort_key not in metric_list and sort_key != "rows":
+        raise HTTPException(status_code=400, detail="sort must be one of the requested metrics or 'rows'.")
+
+    def execute():
+        started = time.perf_counter()
+        try:
+            rows = store.select(state=state, district=district, source=source, pincode=pincode, start=start, end=end)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD or YYYY-MM.")
+        groups = store.aggregate(metric_list, group_list, rows)
+        groups.sort(key=lambda g: g[sort_key], reverse=order == "desc")
+        return {
+            "rows_matched": store.count(rows),
+            "groups_total": len(groups),
+            "groups": groups[:limit],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    # numpy releases the GIL for the heavy lifting; keep the event loop free meanwhile
+    return await asyncio.to_thread(execute)
+
+
+@router.get("/rows", dependencies=[Depends(validate_api_key)])
+async def get_rows(
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    source: Optional[str] = Query(None, description="Biometric, Enrollment or Demographic"),
+    pincode: Optional[int] = Query(None, ge=0, le=999999, description="6-digit pincode"),
+    start: Optional[str] = Query(None, description="Inclusive start date (YYYY-MM-DD or YYYY-MM)"),
+    end: Optional[str] = Query(None, description="Inclusive end date (YYYY-MM-DD or YYYY-MM)"),
+    metrics: Optional[str] = Query(None, description="Comma separated metric columns to include (default: all)"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """
+    Point lookups, e.g. all rows for pincode 560001 or a district in March.
+    At least one filter is required; matching rows are located via the secondary indexes.
+    """
+    if not any(v is not None for v in (state, district, source, pincode, start, end)):
+        raise HTTPException(status_code=400, detail="Provide at least one filter (state, district, source, pincode, start, end).")
+    store = await get_columnar_store()
+
+    metric_list = _split(metrics) or store.metrics
+    unknown = [m for m in metric_list if m not in store.metrics]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics {unknown}. Available: {store.metrics}")
+
+    def execute():
+        started = time.perf_counter()
+        try:
+            rows = store.select(state=state, district=district, source=source, pincode=pincode, start=start, end=end)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD or YYYY-MM.")
+        page = rows[offset:offset + limit]
+        return {
+            "rows_matched": len(rows),
+            "offset": offset,
+            "rows": store.records(page, ("date", "state", "district", "pincode", "source_dataset", *metric_list)),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    return await asyncio.to_thread(execute)
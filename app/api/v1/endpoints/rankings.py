@@ -0,0 +1,69 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.artifacts import get_columnar_store
+from app.dependencies import validate_api_key
+
+router = APIRouter()
+
+LEVEL_PATTERN = "^(state|district)$"
+
+
+def _check(store, metric: str, period: str, level: str, state: Optional[str]):
+    if state is not None and level == "state":
+        raise HTTPException(status_code=400, detail="'state' only filters district rankings; use level=district.")
+    if metric not in store.metrics:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}'. Available: {store.metrics}")
+    try:
+        store.period_index(period)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"No data for period '{period}'. Available: {store.describe()['months']}")
+
+
+@router.get("/top", dependencies=[Depends(validate_api_key)])
+async def get_top(
+    metric: str = "total_activity",
+    level: str = Query("district", pattern=LEVEL_PATTERN),
+    period: str = Query("all", description="YYYY-MM, or 'all' for all time"),
+    n: int = Query(20, ge=1, le=1000),
+    state: Optional[str] = Query(None, description="Only rank districts within this state"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    """
+    Top (or bottom) N states/districts by a metric, e.g. the top 20 districts by
+    total_activity this month. Served from precomputed rankings, without a scan.
+    """
+    store = await get_columnar_store()
+    _check(store, metric, period, level, state)
+    return {
+        "metric": metric,
+        "level": level,
+        "period": period,
+        "results": store.top(level, metric, period, n, state=state, ascending=order == "asc")
+    }
+
+
+@router.get("/growth", dependencies=[Depends(validate_api_key)])
+async def get_growth(
+    period: str = Query(..., description="YYYY-MM; growth is measured against the previous month"),
+    metric: str = "total_activity",
+    level: str = Query("state", pattern=LEVEL_PATTERN),
+    n: int = Query(20, ge=1, le=1000),
+    state: Optional[str] = Query(None, description="Only rank districts within this state"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    """
+    States/districts with the largest month-over-month growth (or, with
+    order=asc, the steepest decline) of a metric.
+    """
+    if period == "all":
+        raise HTTPException(status_code=400, detail="Growth needs a month period (YYYY-MM).")
+    store = await get_columnar_store()
+    _check(store, metric, period, level, state)
+    return {
+        "metric": metric,
+        "level": level,
+        "period": period,
+        "results": store.growth(level, metric, period, n, state=state, ascending=order == "asc")
+    }
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.artifacts import get_columnar_store
+from app.dependencies import validate_api_key
+
+router = APIRouter()
+
+
+@router.get("", dependencies=[Depends(validate_api_key)])
+async def get_timeseries(
+    metrics: str = Query("total_activity", description="Comma separated metric columns"),
+    freq: str = Query("month", pattern="^(day|week|month)$"),
+    level: Optional[str] = Query(None, pattern="^(national|state|district)$",
+                                 description="One series per entity of this level (default: inferred from the filters)"),
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    pincode: Optional[int] = Query(None, ge=0, le=999999, description="6-digit pincode"),
+    start: Optional[str] = Query(None, description="Inclusive start date (YYYY-MM-DD or YYYY-MM)"),
+    end: Optional[str] = Query(None, description="Inclusive end date (YYYY-MM-DD or YYYY-MM)"),
+    max_points: int = Query(5000, ge=1, le=100000, description="Point budget across all series; buckets are merged to fit"),
+):
+    """
+    Daily, weekly or monthly series of any metric for the country, a state,
+    a district or a pincode. `level=district&state=Bihar` returns one series
+    per district of Bihar; all series share the `dates` axis.
+    """
+    store = await get_columnar_store()
+
+    metric_list = [m.strip() for m in metrics.split(",") if m.strip()]
+    unknown = [m for m in metric_list if m not in store.metrics]
+    if not metric_list or unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics {unknown}. Available: {store.metrics}")
+    if level is None:
+        level = "district" if district else "state" if state else "national"
+
+    def execute():
+        started = time.perf_counter()
+        try:
+            result = store.timeseries(
+                metric_list, freq, level=level, state=state, district=district, pincode=pincode,
+                start=start, end=end, max_points=max_points
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD or YYYY-MM.")
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    return {"freq": freq, "level": "pincode" if pincode is not None else level, **await asyncio.to_thread(execute)}
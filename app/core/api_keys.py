@@ -0,0 +1,94 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Per-tier quotas. None falls back to the global RATE_LIMIT_* / MAX_STREAMS_* settings.
+TIERS: Dict[str, Dict[str, Optional[float]]] = {
+    "free": {"rate_per_second": 1, "burst": 5, "max_streams": 1},
+    "standard": {"rate_per_second": None, "burst": None, "max_streams": None},
+    "pro": {"rate_per_second": 20, "burst": 60, "max_streams": 10},
+}
+
+# Longer header values are rejected outright, before hashing
+MAX_KEY_LENGTH = 256
+
+
+@dataclass(frozen=True)
+class ApiKey:
+    key_id: str  # Short digest prefix; safe to log and to use as a rate-limit identity
+    tier: str
+    rate_per_second: Optional[float] = None
+    burst: Optional[float] = None
+    max_streams: Optional[int] = None
+
+
+def _digest(raw_key: str) -> bytes:
+    return hashlib.sha256(raw_key.encode()).digest()
+
+
+def _parse_entry(entry: str):
+    """
+    Parses one CLIENT_API_KEYS entry: `<key>[@tier]` where <key> is either the
+    plain key or `sha256:<hex digest>` so secrets need not be stored in clear.
+    """
+    secret, tier = entry, "standard"
+    if "@" in entry:
+        head, _, suffix = entry.rpartition("@")
+        if suffix in TIERS:
+            secret, tier = head, suffix
+    if secret.startswith("sha256:"):
+        return bytes.fromhex(secret[len("sha256:"):]), tier
+    return _digest(secret), tier
+
+
+class ApiKeyRegistry:
+    """Hashed API keys loaded once; lookups never compare the raw secret."""
+
+    def __init__(self, entries, log_interval: float = 60.0):
+        keys: Dict[bytes, ApiKey] = {}
+        for entry in entries:
+            entry = entry.strip()
+            if not entry:
+                continue
+            digest, tier = _parse_entry(entry)
+            keys[digest] = ApiKey(key_id=digest.hex()[:12], tier=tier, **TIERS[tier])
+
+        self._keys = keys
+        self._log_interval = log_interval
+        self._failures = 0
+        self._last_log = 0.0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def resolve(self, raw_key: Optional[str]) -> Optional[ApiKey]:
+        """Returns the key's metadata, or None for a missing/invalid key."""
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            return None
+        # Only fixed-length digests are compared, so timing leaks nothing about the secret
+        return self._keys.get(_digest(raw_key))
+
+    def record_failure(self):
+        """Aggregates failed attempts into at most one log line per interval."""
+        self._failures += 1
+        now = time.monotonic()
+        if now - self._last_log >= self._log_interval:
+            logger.warning(f"Unauthorized API access attempts: {self._failures} since last report")
+            self._failures = 0
+            self._last_log = now
+
+
+def load_registry() -> ApiKeyRegistry:
+    entries = [e for e in (settings.CLIENT_API_KEYS or "").split(",") if e.strip()]
+    if settings.CLIENT_API_KEY:
+        entries.append(settings.CLIENT_API_KEY)
+    return ApiKeyRegistry(entries)
+
+
+registry = load_registry()
@@ -0,0 +1,164 @@
+"""
+Local copies of release assets that the API reads directly (rather than relays).
+
+Assets are downloaded once per release version into ARTIFACT_CACHE_DIR
+(/tmp on Vercel), tarballs are extracted next to them, and older versions
+are pruned when a new `dataset-latest` upload is seen. Writes go through a
+temporary name and an atomic rename, so concurrent workers never observe a
+partial file and whichever finishes first wins.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import tarfile
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+from app.core.config import settings
+from app.core.github import get_asset_url, get_client, get_release_version, github_headers
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from app.core.columnar import ColumnarStore
+
+logger = get_logger()
+
+_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+# path -> opened store; only the latest version is kept open
+_stores: Dict[str, "ColumnarStore"] = {}
+
+# path -> parsed JSON artifact; one version per asset name is kept
+_documents: Dict[str, Any] = {}
+
+
+def _strip_archive_suffix(filename: str) -> str:
+    for suffix in (".tar.gz", ".tgz", ".tar"):
+        if filename.endswith(suffix):
+            return filename[: -len(suffix)]
+    return filename
+
+
+def _extract(archive: str, target: str):
+    staging = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    with tarfile.open(archive) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(staging, filter="data")
+        else:
+            tar.extractall(staging)
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Another worker extracted the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+    os.remove(archive)
+
+
+def _prune(tag_dir: str, keep: str):
+    # Open memory maps of pruned files stay valid until they are closed
+    for name in os.listdir(tag_dir):
+        if name != keep:
+            shutil.rmtree(os.path.join(tag_dir, name), ignore_errors=True)
+
+
+async def download_asset(filename: str, tag: str, dest: str) -> str:
+    """
+    Streams a release asset to `dest` through the pooled client. File writes
+    run in a worker thread so a slow disk never stalls the event loop; on any
+    failure the partial file is removed.
+    """
+    asset_url = await get_asset_url(filename, tag)
+    partial = f"{dest}.part-{os.getpid()}"
+    client = get_client()
+    f = None
+    try:
+        async with client.stream("GET", asset_url, headers=github_headers(accept="application/octet-stream")) as r:
+            r.raise_for_status()
+            f = await asyncio.to_thread(open, partial, "wb")
+            async for chunk in r.aiter_bytes(settings.STREAM_CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
+        await asyncio.to_thread(f.close)
+        os.replace(partial, dest)
+    except BaseException:
+        if f is not None:
+            f.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(partial)
+        raise
+    return dest
+
+
+async def fetch_artifact(filename: str, tag: str = "dataset-latest", extract: bool = False) -> str:
+    """
+    Returns the local path of a release asset for the current release version,
+    downloading it on first use. With `extract=True` the asset is a tarball and
+    the extracted directory is returned.
+    """
+    version = await get_release_version(tag)
+    tag_dir = os.path.join(settings.ARTIFACT_CACHE_DIR, tag)
+    root = os.path.join(tag_dir, version)
+    target = os.path.join(root, _strip_archive_suffix(filename) if extract else filename)
+    if os.path.exists(target):
+        return target
+
+    lock = _locks.setdefault((tag, filename), asyncio.Lock())
+    async with lock:
+        if os.path.exists(target):
+            return target
+        os.makedirs(root, exist_ok=True)
+        logger.info(f"Fetching '{filename}' from release '{tag}' ({version})...")
+        if extract:
+            archive = await download_asset(filename, tag, os.path.join(root, f"{filename}.{os.getpid()}"))
+            await asyncio.to_thread(_extract, archive, target)
+        else:
+            await download_asset(filename, tag, target)
+        _prune(tag_dir, version)
+    return target
+
+
+async def get_columnar_store() -> "ColumnarStore":
+    """The memory-mapped store for the latest processed release (or COLUMNAR_STORE_PATH)."""
+    path = settings.COLUMNAR_STORE_PATH or await fetch_artifact(settings.COLUMNAR_STORE_ASSET, extract=True)
+    store = _stores.get(path)
+    if store is None:
+        # Deferred: numpy only loads once a query actually needs it
+        from app.core.columnar import ColumnarStore
+        store = ColumnarStore(path)
+        _stores.clear()
+        _stores[path] = store
+    return store
+
+
+async def get_json_artifact(filename: str) -> Any:
+    """A JSON release asset of the latest release, parsed once per version."""
+    path = await fetch_artifact(filename)
+    document = _documents.get(path)
+    if document is None:
+        with open(path) as f:
+            document = json.load(f)
+        for stale in [p for p in _documents if os.path.basename(p) == filename]:
+            del _documents[stale]
+        _documents[path] = document
+    return document
+
+
+async def get_quality_report() -> Dict[str, Any]:
+    """The data-quality report written by process_data.py for the latest release."""
+    return await get_json_artifact(settings.QUALITY_REPORT_ASSET)
+
+
+async def get_partition_manifest() -> Dict[str, Any]:
+    """The month-partition manifest written by process_data.py for the latest release."""
+    return await get_json_artifact(settings.PARTITION_MANIFEST_ASSET)
+
+
+async def get_samples_manifest() -> Dict[str, Any]:
+    """The stratified-sample manifest (rates and per-dataset sample assets)."""
+    return await get_json_artifact(settings.SAMPLES_MANIFEST_ASSET)
+
+
+async def get_changes_manifest() -> Dict[str, Any]:
+    """The change-feed manifest (current dataset version and recent deltas)."""
+    return await get_json_artifact(settings.CHANGES_MANIFEST_ASSET)
@@ -0,0 +1,260 @@
+"""
+Pluggable response cache shared by the API endpoints.
+
+Backends:
+- MemoryCache: in-process LRU with per-entry TTL (always used as the first tier)
+- RedisCache: any redis.asyncio compatible client (a local Redis or fakeredis stand-in)
+- UpstashCache: the Upstash REST protocol (or a local serverless-redis-http stand-in)
+
+Values must be JSON serializable. Keys that depend on published data should be
+built with `versioned_key()` so a new `dataset-latest` upload invalidates them.
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+KEY_PREFIX = "uidai:"
+
+_LOCAL_HITS = CACHE_REQUESTS.labels("local_hit")
+_SHARED_HITS = CACHE_REQUESTS.labels("shared_hit")
+_MISSES = CACHE_REQUESTS.labels("miss")
+
+
+class CacheBackend:
+    """Interface implemented by every cache backend."""
+
+    name = "base"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """Process-local LRU. Cheapest tier; lost on every cold start."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """Redis via redis-py's asyncio client. Pass `client` to use a stand-in."""
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client: Any = None):
+        if client is None:
+            import redis.asyncio as redis  # optional dependency
+            client = redis.from_url(url)
+        self.client = client
+
+    async def command(self, *args) -> Any:
+        return await self.client.execute_command(*args)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.client.set(key, json.dumps(value, separators=(",", ":")), ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class UpstashCache(CacheBackend):
+    """Redis over the Upstash REST API: POST a JSON command array, read {"result": ...}."""
+
+    name = "upstash"
+
+    def __init__(self, url: str, token: str):
+        self.url = url.rstrip("/")
+        self.token = token
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(2.0, connect=2.0),
+                headers={"Authorization": f"Bearer {self.token}"}
+            )
+        return self._client
+
+    async def command(self, *args) -> Any:
+        resp = await self._get_client().post(self.url, json=[str(a) for a in args])
+        body = resp.json()
+        if "error" in body:
+            raise RuntimeError(f"Upstash error: {body['error']}")
+        return body.get("result")
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.command("GET", key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.command("SET", key, json.dumps(value, separators=(",", ":")), "EX", ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.command("DEL", key)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class TieredCache(CacheBackend):
+    """
+    In-process LRU in front of an optional shared backend.
+    Shared backend failures are logged and treated as misses so the cache
+    can never take a request down.
+    """
+
+    def __init__(self, local: MemoryCache, shared: Optional[CacheBackend] = None, local_ttl: int = 60):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+        self.name = f"memory+{shared.name}" if shared else "memory"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is not None:
+            _LOCAL_HITS.inc()
+            return value
+        if self.shared is None:
+            _MISSES.inc()
+            return None
+        try:
+            value = await self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache GET failed ({self.shared.name}): {e}")
+            _MISSES.inc()
+            return None
+        if value is None:
+            _MISSES.inc()
+            return None
+        _SHARED_HITS.inc()
+        await self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.local.set(key, value, min(ttl, self.local_ttl))
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, value, ttl)
+            except Exception as e:
+                logger.warning(f"Shared cache SET failed ({self.shared.name}): {e}")
+
+    async def delete(self, key: str) -> None:
+        await self.local.delete(key)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(key)
+            except Exception as e:
+                logger.warning(f"Shared cache DEL failed ({self.shared.name}): {e}")
+
+    async def close(self) -> None:
+        if self.shared is not None:
+            await self.shared.close()
+
+
+def build_shared_backend() -> Optional[CacheBackend]:
+    """Selects the shared backend from settings (CACHE_BACKEND=auto|memory|redis|upstash)."""
+    backend = settings.CACHE_BACKEND
+    if backend == "memory":
+        return None
+    if backend in ("auto", "upstash") and settings.UPSTASH_REDIS_REST_URL and settings.UPSTASH_REDIS_REST_TOKEN:
+        return UpstashCache(settings.UPSTASH_REDIS_REST_URL, settings.UPSTASH_REDIS_REST_TOKEN)
+    if backend in ("auto", "redis") and settings.REDIS_URL:
+        try:
+            return RedisCache(settings.REDIS_URL)
+        except ImportError:
+            logger.warning("REDIS_URL is set but the 'redis' package is not installed; using in-process cache only.")
+    return None
+
+
+_cache: Optional[TieredCache] = None
+
+
+def get_cache() -> TieredCache:
+    global _cache
+    if _cache is None:
+        _cache = TieredCache(MemoryCache(settings.CACHE_MAX_ENTRIES), build_shared_backend(), settings.CACHE_LOCAL_TTL)
+    return _cache
+
+
+async def close_cache():
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+    _cache = None
+
+
+def versioned_key(namespace: str, version: str, *parts: Any) -> str:
+    """Builds a cache key scoped to a release version, e.g. uidai:rollup:3f2a1c:state:Bihar."""
+    suffix = ":".join(str(p) for p in parts)
+    return f"{KEY_PREFIX}{namespace}:{version}:{suffix}" if suffix else f"{KEY_PREFIX}{namespace}:{version}"
+
+
+def release_version(release: dict) -> str:
+    """
+    Short fingerprint of a release's assets. Uploads use --clobber on the same
+    tag, so the release id stays constant; asset ids and timestamps do not.
+    """
+    fingerprint = ",".join(sorted(f"{a.get('id')}@{a.get('updated_at')}" for a in release.get("assets", [])))
+    return hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+
+
+async def cached(key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Returns the cached value for `key`, computing and storing it on a miss."""
+    cache = get_cache()
+    value = await cache.get(key)
+    if value is not None:
+        return value
+    value = await loader()
+    if value is not None:
+        await cache.set(key, value, ttl)
+    return value
@@ -0,0 +1,119 @@
+"""
+Release-to-release change feed of the processed master dataset.
+
+Each processing run fingerprints `master_dataset_final.csv` (its dataset
+version) and diffs it against the previous release's master, keyed by
+(date, state, district, pincode, source_dataset). Keys can repeat once
+names are normalized, so rows are matched by key plus `occurrence`, the
+row's ordinal among rows with the same key in file order.
+
+A delta is a gzipped CSV, `changes_<previous>_<version>.csv.gz`, with an
+`op` (added, removed or changed) and `occurrence` column followed by the
+row in the dataset's own column layout: the new row for added/changed, the
+old one for removed. `dataset_changes.json` lists the current version and
+the last MAX_HISTORY deltas, so a client holding any of those versions can
+catch up by composing the deltas since. Delta assets that fall out of the
+history are deleted from the release once the new manifest is uploaded.
+
+Matching by occurrence is positional: when a row is inserted into (or
+removed from) a group of rows sharing a key, every later row of that group
+shifts by one and is reported as changed. Composing and applying deltas
+still reproduces the new dataset exactly; the delta is just larger than the
+real edit. Such duplicate keys are rare (a pincode's rows for one date and
+source), so this is preferred to matching on a row hash, which would turn
+every edited value into a removed + added pair.
+
+Only the standard library is needed here; the processing scripts import
+this module too.
+"""
+import csv
+import fnmatch
+import gzip
+import hashlib
+import io
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CHANGES_FORMAT = 1
+MANIFEST = "dataset_changes.json"
+MAX_HISTORY = 12
+
+KEY_COLUMNS = ("date", "state", "district", "pincode", "source_dataset")
+OPS = ("added", "removed", "changed")
+
+
+DELTA_PATTERN = "changes_*_*.csv.gz"
+
+
+def delta_asset(previous: str, version: str) -> str:
+    return f"changes_{previous}_{version}.csv.gz"
+
+
+def expired_deltas(manifest: Dict[str, Any], assets: Iterable[str]) -> List[str]:
+    """Delta assets among `assets` that the manifest's history no longer lists."""
+    kept = {entry["asset"] for entry in manifest["history"]}
+    return sorted(name for name in assets if fnmatch.fnmatch(name, DELTA_PATTERN) and name not in kept)
+
+
+def file_version(path: str, chunk_size: int = 1 << 20) -> str:
+    """Dataset version: a short content hash, so an unchanged dataset keeps its version."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def delta_chain(manifest: Dict[str, Any], since: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    The history entries leading from `since` to the current version, oldest
+    first ([] when `since` is current), or None when `since` is not reachable.
+    """
+    by_version = {entry["version"]: entry for entry in manifest["history"]}
+    chain, version = [], manifest["version"]
+    while version != since:
+        entry = by_version.get(version)
+        if entry is None:
+            return None
+        chain.append(entry)
+        version = entry["previous"]
+    return chain[::-1]
+
+
+def read_delta(raw: bytes) -> Tuple[List[str], List[List[str]]]:
+    """Header and rows of a gzipped delta."""
+    reader = csv.reader(io.StringIO(gzip.decompress(raw).decode()))
+    header = next(reader)
+    return header, list(reader)
+
+
+def compose(header: List[str], deltas: Iterable[List[List[str]]]) -> List[List[str]]:
+    """
+    Collapses consecutive deltas (oldest first) into one: a row added then
+    changed is added, added then removed disappears, removed then added is
+    changed, and otherwise the latest operation wins.
+    """
+    key_at = [header.index(c) for c in KEY_COLUMNS + ("occurrence",)]
+    net: Dict[Tuple[str, ...], List[str]] = {}
+    for rows in deltas:
+        for row in rows:
+            key = tuple(row[i] for i in key_at)
+            earlier = net.get(key)
+            op = row[0]
+            if earlier is not None:
+                if earlier[0] == "added" and op == "removed":
+                    del net[key]
+                    continue
+                if earlier[0] == "added" and op == "changed":
+                    op = "added"
+                elif earlier[0] == "removed" and op == "added":
+                    op = "changed"
+            net[key] = [op] + row[1:]
+    return list(net.values())
+
+
+def write_rows(header: List[str], rows: Iterable[List[str]]) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue()
@@ -0,0 +1,902 @@
+"""
+Memory-mapped columnar layout of the processed master dataset.
+
+The processing job writes one `.npy` file per column plus a `manifest.json`:
+- date: int32 days since 1970-01-01 (DATE_NULL when unparseable)
+- month: int16 months since 1970-01
+- pincode: int32 (0 when missing)
+- metric columns: int32 counts
+- state, district, source_dataset: dictionary codes into the manifest's value lists
+
+Rows are sorted by (state, district, pincode, date) so every geography is a
+contiguous, date-ordered run. Readers open columns with `mmap_mode="r"`, so
+several workers share the OS page cache and opening a store costs only the
+manifest read.
+
+Each of INDEXED_COLUMNS also gets a secondary index: the sorted distinct
+`keys`, `offsets` into a row permutation ordered by that column, and the
+permutation itself (omitted when the rows are already in that order). A
+lookup is two binary searches and reads only the matching rows.
+
+For rankings, every metric is also rolled up per (level, month) and per
+level over all time, with the entity order by value and by month-over-month
+growth precomputed, so any top-N is a slice of a stored order.
+
+Approximate distinct pincodes and daily-total quantiles come from mergeable
+sketches per (district, month), see app.core.sketches.
+
+Only numpy and the standard library are needed here; the processing scripts
+import this module without the API's dependencies.
+"""
+import json
+import os
+import tarfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.sketches import gather, hll_estimate, merge_hll, merged_quantiles, write_sketches
+
+STORE_FORMAT = 1
+MANIFEST = "manifest.json"
+
+METRIC_COLUMNS = (
+    "bio_age_5_17", "bio_age_17_",
+    "demo_age_5_17", "demo_age_17_",
+    "age_0_5", "age_5_17", "age_18_greater",
+    "total_biometric_updates", "total_enrolment", "total_demographic_updates",
+    "total_activity",
+)
+DICTIONARY_COLUMNS = ("state", "district", "source_dataset")
+GROUP_COLUMNS = ("state", "district", "source_dataset", "pincode", "month", "date")
+INDEXED_COLUMNS = ("state", "district", "pincode", "month")
+ROLLUP_LEVELS = ("state", "district")
+SERIES_LEVELS = ("national", "state", "district")
+
+DATE_NULL = np.iinfo(np.int32).min
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _code_dtype(size: int):
+    return np.int8 if size < 128 else np.int16 if size < 32768 else np.int32
+
+
+def store_dictionaries(frame) -> Dict[str, List[str]]:
+    """The sorted value list of every dictionary column of a (whole) master frame."""
+    return {
+        name: sorted(frame[name].fillna("Unknown").astype(str).unique().tolist())
+        for name in DICTIONARY_COLUMNS
+    }
+
+
+def encode_columns(frame, dictionaries: Dict[str, List[str]]) -> Dict[str, np.ndarray]:
+    """Encodes rows of the master frame as the store's column arrays, against fixed dictionaries."""
+    import pandas as pd  # only needed when building, never by the API
+
+    columns: Dict[str, np.ndarray] = {}
+    for name in DICTIONARY_COLUMNS:
+        values = frame[name].fillna("Unknown").astype(str)
+        codes = pd.Categorical(values, categories=dictionaries[name]).codes
+        columns[name] = codes.astype(_code_dtype(len(dictionaries[name])))
+
+    days = pd.to_datetime(frame["date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(days)
+    date = np.full(len(days), DATE_NULL, dtype=np.int32)
+    date[valid] = (days[valid] - EPOCH).astype(np.int32)
+    month = np.full(len(days), -1, dtype=np.int16)
+    month[valid] = days[valid].astype("datetime64[M]").astype(np.int16)
+    columns["date"] = date
+    columns["month"] = month
+
+    if "pincode" in frame.columns:
+        pincode = pd.to_numeric(frame["pincode"], errors="coerce").fillna(0)
+        columns["pincode"] = pincode.to_numpy(dtype=np.int64).astype(np.int32)
+    else:
+        columns["pincode"] = np.zeros(len(frame), dtype=np.int32)
+
+    for name in METRIC_COLUMNS:
+        if name in frame.columns:
+            values = np.nan_to_num(np.asarray(frame[name], dtype=np.float64), nan=0.0)
+        else:
+            values = np.zeros(len(frame))
+        columns[name] = values.astype(np.int32)
+    return columns
+
+
+def write_store(master_df, out_dir: str) -> Dict[str, Any]:
+    """Writes `master_df` (the processed master DataFrame) as a columnar store in `out_dir`."""
+    return write_store_batches([master_df], store_dictionaries(master_df), out_dir)
+
+
+def write_store_batches(batches, dictionaries: Dict[str, List[str]], out_dir: str) -> Dict[str, Any]:
+    """
+    Like write_store(), from master frame batches (in row order, at least
+    one) and the dictionaries of all of them. Only one batch is held as a
+    DataFrame at a time; the encoded columns (about 50 bytes a row) are kept
+    in memory to sort and index them.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    parts: Dict[str, List[np.ndarray]] = {}
+    for batch in batches:
+        for name, values in encode_columns(batch, dictionaries).items():
+            parts.setdefault(name, []).append(values)
+    columns = {name: np.concatenate(parts.pop(name)) for name in list(parts)}
+    date = columns["date"]
+    valid = date != DATE_NULL
+
+    # Cluster rows by geography, then time
+    order = np.lexsort((columns["date"], columns["pincode"], columns["district"], columns["state"]))
+
+    manifest_columns = {}
+    for name, values in columns.items():
+        filename = f"{name}.npy"
+        np.save(os.path.join(out_dir, filename), values[order])
+        manifest_columns[name] = {"file": filename, "dtype": values.dtype.str}
+
+    indexes = {}
+    for name in INDEXED_COLUMNS:
+        indexes[name] = write_index(np.load(os.path.join(out_dir, f"{name}.npy")), out_dir, name)
+
+    rollups = write_rollups(columns, out_dir)
+    series = write_series(columns, out_dir)
+    sketches = write_sketches(columns, *_level_entities(columns, "district"), out_dir)
+
+    dated = date[valid]
+    manifest = {
+        "format": STORE_FORMAT,
+        "rows": int(len(date)),
+        "sort_key": ["state", "district", "pincode", "date"],
+        "columns": manifest_columns,
+        "dictionaries": dictionaries,
+        "indexes": indexes,
+        "rollups": rollups,
+        "series": series,
+        "sketches": sketches,
+        "metrics": list(METRIC_COLUMNS),
+        "date_range": [
+            str(EPOCH + int(dated.min())) if len(dated) else None,
+            str(EPOCH + int(dated.max())) if len(dated) else None,
+        ],
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def write_index(values: np.ndarray, out_dir: str, name: str) -> Dict[str, Optional[str]]:
+    """Writes the keys/offsets/permutation files of a secondary index over `values`."""
+    if np.all(values[:-1] <= values[1:]):
+        perm = None
+        ordered = values
+    else:
+        perm = np.argsort(values, kind="stable").astype(np.int32)
+        ordered = values[perm]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]]) if len(ordered) else np.empty(0, dtype=np.int64)
+    keys = ordered[starts]
+    offsets = np.append(starts, len(ordered)).astype(np.int64)
+
+    spec = {"keys": f"index_{name}_keys.npy", "offsets": f"index_{name}_offsets.npy", "perm": None}
+    np.save(os.path.join(out_dir, spec["keys"]), keys)
+    np.save(os.path.join(out_dir, spec["offsets"]), offsets)
+    if perm is not None:
+        spec["perm"] = f"index_{name}_perm.npy"
+        np.save(os.path.join(out_dir, spec["perm"]), perm)
+    return spec
+
+
+def _level_entities(columns: Dict[str, np.ndarray], level: str):
+    """
+    Entity keys of a geography level (rows of dictionary codes) and each
+    row's entity number. Districts are (state, district) pairs, since
+    district names can repeat across states.
+    """
+    state = columns["state"].astype(np.int64)
+    if level == "national":
+        return np.zeros((1, 0), dtype=np.int64), np.zeros(len(state), dtype=np.int64)
+    if level == "state":
+        entity_keys, entity = np.unique(state, return_inverse=True)
+        return entity_keys[:, None], entity
+    pair_keys, entity = np.unique(state * 65536 + columns["district"].astype(np.int64), return_inverse=True)
+    return np.stack([pair_keys // 65536, pair_keys % 65536], axis=1), entity
+
+
+def write_rollups(columns: Dict[str, np.ndarray], out_dir: str) -> Dict[str, Any]:
+    """
+    Per level, writes `rollup_<level>.npy` with shape (metric, period, entity)
+    where periods are every calendar month from the data's first to its last
+    (months without rows included, so neighbours are always one month apart)
+    followed by an all-time total, plus the entity orders by value
+    (`rank_<level>.npy`) and by growth over the previous month
+    (`growth_<level>.npy`), both descending.
+    """
+    month = columns["month"].astype(np.int64)
+    dated = month[month >= 0]
+    months = np.arange(dated.min(), dated.max() + 1) if len(dated) else np.empty(0, dtype=np.int64)
+    # Rows without a date land in the extra slot, which becomes the all-time total
+    period = np.where(month >= 0, np.searchsorted(months, month), len(months))
+    periods = len(months) + 1
+
+    levels = {}
+    for level in ROLLUP_LEVELS:
+        keys, entity = _level_entities(columns, level)
+        entities = len(keys)
+        slot = entity * periods + period
+
+        rollup = np.empty((len(METRIC_COLUMNS), periods, entities), dtype=np.int64)
+        for m, name in enumerate(METRIC_COLUMNS):
+            sums = np.bincount(slot, weights=columns[name], minlength=entities * periods).astype(np.int64)
+            sums = sums.reshape(entities, periods).T
+            sums[-1] = sums.sum(axis=0)
+            rollup[m] = sums
+        rank = np.argsort(-rollup, axis=2, kind="stable").astype(np.int32)
+
+        previous = rollup[:, :-2, :].astype(np.float64)
+        current = rollup[:, 1:-1, :].astype(np.float64)
+        growth = np.full((len(METRIC_COLUMNS), len(months), entities), -np.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth[:, 1:, :] = np.where(previous > 0, (current - previous) / previous, -np.inf)
+        growth_rank = np.argsort(-growth, axis=2, kind="stable").astype(np.int32)
+
+        files = {
+            "keys": f"rollup_{level}_keys.npy",
+            "values": f"rollup_{level}.npy",
+            "rank": f"rank_{level}.npy",
+            "growth": f"growth_{level}.npy",
+        }
+        np.save(os.path.join(out_dir, files["keys"]), keys.astype(np.int32))
+        np.save(os.path.join(out_dir, files["values"]), rollup)
+        np.save(os.path.join(out_dir, files["rank"]), rank)
+        np.save(os.path.join(out_dir, files["growth"]), growth_rank)
+        levels[level] = files
+
+    return {
+        "metrics": list(METRIC_COLUMNS),
+        "months": [month_label(m) for m in months],
+        "levels": levels,
+    }
+
+
+def write_series(columns: Dict[str, np.ndarray], out_dir: str) -> Dict[str, Any]:
+    """
+    Per level, writes the daily points of every entity as one contiguous,
+    date-sorted run: `series_<level>_offsets.npy` (entity -> point range),
+    `series_<level>_dates.npy` and `series_<level>_cumsum.npy`, the running
+    totals per metric with a leading zero, shape (metric, points + 1). A sum
+    over any date range of an entity is then a difference of two totals.
+    """
+    date = columns["date"].astype(np.int64)
+    valid = date != DATE_NULL
+    date = date[valid]
+    first = int(date.min()) if len(date) else 0
+    span = int(date.max()) - first + 1 if len(date) else 1
+
+    levels = {}
+    for level in SERIES_LEVELS:
+        keys, entity = _level_entities(columns, level)
+        points, inverse = np.unique(entity[valid] * span + (date - first), return_inverse=True)
+        point_entity = points // span
+        cumsum = np.zeros((len(METRIC_COLUMNS), len(points) + 1), dtype=np.int64)
+        for m, name in enumerate(METRIC_COLUMNS):
+            sums = np.bincount(inverse, weights=columns[name][valid], minlength=len(points)).astype(np.int64)
+            np.cumsum(sums, out=cumsum[m, 1:])
+
+        files = {
+            "keys": f"series_{level}_keys.npy",
+            "offsets": f"series_{level}_offsets.npy",
+            "dates": f"series_{level}_dates.npy",
+            "cumsum": f"series_{level}_cumsum.npy",
+        }
+        np.save(os.path.join(out_dir, files["keys"]), keys.astype(np.int32))
+        np.save(os.path.join(out_dir, files["offsets"]), np.searchsorted(point_entity, np.arange(len(keys) + 1)).astype(np.int64))
+        np.save(os.path.join(out_dir, files["dates"]), (points % span + first).astype(np.int32))
+        np.save(os.path.join(out_dir, files["cumsum"]), cumsum)
+        levels[level] = files
+
+    return {"metrics": list(METRIC_COLUMNS), "levels": levels}
+
+
+def bucket_edges(start: int, end: int, freq: str) -> np.ndarray:
+    """
+    Day numbers where each bucket of `freq` (day, week, month) begins, from
+    `start` through `end` inclusive, followed by `end + 1`. Weeks start on
+    Monday; the first bucket is clipped to `start`.
+    """
+    if freq == "day":
+        edges = np.arange(start, end + 1, dtype=np.int64)
+    elif freq == "week":
+        # 1970-01-05 (day 4) was a Monday
+        first_monday = start - ((start - 4) % 7)
+        edges = np.arange(first_monday, end + 1, 7, dtype=np.int64)
+    elif freq == "month":
+        first = (EPOCH + start).astype("datetime64[M]")
+        last = (EPOCH + end).astype("datetime64[M]")
+        months = np.arange(first, last + 1)
+        edges = (months.astype("datetime64[D]") - EPOCH).astype(np.int64)
+    else:
+        raise ValueError(f"unknown frequency '{freq}'")
+    edges[0] = start
+    return np.append(edges, end + 1)
+
+
+def downsample_edges(edges: np.ndarray, budget: int) -> np.ndarray:
+    """Merges adjacent buckets so at most `budget` remain; sums stay exact."""
+    buckets = len(edges) - 1
+    if buckets <= budget:
+        return edges
+    step = -(-buckets // max(1, budget))
+    return np.append(edges[:-1:step], edges[-1])
+
+
+def pack_store(out_dir: str, tar_path: str) -> str:
+    """Bundles a store directory into a single gzipped tar for the release upload."""
+    with tarfile.open(tar_path, "w:gz", compresslevel=6) as tar:
+        for name in sorted(os.listdir(out_dir)):
+            tar.add(os.path.join(out_dir, name), arcname=name)
+    return tar_path
+
+
+def parse_date(value: str, end: bool = False) -> int:
+    """
+    ISO date (YYYY-MM-DD) or month (YYYY-MM) to days since the epoch. With
+    `end=True` a month resolves to its last day, for inclusive upper bounds.
+    """
+    if len(value) == 7:
+        month = np.datetime64(value, "M")
+        day = (month + 1).astype("datetime64[D]") - 1 if end else month.astype("datetime64[D]")
+    else:
+        day = np.datetime64(value, "D")
+    return int((day - EPOCH).astype(np.int64))
+
+
+def month_label(month: int) -> str:
+    return str(np.datetime64(int(month), "M"))
+
+
+def date_label(days: int) -> Optional[str]:
+    return None if days == DATE_NULL else str(EPOCH + int(days))
+
+
+class ColumnarStore:
+    """Read-only view over a store directory; columns are mapped on first use."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.rows: int = self.manifest["rows"]
+        self.dictionaries: Dict[str, List[str]] = self.manifest["dictionaries"]
+        self.metrics: List[str] = self.manifest["metrics"]
+        self._lookup = {
+            name: {value.casefold(): code for code, value in enumerate(values)}
+            for name, values in self.dictionaries.items()
+        }
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        values = self._columns.get(name)
+        if values is None:
+            spec = self.manifest["columns"][name]
+            values = np.load(os.path.join(self.path, spec["file"]), mmap_mode="r")
+            self._columns[name] = values
+        return values
+
+    def _index_file(self, name: str, part: str) -> Optional[np.ndarray]:
+        key = f"index:{name}:{part}"
+        values = self._columns.get(key)
+        if values is None:
+            filename = self.manifest["indexes"][name][part]
+            if filename is None:
+                return None
+            values = np.load(os.path.join(self.path, filename), mmap_mode="r")
+            self._columns[key] = values
+        return values
+
+    def has_index(self, name: str) -> bool:
+        return name in self.manifest.get("indexes", {})
+
+    def lookup(self, name: str, low: int, high: Optional[int] = None) -> np.ndarray:
+        """
+        Row numbers (ascending) whose indexed column `name` lies in [low, high]
+        (or equals `low`), found by binary search over the index keys.
+        """
+        keys = self._index_file(name, "keys")
+        offsets = self._index_file(name, "offsets")
+        high = low if high is None else high
+        # Match the key dtype; a Python int would make numpy upcast (copy) the whole array.
+        # Bounds outside the dtype's range are clipped first, as they cannot be represented.
+        limits = np.iinfo(keys.dtype)
+        if low > limits.max or high < limits.min or low > high:
+            return np.empty(0, dtype=np.int64)
+        first = np.searchsorted(keys, keys.dtype.type(max(low, limits.min)), side="left")
+        last = np.searchsorted(keys, keys.dtype.type(min(high, limits.max)), side="right")
+        start, stop = int(offsets[first]), int(offsets[last])
+        perm = self._index_file(name, "perm")
+        if perm is None:
+            return np.arange(start, stop, dtype=np.int64)
+        rows = np.asarray(perm[start:stop], dtype=np.int64)
+        if last - first > 1:
+            rows.sort()
+        return rows
+
+    def select(
+        self,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        source: Optional[str] = None,
+        pincode: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Like mask(), but answered from the secondary indexes: the narrowest
+        index lookup picks the candidate rows and the remaining filters are
+        checked on just those rows. Returns ascending row numbers.
+        """
+        if "indexes" not in self.manifest:
+            return np.flatnonzero(self.mask(state, district, source, pincode, start, end))
+
+        checks = []
+        for name, value in (("state", state), ("district", district), ("source_dataset", source)):
+            if value is None:
+                continue
+            code = self.code(name, value)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            checks.append((name, code))
+        if pincode is not None:
+            checks.append(("pincode", pincode))
+
+        low = parse_date(start) if start is not None else None
+        high = parse_date(end, end=True) if end is not None else None
+
+        candidates = [(name, self.lookup(name, value)) for name, value in checks if self.has_index(name)]
+        if low is not None or high is not None:
+            months = self._index_file("month", "keys")
+            first_month = int((EPOCH + low).astype("datetime64[M]").astype(np.int64)) if low is not None else 0
+            last_month = int((EPOCH + high).astype("datetime64[M]").astype(np.int64)) if high is not None else int(months[-1]) if len(months) else 0
+            candidates.append(("month", self.lookup("month", first_month, last_month)))
+
+        if candidates:
+            used, rows = min(candidates, key=lambda c: len(c[1]))
+        else:
+            used, rows = None, np.arange(self.rows, dtype=np.int64)
+
+        for name, value in checks:
+            if name != used and len(rows):
+                rows = rows[self.column(name)[rows] == value]
+        if (low is not None or high is not None) and len(rows):
+            date = self.column("date")[rows]
+            keep = date != DATE_NULL
+            if low is not None:
+                keep &= date >= low
+            if high is not None:
+                keep &= date <= high
+            rows = rows[keep]
+        return rows
+
+    def _rollup_file(self, level: str, part: str) -> np.ndarray:
+        key = f"rollup:{level}:{part}"
+        values = self._columns.get(key)
+        if values is None:
+            filename = self.manifest["rollups"]["levels"][level][part]
+            values = np.load(os.path.join(self.path, filename), mmap_mode="r")
+            self._columns[key] = values
+        return values
+
+    def period_index(self, period: str) -> int:
+        """Position of `period` ("all" or YYYY-MM) on the rollup period axis; ValueError if absent."""
+        months = self.manifest["rollups"]["months"]
+        return len(months) if period == "all" else months.index(period)
+
+    def _ranked(self, level: str, order: np.ndarray, state: Optional[str]) -> Optional[np.ndarray]:
+        if state is None:
+            return order
+        if level == "state":
+            raise ValueError("state only filters district rankings")
+        code = self.code("state", state)
+        if code is None:
+            return None
+        entity_state = self._rollup_file(level, "keys")[:, 0]
+        return order[entity_state[order] == code]
+
+    def _entity(self, level: str, entity: int) -> Dict[str, Any]:
+        keys = self._rollup_file(level, "keys")[entity]
+        out = {"state": self.dictionaries["state"][keys[0]]}
+        if level == "district":
+            out["district"] = self.dictionaries["district"][keys[1]]
+        return out
+
+    def top(
+        self, level: str, metric: str, period: str = "all", n: int = 10,
+        state: Optional[str] = None, ascending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Top (or bottom) `n` entities of `level` by `metric` in `period`, from the precomputed order."""
+        m = self.manifest["rollups"]["metrics"].index(metric)
+        p = self.period_index(period)
+        values = self._rollup_file(level, "values")[m, p]
+        order = self._ranked(level, np.asarray(self._rollup_file(level, "rank")[m, p]), state)
+        if order is None:
+            return []
+        picked = order[::-1][:n] if ascending else order[:n]
+        total = int(values.sum()) if state is None else int(values[order].sum())
+        return [
+            {
+                "rank": i + 1,
+                **self._entity(level, int(e)),
+                "value": int(values[e]),
+                "share": round(int(values[e]) / total, 6) if total else None,
+            }
+            for i, e in enumerate(picked)
+        ]
+
+    def growth(
+        self, level: str, metric: str, period: str, n: int = 10,
+        state: Optional[str] = None, ascending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Entities of `level` with the largest (or, ascending, most negative)
+        growth of `metric` from the previous calendar month to `period`.
+        Entities with nothing in the previous month have no growth rate and
+        are skipped, so a month after one without data has no results.
+        """
+        if period == "all":
+            raise ValueError("growth needs a month period")
+        m = self.manifest["rollups"]["metrics"].index(metric)
+        p = self.period_index(period)
+        values = self._rollup_file(level, "values")[m]
+        if p == 0:
+            return []
+        previous, current = values[p - 1], values[p]
+        order = np.asarray(self._rollup_file(level, "growth")[m, p])
+        # Entities without a rate sort last; keep only the ones that have one
+        order = order[: int(np.count_nonzero(previous > 0))]
+        order = self._ranked(level, order, state)
+        if order is None:
+            return []
+        picked = order[::-1][:n] if ascending else order[:n]
+        return [
+            {
+                "rank": i + 1,
+                **self._entity(level, int(e)),
+                "previous": int(previous[e]),
+                "value": int(current[e]),
+                "growth": round((int(current[e]) - int(previous[e])) / int(previous[e]), 6),
+            }
+            for i, e in enumerate(picked)
+        ]
+
+    def _series_file(self, level: str, part: str) -> np.ndarray:
+        key = f"series:{level}:{part}"
+        values = self._columns.get(key)
+        if values is None:
+            filename = self.manifest["series"]["levels"][level][part]
+            values = np.load(os.path.join(self.path, filename), mmap_mode="r")
+            self._columns[key] = values
+        return values
+
+    def timeseries(
+        self,
+        metrics: Sequence[str],
+        freq: str = "day",
+        level: str = "national",
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        pincode: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        max_points: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Series of `metrics` bucketed by `freq`, one per entity of `level`
+        matching the state/district filters (or a single pincode series).
+        Bucket sums are differences of the stored running totals; when the
+        series would exceed `max_points` in total, adjacent buckets are merged.
+        """
+        date_range = self.manifest["date_range"]
+        if date_range[0] is None:
+            return {"dates": [], "series": []}
+        low = parse_date(start) if start else parse_date(date_range[0])
+        high = parse_date(end, end=True) if end else parse_date(date_range[1])
+        if low > high:
+            return {"dates": [], "series": []}
+        metric_index = [self.manifest["series"]["metrics"].index(m) for m in metrics]
+
+        # Resolve the series as (labels, dates, running totals with a leading zero)
+        runs = []
+        if pincode is not None:
+            rows = self.select(pincode=pincode)
+            dates = np.asarray(self.column("date")[rows], dtype=np.int64)
+            keep = dates != DATE_NULL
+            rows, dates = rows[keep], dates[keep]
+            order = np.argsort(dates, kind="stable")
+            cumsum = np.zeros((len(metrics), len(rows) + 1), dtype=np.int64)
+            for i, name in enumerate(metrics):
+                np.cumsum(np.asarray(self.column(name)[rows], dtype=np.int64)[order], out=cumsum[i, 1:])
+            runs.append(({"pincode": pincode}, dates[order], cumsum))
+        else:
+            keys = np.asarray(self._series_file(level, "keys"))
+            selected = np.ones(len(keys), dtype=bool)
+            for column, name, value in ((0, "state", state), (1, "district", district)):
+                if value is None or keys.shape[1] <= column:
+                    continue
+                code = self.code(name, value)
+                if code is None:
+                    return {"dates": [], "series": []}
+                selected &= keys[:, column] == code
+            offsets = self._series_file(level, "offsets")
+            all_dates = self._series_file(level, "dates")
+            all_cumsum = self._series_file(level, "cumsum")
+            for entity in np.flatnonzero(selected):
+                lo, hi = int(offsets[entity]), int(offsets[entity + 1])
+                labels = {}
+                if keys.shape[1] > 0:
+                    labels["state"] = self.dictionaries["state"][keys[entity, 0]]
+                if keys.shape[1] > 1:
+                    labels["district"] = self.dictionaries["district"][keys[entity, 1]]
+                runs.append((labels, all_dates[lo:hi], all_cumsum[metric_index, lo:hi + 1]))
+
+        edges = bucket_edges(low, high, freq)
+        if max_points and runs:
+            edges = downsample_edges(edges, max_points // len(runs))
+
+        series = []
+        for labels, dates, cumsum in runs:
+            # Position of each bucket edge within this entity's sorted dates
+            positions = np.searchsorted(dates, edges.astype(dates.dtype), side="left")
+            totals = cumsum[:, positions]
+            sums = totals[:, 1:] - totals[:, :-1]
+            series.append({**labels, "values": {m: sums[i].tolist() for i, m in enumerate(metrics)}})
+
+        return {
+            "dates": [date_label(int(d)) for d in edges[:-1]],
+            "bucket_days": int(np.max(np.diff(edges))) if len(edges) > 1 else 0,
+            "series": series,
+        }
+
+    def records(self, rows: np.ndarray, columns: Sequence[str]) -> List[Dict[str, Any]]:
+        """Materializes the given rows as dicts, decoding dictionary and date columns."""
+        data = [(name, np.asarray(self.column(name)[rows])) for name in columns]
+        return [
+            {name: self.label(name, int(values[i])) for name, values in data}
+            for i in range(len(rows))
+        ]
+
+    def code(self, name: str, value: str) -> Optional[int]:
+        """Dictionary code for `value` (case-insensitive), or None if it never occurs."""
+        return self._lookup[name].get(value.strip().casefold())
+
+    def mask(
+        self,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        source: Optional[str] = None,
+        pincode: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> np.ndarray:
+        """Boolean row mask for the given filters (all optional, combined with AND)."""
+        keep = np.ones(self.rows, dtype=bool)
+        for name, value in (("state", state), ("district", district), ("source_dataset", source)):
+            if value is None:
+                continue
+            code = self.code(name, value)
+            if code is None:
+                return np.zeros(self.rows, dtype=bool)
+            keep &= self.column(name) == code
+        if pincode is not None:
+            keep &= self.column("pincode") == pincode
+        if start is not None or end is not None:
+            date = self.column("date")
+            keep &= date != DATE_NULL
+            if start is not None:
+                keep &= date >= parse_date(start)
+            if end is not None:
+                keep &= date <= parse_date(end, end=True)
+        return keep
+
+    def aggregate(
+        self,
+        metrics: Sequence[str],
+        group_by: Sequence[str] = (),
+        rows: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sums `metrics` over the selected rows (a boolean mask or index array),
+        grouped by any of GROUP_COLUMNS. Each group also reports its row count.
+        """
+        selected = slice(None) if rows is None else rows
+        if not group_by:
+            out = {"rows": self.count(rows)}
+            for metric in metrics:
+                out[metric] = int(self.column(metric)[selected].sum(dtype=np.int64))
+            return [out]
+
+        # Mixed-radix key over the group columns, then one bincount per metric
+        key = None
+        labels = []
+        for name in group_by:
+            values = np.asarray(self.column(name)[selected], dtype=np.int64)
+            uniques, codes = np.unique(values, return_inverse=True)
+            labels.append((name, uniques))
+            key = codes if key is None else key * len(uniques) + codes
+        groups, inverse = np.unique(key, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(groups))
+        sums = {
+            metric: np.bincount(inverse, weights=self.column(metric)[selected], minlength=len(groups)).astype(np.int64)
+            for metric in metrics
+        }
+
+        # Decode the combined key back into per-column labels
+        decoded = []
+        remainder = groups
+        for name, uniques in reversed(labels):
+            decoded.append((name, uniques[remainder % len(uniques)]))
+            remainder = remainder // len(uniques)
+        decoded.reverse()
+
+        out = []
+        for i in range(len(groups)):
+            group: Dict[str, Any] = {}
+            for name, values in decoded:
+                group[name] = self.label(name, int(values[i]))
+            group["rows"] = int(counts[i])
+            for metric in metrics:
+                group[metric] = int(sums[metric][i])
+            out.append(group)
+        return out
+
+    def count(self, rows: Optional[np.ndarray] = None) -> int:
+        if rows is None:
+            return self.rows
+        return int(np.count_nonzero(rows)) if rows.dtype == bool else len(rows)
+
+    def label(self, name: str, value: int) -> Any:
+        """Human readable value of a stored code for column `name`."""
+        if name in self.dictionaries:
+            return self.dictionaries[name][value]
+        if name == "month":
+            return month_label(value) if value >= 0 else None
+        if name == "date":
+            return date_label(value)
+        return value
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "metrics": self.metrics,
+            "group_by": list(GROUP_COLUMNS),
+            "date_range": self.manifest.get("date_range"),
+            "states": self.dictionaries["state"],
+            "districts": len(self.dictionaries["district"]),
+            "sources": self.dictionaries["source_dataset"],
+            "indexes": sorted(self.manifest.get("indexes", {})),
+            "ranking_levels": sorted(self.manifest.get("rollups", {}).get("levels", {})),
+            "months": self.manifest.get("rollups", {}).get("months", []),
+            "sketch_metrics": sorted(self.manifest.get("sketches", {}).get("quantiles", {}).get("metrics", {})),
+        }
+
+    def has_sketches(self) -> bool:
+        return "sketches" in self.manifest
+
+    def _sketch_file(self, *path: str) -> np.ndarray:
+        key = "sketch:" + ":".join(path)
+        values = self._columns.get(key)
+        if values is None:
+            spec = self.manifest["sketches"]
+            for part in path:
+                spec = spec[part]
+            values = np.load(os.path.join(self.path, spec), mmap_mode="r")
+            self._columns[key] = values
+        return values
+
+    def _sketch_groups(
+        self,
+        level: str,
+        state: Optional[str],
+        district: Optional[str],
+        start: Optional[str],
+        end: Optional[str],
+        by_month: bool,
+    ) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Sketch ids matching the filters (months of `start`..`end`, inclusive),
+        each one's output group, and the groups' labels.
+        """
+        keys = np.asarray(self._sketch_file("keys"))
+        months = np.asarray(self.manifest["sketches"]["months"], dtype=np.int64)
+        selected = np.ones(len(keys), dtype=bool)
+        for column, name, value in ((0, "state", state), (1, "district", district)):
+            if value is None:
+                continue
+            code = self.code(name, value)
+            if code is None:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), []
+            selected &= keys[:, column] == code
+        month_selected = np.ones(len(months), dtype=bool)
+        if start:
+            month_selected &= months >= np.datetime64(start[:7], "M").astype(np.int64)
+        if end:
+            month_selected &= months <= np.datetime64(end[:7], "M").astype(np.int64)
+
+        entities, month_index = np.flatnonzero(selected), np.flatnonzero(month_selected)
+        entity_grid = np.repeat(entities, len(month_index))
+        month_grid = np.tile(month_index, len(entities))
+        sketch_ids = entity_grid * len(months) + month_grid
+
+        if level == "national":
+            group_key = np.zeros((len(sketch_ids), 0), dtype=np.int64)
+        elif level == "state":
+            group_key = keys[entity_grid, :1].astype(np.int64)
+        else:
+            group_key = keys[entity_grid].astype(np.int64)
+        if by_month:
+            group_key = np.column_stack([group_key, month_grid])
+        if len(sketch_ids) == 0:
+            return sketch_ids, np.empty(0, dtype=np.int64), []
+        unique_keys, groups = np.unique(group_key, axis=0, return_inverse=True)
+
+        labels = []
+        for row in unique_keys:
+            label: Dict[str, Any] = {}
+            if level != "national":
+                label["state"] = self.dictionaries["state"][row[0]]
+            if level == "district":
+                label["district"] = self.dictionaries["district"][row[1]]
+            if by_month:
+                label["month"] = month_label(months[row[-1]])
+            labels.append(label)
+        return sketch_ids, groups.reshape(-1), labels
+
+    def distinct_pincodes(
+        self,
+        level: str = "national",
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        by_month: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Approximate distinct pincodes with activity per entity of `level` (and month), merged from HLL sketches."""
+        sketch_ids, groups, labels = self._sketch_groups(level, state, district, start, end, by_month)
+        if not labels:
+            return []
+        positions, position_groups = gather(self._sketch_file("hll", "offsets"), sketch_ids, groups)
+        registers = merge_hll(
+            np.asarray(self._sketch_file("hll", "registers")[positions]),
+            np.asarray(self._sketch_file("hll", "ranks")[positions]),
+            position_groups, len(labels)
+        )
+        estimates = hll_estimate(registers)
+        return [
+            {**label, "distinct_pincodes": int(round(estimate))}
+            for label, estimate, used in zip(labels, estimates, registers.any(axis=1)) if used
+        ]
+
+    def quantiles(
+        self,
+        metric: str,
+        qs: Sequence[float],
+        level: str = "national",
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        by_month: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Approximate quantiles of `metric`'s daily district totals per entity of
+        `level` (and month), merged from the quantile sketches.
+        """
+        sketch_ids, groups, labels = self._sketch_groups(level, state, district, start, end, by_month)
+        if not labels:
+            return []
+        positions, position_groups = gather(self._sketch_file("quantiles", "metrics", metric, "offsets"), sketch_ids, groups)
+        keys = np.asarray(self._sketch_file("quantiles", "metrics", metric, "keys")[positions])
+        counts = np.asarray(self._sketch_file("quantiles", "metrics", metric, "counts")[positions])
+        values = merged_quantiles(keys, counts, position_groups, len(labels), qs)
+        days = np.bincount(position_groups, weights=counts, minlength=len(labels)).astype(np.int64)
+        return [
+            {**label, "days": int(n), "quantiles": {f"{q:g}": v for q, v in zip(qs, row)}}
+            for label, n, row in zip(labels, days, values) if n
+        ]
+
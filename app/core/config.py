@@ -1,9 +1,12 @@
 import os
-from dotenv import load_dotenv
+import tempfile
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 
-load_dotenv()
+# Vercel injects env vars directly; only local runs need the .env file
+if not os.getenv("VERCEL"):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 class Settings(BaseModel):
     """
@@ -11,9 +14,52 @@ class Settings(BaseModel):
     """
     DATA_GOV_API_KEY: Optional[str] = os.getenv("DATA_GOV_API_KEY")
     CLIENT_API_KEY: Optional[str] = os.getenv("CLIENT_API_KEY")
+    # Comma separated `<key or sha256:hexdigest>[@free|standard|pro]` entries
+    CLIENT_API_KEYS: Optional[str] = os.getenv("CLIENT_API_KEYS")
+    CRON_SECRET: Optional[str] = os.getenv("CRON_SECRET")
     UPSTASH_REDIS_REST_URL: Optional[str] = os.getenv("UPSTASH_REDIS_REST_URL")
     UPSTASH_REDIS_REST_TOKEN: Optional[str] = os.getenv("UPSTASH_REDIS_REST_TOKEN")
     NODE_ENV: str = os.getenv("NODE_ENV", "development")
+
+    # GitHub Release storage
+    GH_PAT: Optional[str] = os.getenv("GH_PAT") or os.getenv("GH_TOKEN")
+    STORAGE_REPO: str = os.getenv("STORAGE_REPO", "sreecharan-desu/uidai-data-storage")
+    GITHUB_API_URL: str = os.getenv("GITHUB_API_URL", "https://api.github.com")
+    RELEASE_CACHE_TTL: int = int(os.getenv("RELEASE_CACHE_TTL", "300"))
+
+    # Dataset relay: per-stream memory is bounded by STREAM_CHUNK_SIZE * STREAM_BUFFER_CHUNKS
+    STREAM_CHUNK_SIZE: int = int(os.getenv("STREAM_CHUNK_SIZE", "65536"))
+    STREAM_BUFFER_CHUNKS: int = int(os.getenv("STREAM_BUFFER_CHUNKS", "8"))
+    STREAM_STALL_TIMEOUT: float = float(os.getenv("STREAM_STALL_TIMEOUT", "30"))
+
+    # Release assets the API reads locally (downloaded once per release version)
+    ARTIFACT_CACHE_DIR: str = os.getenv("ARTIFACT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "uidai-artifacts"))
+    COLUMNAR_STORE_ASSET: str = os.getenv("COLUMNAR_STORE_ASSET", "columnar_store.tar.gz")
+    # Serve queries from a local store directory instead (e.g. public/columnar after process_data.py)
+    COLUMNAR_STORE_PATH: Optional[str] = os.getenv("COLUMNAR_STORE_PATH")
+    QUALITY_REPORT_ASSET: str = os.getenv("QUALITY_REPORT_ASSET", "data_quality_report.json")
+    PARTITION_MANIFEST_ASSET: str = os.getenv("PARTITION_MANIFEST_ASSET", "master_partitions.json")
+    SAMPLES_MANIFEST_ASSET: str = os.getenv("SAMPLES_MANIFEST_ASSET", "samples.json")
+    CHANGES_MANIFEST_ASSET: str = os.getenv("CHANGES_MANIFEST_ASSET", "dataset_changes.json")
+
+    # Response cache (CACHE_BACKEND: auto | memory | redis | upstash)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "auto").lower()
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    CACHE_LOCAL_TTL: int = int(os.getenv("CACHE_LOCAL_TTL", "60"))
+
+    # Rate limiting (RATE_LIMIT_BACKEND: local | shared -> uses the Redis/Upstash cache backend)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "local").lower()
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "5"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "20"))
+    GLOBAL_RATE_LIMIT_PER_SECOND: float = float(os.getenv("GLOBAL_RATE_LIMIT_PER_SECOND", "50"))
+    GLOBAL_RATE_LIMIT_BURST: float = float(os.getenv("GLOBAL_RATE_LIMIT_BURST", "100"))
+    MAX_STREAMS_PER_KEY: int = int(os.getenv("MAX_STREAMS_PER_KEY", "3"))
+    MAX_STREAMS_TOTAL: int = int(os.getenv("MAX_STREAMS_TOTAL", "20"))
+
+    # Warm release metadata and upstream connections when the app boots
+    PREWARM_ON_STARTUP: bool = os.getenv("PREWARM_ON_STARTUP", "true").lower() == "true"
     
     # Resources mapping
     RESOURCES: Dict[str, str] = {
@@ -25,7 +71,7 @@ class Settings(BaseModel):
     def validate_keys(self):
         missing = []
         if not self.DATA_GOV_API_KEY: missing.append("DATA_GOV_API_KEY")
-        if not self.CLIENT_API_KEY: missing.append("CLIENT_API_KEY")
+        if not self.CLIENT_API_KEY and not self.CLIENT_API_KEYS: missing.append("CLIENT_API_KEY")
         if not self.UPSTASH_REDIS_REST_URL: missing.append("UPSTASH_REDIS_REST_URL")
         if not self.UPSTASH_REDIS_REST_TOKEN: missing.append("UPSTASH_REDIS_REST_TOKEN")
         
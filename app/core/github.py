@@ -0,0 +1,116 @@
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.cache import KEY_PREFIX, get_cache, release_version
+from app.core.config import settings
+from app.core.metrics import UPSTREAM_ERRORS, UPSTREAM_LATENCY
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger()
+
+# Shared client so warm TLS connections to GitHub survive between requests
+_client: Optional["httpx.AsyncClient"] = None
+
+# Asset fields kept in the cached release metadata
+ASSET_FIELDS = ("id", "name", "url", "browser_download_url", "size", "updated_at", "digest")
+
+# tag -> last seen release version, used to log new dataset publications
+_seen_versions: Dict[str, str] = {}
+
+
+def get_client() -> "httpx.AsyncClient":
+    """Returns the pooled upstream client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        # Deferred: httpx (and ssl) are a large share of cold-start import time
+        import httpx
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def github_headers(accept: str = "application/vnd.github.v3+json") -> Dict[str, str]:
+    if not settings.GH_PAT:
+        raise HTTPException(status_code=500, detail="Server configuration error: Missing GitHub Token.")
+    return {
+        "Authorization": f"token {settings.GH_PAT}",
+        "Accept": accept
+    }
+
+
+def _release_key(tag: str) -> str:
+    return f"{KEY_PREFIX}release:{settings.STORAGE_REPO}:{tag}"
+
+
+async def get_release(tag: str, refresh: bool = False) -> dict:
+    """
+    Returns (trimmed) release metadata for a tag in the storage repo.
+    Cached for RELEASE_CACHE_TTL seconds in the shared cache; `refresh`
+    bypasses it and re-publishes the current metadata to every instance.
+    """
+    cache = get_cache()
+    if not refresh:
+        release = await cache.get(_release_key(tag))
+        if release is not None:
+            return release
+
+    api_url = f"{settings.GITHUB_API_URL}/repos/{settings.STORAGE_REPO}/releases/tags/{tag}"
+    started = time.perf_counter()
+    try:
+        resp = await get_client().get(api_url, headers=github_headers())
+    except Exception:
+        UPSTREAM_ERRORS.labels("release_lookup", "network").inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels("release_lookup").observe(time.perf_counter() - started)
+
+    if resp.status_code != 200:
+        UPSTREAM_ERRORS.labels("release_lookup", resp.status_code).inc()
+        logger.error(f"GitHub API Error: {resp.text}")
+        raise HTTPException(status_code=404, detail="Release not found.")
+
+    data = resp.json()
+    release = {
+        "id": data.get("id"),
+        "tag_name": data.get("tag_name", tag),
+        "assets": [{k: a.get(k) for k in ASSET_FIELDS} for a in data.get("assets", [])]
+    }
+    release["version"] = release_version(release)
+
+    # Derived results are keyed by version, so a new upload invalidates them implicitly
+    previous = _seen_versions.get(tag)
+    if previous and previous != release["version"]:
+        logger.info(f"New '{tag}' release detected ({previous} -> {release['version']}).")
+    _seen_versions[tag] = release["version"]
+
+    await cache.set(_release_key(tag), release, settings.RELEASE_CACHE_TTL)
+    return release
+
+
+async def get_release_version(tag: str) -> str:
+    return (await get_release(tag))["version"]
+
+
+async def get_asset_url(filename: str, tag: str) -> str:
+    """Resolves the API download url of a release asset."""
+    release = await get_release(tag)
+    for asset in release.get("assets", []):
+        if asset["name"] == filename:
+            return asset["url"]  # This is the API url for the asset
+
+    raise HTTPException(status_code=404, detail=f"File '{filename}' not found in release '{tag}'.")
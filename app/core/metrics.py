@@ -0,0 +1,251 @@
+"""
+Minimal in-process Prometheus metrics (text exposition format 0.0.4).
+
+Kept dependency-free and cheap: label sets resolve to a child object once,
+after which an update is a single attribute increment.
+"""
+import bisect
+import math
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; spans fast cached lookups up to multi-minute dataset streams
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._new_child()
+            self._children[key] = child
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._children.items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def render(self) -> List[str]:
+        # Callback gauges read their value at scrape time (e.g. limiter state)
+        if self.callback is not None:
+            self._default().set(self.callback())
+        return super().render()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(child.buckets, child.counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        inf = 'le="+Inf"'
+        lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, inf)} {child.count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {child.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "uidai_http_request_duration_seconds",
+    "Time until response headers are sent, by route template.",
+    ("method", "route", "status")
+))
+DATASET_BYTES = registry.register(Counter(
+    "uidai_dataset_bytes_streamed_total",
+    "Bytes relayed to clients per dataset file.",
+    ("dataset", "tag")
+))
+UPSTREAM_LATENCY = registry.register(Histogram(
+    "uidai_github_request_duration_seconds",
+    "Latency of upstream GitHub calls (API lookups and asset stream opens).",
+    ("operation",)
+))
+UPSTREAM_ERRORS = registry.register(Counter(
+    "uidai_github_errors_total",
+    "Upstream GitHub calls that failed or returned an error status.",
+    ("operation", "status")
+))
+CACHE_REQUESTS = registry.register(Counter(
+    "uidai_cache_requests_total",
+    "Cache lookups by result (local_hit, shared_hit, miss).",
+    ("result",)
+))
+STREAM_ABORTS = registry.register(Counter(
+    "uidai_dataset_stream_aborts_total",
+    "Dataset relays ended early (client_disconnect, stall, upstream_error).",
+    ("reason",)
+))
+RATE_LIMIT_REJECTIONS = registry.register(Counter(
+    "uidai_rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter.",
+    ("reason",)
+))
+
+
+def route_template(scope) -> str:
+    """Route path template (e.g. /api/datasets/{dataset_name}) so labels stay low-cardinality."""
+    # Newer FastAPI resolves included routers lazily and keeps the prefixed path here
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    route = scope.get("route")
+    path = getattr(context, "path", None) or getattr(route, "path", None)
+    if path:
+        return path
+    return "static" if route is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records request latency up to the response headers. Implemented as raw
+    ASGI so body chunks of streamed datasets are forwarded without extra hops.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                REQUEST_LATENCY.labels(scope["method"], route_template(scope), message["status"]).observe(
+                    time.perf_counter() - started
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,141 @@
+"""
+Month partitions of the processed master dataset for incremental refresh.
+
+The processing job splits `master_dataset_final.csv` into one CSV per
+calendar month of `date` (`master_YYYY-MM.csv`, same header and row order
+as the master file), uploaded as individual release assets, plus a
+`master_partitions.json` manifest listing each month's asset, rows and
+bytes. Rows without a parseable date belong to no month and are only
+counted.
+
+A PowerBI RangeStart/RangeEnd window maps to the months it overlaps: months
+entirely inside the window are streamed byte for byte, the boundary months
+line by line with the date compared as text (dates are YYYY-MM-DD, the
+first column). Only the standard library is needed here.
+"""
+import datetime
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PARTITION_FORMAT = 1
+MANIFEST = "master_partitions.json"
+
+
+def partition_asset(month: str) -> str:
+    return f"master_{month}.csv"
+
+
+def write_partitions(master_csv: str, out_dir: str) -> Dict[str, Any]:
+    """Splits the master CSV into month files in one streaming pass; returns the manifest."""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in os.listdir(out_dir):
+        if name.startswith("master_") and name.endswith(".csv"):
+            os.remove(os.path.join(out_dir, name))
+
+    files: Dict[str, Any] = {}
+    rows: Dict[str, int] = {}
+    undated = 0
+    with open(master_csv, "rb") as src:
+        header = src.readline()
+        try:
+            for line in src:
+                # 'YYYY-MM-DD,...'; undated rows start with the delimiter
+                month = line[:7]
+                if line[4:5] != b"-":
+                    undated += 1
+                    continue
+                f = files.get(month)
+                if f is None:
+                    f = files[month] = open(os.path.join(out_dir, partition_asset(month.decode())), "wb")
+                    f.write(header)
+                    rows[month] = 0
+                f.write(line)
+                rows[month] += 1
+        finally:
+            for f in files.values():
+                f.close()
+
+    partitions = []
+    for month in sorted(files):
+        asset = partition_asset(month.decode())
+        partitions.append({
+            "month": month.decode(),
+            "asset": asset,
+            "rows": rows[month],
+            "bytes": os.path.getsize(os.path.join(out_dir, asset)),
+        })
+    manifest = {
+        "format": PARTITION_FORMAT,
+        "header": header.decode().rstrip("\r\n"),
+        "partitions": partitions,
+        "undated_rows": undated,
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def parse_bound(value: str) -> datetime.datetime:
+    """Parses a RangeStart/RangeEnd value (ISO date or datetime; an offset is ignored)."""
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1]
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+
+
+def date_window(start: datetime.datetime, end: datetime.datetime) -> Tuple[str, str]:
+    """
+    Row dates d (at midnight) with start <= d < end, as a half-open range of
+    YYYY-MM-DD strings [lo, hi). This is the filter PowerBI applies with
+    RangeStart/RangeEnd, so consecutive partitions neither overlap nor skip.
+    """
+    def ceil_day(moment: datetime.datetime) -> datetime.date:
+        day = moment.date()
+        return day if moment.time() == datetime.time() else day + datetime.timedelta(days=1)
+
+    return ceil_day(start).isoformat(), ceil_day(end).isoformat()
+
+
+def _next_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
+def select_partitions(manifest: Dict[str, Any], lo: str, hi: str) -> List[Tuple[Dict[str, Any], bool]]:
+    """The manifest's partitions overlapping [lo, hi), each with whether it lies entirely inside."""
+    selected = []
+    for partition in manifest["partitions"]:
+        first, after = f"{partition['month']}-01", f"{_next_month(partition['month'])}-01"
+        if first < hi and after > lo:
+            selected.append((partition, lo <= first and after <= hi))
+    return selected
+
+
+def iter_partition(path: str, lo: Optional[str], hi: Optional[str], chunk_size: int) -> Iterator[bytes]:
+    """
+    Yields the rows of one partition file (without its header) in chunks of
+    about `chunk_size` bytes; with `lo`/`hi` only rows dated in [lo, hi).
+    """
+    with open(path, "rb") as f:
+        f.readline()
+        if lo is None:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+        lo_b, hi_b = lo.encode(), hi.encode()
+        out: List[bytes] = []
+        size = 0
+        for line in f:
+            day = line[:10]
+            if lo_b <= day < hi_b:
+                out.append(line)
+                size += len(line)
+                if size >= chunk_size:
+                    yield b"".join(out)
+                    out, size = [], 0
+        if out:
+            yield b"".join(out)
@@ -0,0 +1,201 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import Gauge, registry
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Token bucket evaluated atomically inside Redis. Uses the server clock so
+# every instance refills against the same time source.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or burst
+local ts = tonumber(data[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """Classic token bucket; two floats of state per bucket."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consumes one token. Returns 0 when allowed, else seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Per-identity and global token buckets held in process memory.
+    Per-identity buckets live in a bounded LRU so memory stays O(max_keys).
+    """
+
+    def __init__(self, rate: float, burst: float, global_rate: float, global_burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def _take_local(self, identity: str, rate: float, burst: float) -> float:
+        bucket = self._buckets.get(identity)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            self._buckets[identity] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(identity)
+        return bucket.take()
+
+    async def check(self, identity: str, rate: Optional[float] = None, burst: Optional[float] = None) -> float:
+        """Returns 0 when the request may proceed, else the Retry-After in seconds."""
+        wait = self._take_local(identity, rate or self.rate, burst or self.burst)
+        if wait:
+            return wait
+        return self.global_bucket.take()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Same limits evaluated in Redis/Upstash so they hold across instances.
+    Falls back to the in-process buckets if the shared store is unreachable.
+    """
+
+    def __init__(self, backend: Any, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.backend = backend
+
+    async def _take_shared(self, key: str, rate: float, burst: float) -> float:
+        wait = await self.backend.command("EVAL", TOKEN_BUCKET_LUA, 1, f"uidai:ratelimit:{key}", rate, burst)
+        return float(wait)
+
+    async def check(self, identity: str, rate: Optional[float] = None, burst: Optional[float] = None) -> float:
+        try:
+            wait = await self._take_shared(identity, rate or self.rate, burst or self.burst)
+            if wait:
+                return wait
+            return await self._take_shared("global", self.global_bucket.rate, self.global_bucket.capacity)
+        except Exception as e:
+            logger.warning(f"Shared rate limiter unavailable, using local buckets: {e}")
+            return await super().check(identity, rate, burst)
+
+
+class StreamLimiter:
+    """Caps concurrent streaming downloads per identity and per instance."""
+
+    def __init__(self, per_key: int, total: int):
+        self.per_key = per_key
+        self.total = total
+        self.active = 0
+        self._per_identity: Dict[str, int] = {}
+
+    def acquire(self, identity: str, per_key: Optional[int] = None) -> bool:
+        current = self._per_identity.get(identity, 0)
+        if current >= (per_key or self.per_key) or self.active >= self.total:
+            return False
+        self._per_identity[identity] = current + 1
+        self.active += 1
+        return True
+
+    def release(self, identity: str):
+        current = self._per_identity.get(identity, 0)
+        if current <= 1:
+            self._per_identity.pop(identity, None)
+        else:
+            self._per_identity[identity] = current - 1
+        self.active = max(0, self.active - 1)
+
+
+class ReleasingIterator:
+    """
+    Wraps a response body iterator and calls `release` exactly once when the
+    stream finishes, fails, is closed, or is garbage collected unstarted.
+    """
+
+    def __init__(self, iterator, release: Callable[[], None]):
+        self._iterator = iterator
+        self._release = release
+
+    def _done(self):
+        if self._release is not None:
+            release, self._release = self._release, None
+            release()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            self._done()
+            raise
+
+    async def aclose(self):
+        self._done()
+        if hasattr(self._iterator, "aclose"):
+            await self._iterator.aclose()
+
+    def __del__(self):
+        self._done()
+
+
+def retry_after_header(wait: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(wait)))}
+
+
+def build_rate_limiter() -> RateLimiter:
+    args = (
+        settings.RATE_LIMIT_PER_SECOND,
+        settings.RATE_LIMIT_BURST,
+        settings.GLOBAL_RATE_LIMIT_PER_SECOND,
+        settings.GLOBAL_RATE_LIMIT_BURST,
+    )
+    if settings.RATE_LIMIT_BACKEND == "shared":
+        from app.core.cache import get_cache
+        shared = get_cache().shared
+        if shared is not None and hasattr(shared, "command"):
+            return SharedRateLimiter(shared, *args)
+        logger.warning("RATE_LIMIT_BACKEND=shared but no Redis/Upstash cache is configured; using local buckets.")
+    return RateLimiter(*args)
+
+
+rate_limiter = build_rate_limiter()
+stream_limiter = StreamLimiter(settings.MAX_STREAMS_PER_KEY, settings.MAX_STREAMS_TOTAL)
+
+registry.register(Gauge(
+    "uidai_active_streams",
+    "Dataset downloads currently being relayed by this instance.",
+    callback=lambda: stream_limiter.active
+))
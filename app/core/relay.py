@@ -0,0 +1,104 @@
+"""
+Bounded relay between an upstream byte stream and a downstream client.
+
+A producer task reads upstream in fixed-size chunks into a bounded queue, so
+each stream holds at most `buffer_chunks * chunk_size` bytes. If the client
+stops reading for `stall_timeout` seconds the upstream is dropped instead of
+holding its socket open, and a client disconnect cancels the producer (which
+closes the upstream response) immediately rather than when the generator is
+eventually garbage collected.
+"""
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.core.metrics import STREAM_ABORTS
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger()
+
+_EOF = object()
+
+
+class StreamStalled(Exception):
+    """The downstream client did not accept data within the stall timeout."""
+
+
+async def relay(
+    open_upstream: Callable[[], Awaitable["httpx.Response"]],
+    chunk_size: int,
+    buffer_chunks: int,
+    stall_timeout: float,
+    on_chunk: Optional[Callable[[int], None]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yields the body of the response returned by `open_upstream`.
+    `open_upstream` must return a streaming httpx response; it is always closed.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_chunks)
+
+    def abort(error: BaseException):
+        # The stream is already broken, so buffered data is dropped to make room
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(error)
+
+    async def produce():
+        response = None
+        try:
+            response = await open_upstream()
+            async for chunk in response.aiter_bytes(chunk_size):
+                await asyncio.wait_for(queue.put(chunk), stall_timeout)
+            await asyncio.wait_for(queue.put(_EOF), stall_timeout)
+        except asyncio.TimeoutError:
+            STREAM_ABORTS.labels("stall").inc()
+            logger.warning(f"Dropping stalled stream after {stall_timeout}s without client progress")
+            abort(StreamStalled(f"client read nothing for {stall_timeout}s"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            STREAM_ABORTS.labels("upstream_error").inc()
+            logger.warning(f"Upstream stream failed: {e}")
+            abort(e)
+        finally:
+            if response is not None:
+                await response.aclose()
+
+    producer = asyncio.create_task(produce())
+    finished = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _EOF:
+                finished = True
+                return
+            if isinstance(item, BaseException):
+                finished = True
+                raise item
+            if on_chunk is not None:
+                on_chunk(len(item))
+            yield item
+    finally:
+        if not finished:
+            STREAM_ABORTS.labels("client_disconnect").inc()
+        # Synchronous on purpose: this can run inside a cancelled scope
+        producer.cancel()
+
+
+class RelayStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body iterator as soon as sending stops,
+    including on client disconnect, so upstream cleanup runs promptly.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
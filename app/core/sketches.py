@@ -0,0 +1,179 @@
+"""
+Mergeable sketches per (district, month) for approximate aggregates.
+
+For every district (a (state, district) pair) and calendar month the store
+keeps:
+- a HyperLogLog sketch of the distinct pincodes with activity rows, stored
+  sparsely: the (register, rank) pairs that are non-zero;
+- per metric, a log-bucketed quantile sketch (DDSketch-style, relative
+  accuracy QUANTILE_ACCURACY) of the district's daily totals, as
+  (bucket, count) pairs.
+
+Both merge by simple reductions (max of registers, sum of bucket counts),
+so distinct counts and quantiles for any state, the country, or a range of
+months are answered from the sketches alone. Sketches are laid out CSR
+style: `<name>_offsets.npy` gives each sketch's range in the value arrays,
+with sketch id = entity * months + month index. Only numpy is needed.
+"""
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+HLL_PRECISION = 12
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+QUANTILE_ACCURACY = 0.01
+GAMMA = (1 + QUANTILE_ACCURACY) / (1 - QUANTILE_ACCURACY)
+# Quantile sketches are built for these metrics' daily district totals
+SKETCH_METRICS = ("total_biometric_updates", "total_enrolment", "total_demographic_updates", "total_activity")
+
+
+def hash64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: a fixed, well-mixed 64-bit hash of integer values."""
+    x = values.astype(np.uint64)
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hll_update(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Register index and rank (leading zeros + 1 of the remaining bits) of each value."""
+    h = hash64(values)
+    register = (h >> np.uint64(64 - HLL_PRECISION)).astype(np.int64)
+    rest = h & np.uint64((1 << (64 - HLL_PRECISION)) - 1)
+    # frexp is exact here: the remaining 52 bits fit a float64 mantissa
+    _, exponent = np.frexp(rest.astype(np.float64))
+    rank = np.where(rest == 0, 64 - HLL_PRECISION + 1, 64 - HLL_PRECISION - exponent + 1)
+    return register, rank.astype(np.uint8)
+
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """Cardinality estimates for dense register rows, shape (sketches, HLL_REGISTERS)."""
+    m = HLL_REGISTERS
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis=1)
+    zeros = np.sum(registers == 0, axis=1)
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    # Linear counting for small cardinalities
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def quantile_key(values: np.ndarray) -> np.ndarray:
+    """Bucket of each non-negative value: 0 for zero, else ceil(log_gamma(v)) + 1."""
+    values = np.asarray(values, dtype=np.float64)
+    keys = np.zeros(len(values), dtype=np.int64)
+    positive = values > 0
+    keys[positive] = np.ceil(np.log(values[positive]) / np.log(GAMMA)).astype(np.int64) + 1
+    return keys
+
+
+def quantile_value(keys: np.ndarray) -> np.ndarray:
+    """Representative value of buckets (within QUANTILE_ACCURACY of any value in them)."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return np.where(keys == 0, 0.0, 2 * np.power(GAMMA, keys - 1) / (GAMMA + 1))
+
+
+def _save_csr(out_dir: str, name: str, sketch: np.ndarray, sketches: int, **arrays) -> Dict[str, str]:
+    """Writes values sorted by sketch id with `<name>_offsets.npy`; returns the file names."""
+    files = {"offsets": f"{name}_offsets.npy"}
+    np.save(os.path.join(out_dir, files["offsets"]), np.searchsorted(sketch, np.arange(sketches + 1)).astype(np.int64))
+    for part, values in arrays.items():
+        files[part] = f"{name}_{part}.npy"
+        np.save(os.path.join(out_dir, files[part]), values)
+    return files
+
+
+def write_sketches(columns: Dict[str, np.ndarray], entity_keys: np.ndarray, entity: np.ndarray, out_dir: str) -> Dict[str, Any]:
+    """
+    Builds the sketches of every (district entity, month) from the store's
+    columns (`entity` is each row's district entity, `entity_keys` their
+    (state, district) codes) and returns the manifest section.
+    """
+    month = columns["month"].astype(np.int64)
+    valid = month >= 0
+    months = np.unique(month[valid])
+    entities = len(entity_keys)
+    sketches = entities * len(months)
+    sketch_of_row = entity[valid] * len(months) + np.searchsorted(months, month[valid])
+
+    # HLL: one (sketch, register) slot per distinct pincode, keeping the max rank
+    pairs = np.unique(sketch_of_row * (1 << 32) + columns["pincode"][valid].astype(np.int64) + (1 << 31))
+    sketch, pincode = pairs >> 32, (pairs & 0xFFFFFFFF) - (1 << 31)
+    register, rank = hll_update(pincode)
+    slot = sketch * HLL_REGISTERS + register
+    order = np.lexsort((rank, slot))
+    slot, rank = slot[order], rank[order]
+    last = np.r_[slot[1:] != slot[:-1], True]
+    slot, rank = slot[last], rank[last]
+    hll = _save_csr(
+        out_dir, "hll", slot // HLL_REGISTERS, sketches,
+        registers=(slot % HLL_REGISTERS).astype(np.uint16), ranks=rank
+    )
+
+    # Quantiles: daily totals per district, bucketed, counted per sketch
+    date = columns["date"][valid].astype(np.int64)
+    days, day_of_row = np.unique(entity[valid] * (1 << 32) + date, return_inverse=True)
+    day_month = (np.datetime64("1970-01-01", "D") + (days & 0xFFFFFFFF)).astype("datetime64[M]").astype(np.int64)
+    day_sketch = (days >> 32) * len(months) + np.searchsorted(months, day_month)
+    quantiles = {}
+    for name in SKETCH_METRICS:
+        totals = np.bincount(day_of_row, weights=columns[name][valid], minlength=len(days))
+        buckets, counts = np.unique(day_sketch * (1 << 16) + quantile_key(totals), return_counts=True)
+        quantiles[name] = _save_csr(
+            out_dir, f"quantile_{name}", buckets >> 16, sketches,
+            keys=(buckets & 0xFFFF).astype(np.int16), counts=counts.astype(np.uint32)
+        )
+
+    np.save(os.path.join(out_dir, "sketch_keys.npy"), entity_keys.astype(np.int32))
+    return {
+        "keys": "sketch_keys.npy",
+        "months": [int(m) for m in months],
+        "hll": {"precision": HLL_PRECISION, **hll},
+        "quantiles": {"relative_accuracy": QUANTILE_ACCURACY, "metrics": quantiles},
+    }
+
+
+def gather(offsets: np.ndarray, sketch_ids: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of the given sketches' values and the group of each position."""
+    starts = np.asarray(offsets[sketch_ids], dtype=np.int64)
+    lengths = np.asarray(offsets[sketch_ids + 1], dtype=np.int64) - starts
+    total = int(lengths.sum())
+    run_start = np.cumsum(lengths) - lengths
+    positions = np.repeat(starts - run_start, lengths) + np.arange(total)
+    return positions, np.repeat(groups, lengths)
+
+
+def merge_hll(registers: np.ndarray, ranks: np.ndarray, groups: np.ndarray, group_count: int) -> np.ndarray:
+    """Dense merged registers per group from gathered sparse (register, rank) pairs."""
+    dense = np.zeros(group_count * HLL_REGISTERS, dtype=np.uint8)
+    np.maximum.at(dense, groups * HLL_REGISTERS + registers.astype(np.int64), ranks)
+    return dense.reshape(group_count, HLL_REGISTERS)
+
+
+def merged_quantiles(
+    keys: np.ndarray, counts: np.ndarray, groups: np.ndarray, group_count: int, qs: Sequence[float]
+) -> List[List[float]]:
+    """Quantiles `qs` of each group's merged buckets (None for an empty group)."""
+    slot, inverse = np.unique(groups * (1 << 16) + keys.astype(np.int64), return_inverse=True)
+    totals = np.bincount(inverse, weights=counts, minlength=len(slot))
+    slot_group = slot >> 16
+    slot_value = quantile_value(slot & 0xFFFF)
+    bounds = np.searchsorted(slot_group, np.arange(group_count + 1))
+
+    results = []
+    for g in range(group_count):
+        lo, hi = bounds[g], bounds[g + 1]
+        if lo == hi:
+            results.append([None] * len(qs))
+            continue
+        cumulative = np.cumsum(totals[lo:hi])
+        n = cumulative[-1]
+        # Rank of the q-quantile among the n values (lower nearest rank)
+        ranks = np.floor(np.asarray(qs) * (n - 1))
+        at = np.searchsorted(cumulative, ranks, side="right")
+        results.append([round(float(v), 2) for v in slot_value[lo:hi][at]])
+    return results
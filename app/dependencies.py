@@ -1,17 +1,46 @@
+import hmac
+from typing import Optional
 from fastapi import Request, HTTPException, status
+from app.core.api_keys import ApiKey, registry
 from app.core.config import settings
 from app.utils.logger import get_logger
 
 logger = get_logger()
 
-async def validate_api_key(request: Request):
-    api_key = request.headers.get("x-api-key") or request.query_params.get("api_key")
+def resolve_request_key(request: Request) -> Optional[ApiKey]:
+    """Resolves the request's API key once; the result is memoized on request.state."""
+    if not hasattr(request.state, "api_key"):
+        raw_key = request.headers.get("x-api-key") or request.query_params.get("api_key")
+        request.state.api_key = registry.resolve(raw_key)
+    return request.state.api_key
+
+async def validate_api_key(request: Request) -> ApiKey:
+    api_key = resolve_request_key(request)
     
-    if not api_key or api_key != settings.CLIENT_API_KEY:
-        received = api_key if api_key else ""
-        logger.warning(f"Unauthorized API access attempt. Match: {api_key == settings.CLIENT_API_KEY}")
+    if api_key is None:
+        registry.record_failure()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Unauthorized: Invalid or missing API Key"
         )
     return api_key
+
+async def validate_cron_secret(request: Request):
+    """
+    Accepts Vercel cron invocations (Authorization: Bearer <CRON_SECRET>)
+    and falls back to regular API key validation for manual triggers.
+    """
+    auth = request.headers.get("authorization", "")
+    if settings.CRON_SECRET and hmac.compare_digest(auth, f"Bearer {settings.CRON_SECRET}"):
+        return auth
+    return await validate_api_key(request)
+
+def get_client_identity(request: Request) -> str:
+    """Stable identity for rate limiting: the key id for valid keys, else the client IP."""
+    api_key = resolve_request_key(request)
+    if api_key is not None:
+        return "key:" + api_key.key_id
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return "ip:" + forwarded.split(",")[0].strip()
+    return "ip:" + (request.client.host if request.client else "unknown")
@@ -1,19 +1,42 @@
 from fastapi import FastAPI, Request, Depends
-from fastapi.responses import JSONResponse, FileResponse, RedirectResponse, HTMLResponse
+from fastapi.responses import JSONResponse, FileResponse, RedirectResponse, HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+import asyncio
 import os
+import re
 
 from app.utils.logger import get_logger
 from app.api.v1.api import api_router
-from app.dependencies import validate_api_key
+from app.core.config import settings
+from app.core.cache import close_cache
+from app.core.github import close_client
+from app.core.metrics import RATE_LIMIT_REJECTIONS, MetricsMiddleware, registry
+from app.core.prewarm import run_prewarm
+from app.core.rate_limit import ReleasingIterator, rate_limiter, retry_after_header, stream_limiter
+from app.dependencies import get_client_identity, resolve_request_key, validate_api_key
 
 logger = get_logger()
 
+async def _startup_prewarm():
+    report = await run_prewarm()
+    logger.info(f"Startup prewarm finished: {report['status']} in {report['total_ms']}ms")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm in the background so boot is not blocked on GitHub round-trips
+    task = asyncio.create_task(_startup_prewarm()) if settings.PREWARM_ON_STARTUP and settings.GH_PAT else None
+    yield
+    if task and not task.done():
+        task.cancel()
+    await close_client()
+    await close_cache()
+
 app = FastAPI(
     title="UIDAI Insights API",
     docs_url=None, 
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -24,6 +47,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Endpoints that relay full dataset files and count against the stream cap:
+# /api/datasets/{name} and /api/datasets/raw/{name}, not their /changes or /sample
+STREAMING_PATHS = re.compile(r"^/api/datasets/(raw/)?[^/]+/?$")
+
+@app.middleware("http")
+async def rate_limit_middleware(request: Request, call_next):
+    path = request.url.path
+    if not settings.RATE_LIMIT_ENABLED or not path.startswith("/api/") or path.startswith("/api/cron/"):
+        return await call_next(request)
+
+    api_key = resolve_request_key(request)
+    identity = get_client_identity(request)
+    wait = await rate_limiter.check(
+        identity,
+        api_key.rate_per_second if api_key else None,
+        api_key.burst if api_key else None
+    )
+    if wait:
+        RATE_LIMIT_REJECTIONS.labels("rate").inc()
+        return JSONResponse(
+            status_code=429,
+            content={"error": "Too Many Requests", "message": "Rate limit exceeded. Please retry later."},
+            headers=retry_after_header(wait)
+        )
+
+    if not STREAMING_PATHS.match(path):
+        return await call_next(request)
+
+    if not stream_limiter.acquire(identity, api_key.max_streams if api_key else None):
+        RATE_LIMIT_REJECTIONS.labels("streams").inc()
+        return JSONResponse(
+            status_code=429,
+            content={"error": "Too Many Requests", "message": "Too many concurrent downloads. Wait for one to finish."},
+            headers=retry_after_header(1)
+        )
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        stream_limiter.release(identity)
+        raise
+    # Hold the slot until the body has been fully relayed (or the client goes away)
+    response.body_iterator = ReleasingIterator(response.body_iterator, lambda: stream_limiter.release(identity))
+    return response
+
 @app.middleware("http")
 async def kill_switch_middleware(request: Request, call_next):
     # Check if Kill Switch is active via Env Var
@@ -53,9 +121,17 @@ async def add_security_headers(request: Request, call_next):
     )
     return response
 
+# Outermost layer; pure ASGI so streamed dataset chunks pass through untouched
+app.add_middleware(MetricsMiddleware)
+
 # Routes
 app.include_router(api_router, prefix="/api")
 
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(validate_api_key)])
+def metrics():
+    """Prometheus text exposition of request, upstream, cache and rate-limit metrics."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/", response_class=HTMLResponse)
 def read_root():
     return """
@@ -116,8 +192,23 @@ def custom_docs():
         return FileResponse(path)
     return RedirectResponse(url="/docs.html")
 
-# Mount Public folder for /datasets/ downloads or other assets
-if os.path.exists("public"):
-    app.mount("/", StaticFiles(directory="public", html=True), name="public")
-else:
-    logger.warning("Public directory not found. Static files will not be served via FastAPI mount.")
+class LazyStaticFiles:
+    """Defers importing and configuring StaticFiles until the first static request."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._app = None
+
+    async def __call__(self, scope, receive, send):
+        if self._app is None:
+            from fastapi.staticfiles import StaticFiles
+            self._app = StaticFiles(directory=self.directory, html=True)
+        await self._app(scope, receive, send)
+
+# Mount Public folder for /datasets/ downloads or other assets.
+# On Vercel the CDN serves public/ and only rewritten routes reach this function.
+if not os.getenv("VERCEL"):
+    if os.path.exists("public"):
+        app.mount("/", LazyStaticFiles(directory="public"), name="public")
+    else:
+        logger.warning("Public directory not found. Static files will not be served via FastAPI mount.")
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Repository root (the serverless entrypoint imports from here)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module, env=None):
+    """
+    Imports `module` in a fresh interpreter with `python -X importtime`.
+    Returns (wall_ms, {module_name: (self_us, cumulative_us)}).
+    """
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    started = time.perf_counter()
+    result = subprocess.run(cmd, cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return wall_ms, timings
+
+
+def run_benchmark(module, runs, top, vercel):
+    env = os.environ.copy()
+    if vercel:
+        # Mirror the serverless startup path (no .env loading, no static mount)
+        env["VERCEL"] = "1"
+
+    # Warm the filesystem cache / .pyc files once so runs are comparable
+    measure_import(module, env)
+
+    walls, totals, per_module = [], [], {}
+    for _ in range(runs):
+        wall_ms, timings = measure_import(module, env)
+        walls.append(wall_ms)
+        totals.append(timings.get(module, (0, 0))[1] / 1000)
+        for name, (_, cumulative_us) in timings.items():
+            per_module.setdefault(name, []).append(cumulative_us / 1000)
+
+    # Top-level packages (no dot) give the clearest picture of what is pulled in
+    heaviest = sorted(
+        ((name, statistics.median(values)) for name, values in per_module.items() if "." not in name and name != module),
+        key=lambda item: item[1],
+        reverse=True
+    )[:top]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "vercel_mode": vercel,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "import_ms": {
+            "median": round(statistics.median(totals), 2),
+            "min": round(min(totals), 2),
+            "max": round(max(totals), 2)
+        },
+        "process_wall_ms": {
+            "median": round(statistics.median(walls), 2),
+            "min": round(min(walls), 2)
+        },
+        "heaviest_packages_ms": {name: round(ms, 2) for name, ms in heaviest}
+    }
+
+
+def compare(report, baseline_path, threshold):
+    """Returns False when the median import time regressed beyond `threshold` (fraction)."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    before = baseline["import_ms"]["median"]
+    after = report["import_ms"]["median"]
+    change = (after - before) / before if before else 0.0
+    print(f"Baseline median: {before}ms -> current median: {after}ms ({change:+.1%})")
+
+    for name, ms in report["heaviest_packages_ms"].items():
+        previous = baseline.get("heaviest_packages_ms", {}).get(name)
+        if previous is None:
+            print(f"  new heavy import: {name} ({ms}ms)")
+
+    return change <= threshold
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the API entrypoint.")
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreter runs to take the median over")
+    parser.add_argument("--top", type=int, default=15, help="Number of heaviest packages to report")
+    parser.add_argument("--no-vercel", action="store_true", help="Measure the local (non-serverless) startup path")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed regression vs baseline (default 10%%)")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.module, args.runs, args.top, vercel=not args.no_vercel)
+
+    print(f"Import time for {report['module']} over {report['runs']} runs: "
+          f"median {report['import_ms']['median']}ms (min {report['import_ms']['min']}ms, max {report['import_ms']['max']}ms)")
+    print("Heaviest top-level packages:")
+    for name, ms in report["heaviest_packages_ms"].items():
+        print(f"  {name:<30} {ms:>9.2f}ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.baseline and not compare(report, args.baseline, args.threshold):
+        print("Import time regression exceeds threshold.")
+        sys.exit(1)
@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add scripts directory to path to import the pipeline
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import process_data
+from generate_synthetic_data import generate, parse_rows
+from pipeline_metrics import RunReport
+
+
+def run_benchmark(data_dir, output_dir, run, engine="pandas", engine_options=None):
+    """
+    Runs the pipeline under `run`. For the pandas engine basic_clean is also
+    timed separately inside the load stage.
+    """
+    if engine != "pandas":
+        process_data.run_pipeline_in(run, data_dir, output_dir, engine, engine_options)
+        record_bytes_written(run, output_dir)
+        return
+
+    clean_time = {"wall_s": 0.0, "cpu_s": 0.0}
+    original_clean = process_data.basic_clean
+
+    def timed_clean(df):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return original_clean(df)
+        finally:
+            clean_time["wall_s"] += time.perf_counter() - wall
+            clean_time["cpu_s"] += time.process_time() - cpu
+
+    # basic_clean runs inside the per-source loaders; wrap it to time it separately
+    process_data.basic_clean = timed_clean
+    try:
+        process_data.run_pipeline_in(run, data_dir, output_dir)
+    finally:
+        process_data.basic_clean = original_clean
+
+    load = run.stages[0]
+    load["wall_s"] = round(load["wall_s"] - clean_time["wall_s"], 4)
+    load["cpu_s"] = round(load["cpu_s"] - clean_time["cpu_s"], 4)
+    run.stages.insert(1, {
+        "stage": "basic_clean",
+        "wall_s": round(clean_time["wall_s"], 4),
+        "cpu_s": round(clean_time["cpu_s"], 4),
+        "note": "measured inside load; memory is included in the load stage"
+    })
+    record_bytes_written(run, output_dir)
+
+
+def record_bytes_written(run, output_dir):
+    write = next(s for s in run.stages if s["stage"] == "write")
+    write["bytes_written"] = sum(
+        os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir)
+        if name.endswith(".csv")
+    )
+
+
+def compare(report, baseline_path, threshold):
+    """Prints per-stage deltas against a previous report; False if any stage regressed."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {s["stage"]: s for s in baseline["stages"]}
+
+    ok = True
+    print(f"\nComparison with {baseline_path}:")
+    for stage in report["stages"]:
+        before = previous.get(stage["stage"])
+        if not before or not before.get("wall_s"):
+            continue
+        change = (stage["wall_s"] - before["wall_s"]) / before["wall_s"]
+        flag = ""
+        # Ignore noise on sub-100ms stages
+        if change > threshold and stage["wall_s"] - before["wall_s"] > 0.1:
+            flag = "  <-- REGRESSION"
+            ok = False
+        print(f"  {stage['stage']:<18} {before['wall_s']:>9.3f}s -> {stage['wall_s']:>9.3f}s ({change:+.1%}){flag}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile each stage of process_data.py.")
+    parser.add_argument("--data-dir", default="benchmarks/data", help="Directory with biometric/enrollment/demographic CSVs")
+    parser.add_argument("--rows", help="Generate synthetic data of this size first (1m, 10m, 50m or a number)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/pipeline-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed per-stage wall time regression (default 15%%)")
+    parser.add_argument("--profile-dir", help="Also dump a cProfile file per stage into this directory")
+    parser.add_argument("--engine", choices=process_data.ENGINES, default="pandas", help="Processing engine to benchmark")
+    parser.add_argument("--memory-limit", help="DuckDB memory limit, e.g. 512MB")
+    parser.add_argument("--threads", type=int, help="DuckDB worker threads")
+    args = parser.parse_args()
+
+    if args.rows:
+        generate(parse_rows(args.rows), args.data_dir, seed=args.seed)
+
+    manifest_path = os.path.join(args.data_dir, "synthetic_manifest.json")
+    manifest = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    run = RunReport(profile_dir=args.profile_dir)
+    with tempfile.TemporaryDirectory(prefix="uidai-bench-") as output_dir:
+        options = {"memory_limit": args.memory_limit, "threads": args.threads} if args.engine == "duckdb" else None
+        run_benchmark(args.data_dir, output_dir, run, engine=args.engine, engine_options=options)
+
+    report = run.to_dict(
+        pandas=process_data.pd.__version__,
+        numpy=process_data.np.__version__,
+        data_dir=args.data_dir,
+        engine=args.engine,
+        dataset=manifest
+    )
+    stages = report["stages"]
+
+    print("\nStage timings:")
+    for stage in stages:
+        peak = f"{stage['peak_rss_mb']:>9.1f}MB peak" if "peak_rss_mb" in stage else ""
+        print(f"  {stage['stage']:<18} {stage['wall_s']:>9.3f}s wall {stage['cpu_s']:>9.3f}s cpu {peak}")
+    print(f"  {'total':<18} {report['total_wall_s']:>9.3f}s")
+
+    output = args.output or os.path.join("benchmarks", "results", f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline and not compare(report, args.baseline, args.threshold):
+        sys.exit(1)
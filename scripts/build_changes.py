@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add scripts directory to path to import utils, and the repo root for the shared change-feed format
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.changes import CHANGES_FORMAT, KEY_COLUMNS, MANIFEST, MAX_HISTORY, delta_asset, file_version
+from github_utils import download_from_release
+
+MATCH_COLUMNS = list(KEY_COLUMNS) + ["occurrence"]
+
+
+def load_master(path):
+    """The master CSV as text, with each row's occurrence among rows sharing its key."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df["occurrence"] = df.groupby(list(KEY_COLUMNS), sort=False).cumcount().astype(str)
+    return df
+
+
+def diff_masters(previous, current):
+    """
+    Keyed diff of two masters loaded with load_master(). Values are compared
+    as numbers, so '3' and '3.0' are the same count. Returns the delta frame:
+    op, occurrence, then the dataset's columns.
+    """
+    columns = [c for c in current.columns if c != "occurrence"]
+    values = [c for c in columns if c not in KEY_COLUMNS]
+    merged = previous.merge(current, on=MATCH_COLUMNS, how="outer", suffixes=("_old", ""), indicator=True, sort=False)
+
+    both = merged["_merge"] == "both"
+    old = merged[[f"{c}_old" for c in values]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    new = merged[values].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    same = ((old == new) | (np.isnan(old) & np.isnan(new))).all(axis=1)
+
+    removed = merged[merged["_merge"] == "left_only"].copy()
+    for c in values:
+        removed[c] = removed[f"{c}_old"]
+    removed["op"] = "removed"
+    changed = merged[both & ~same].copy()
+    changed["op"] = "changed"
+    added = merged[merged["_merge"] == "right_only"].copy()
+    added["op"] = "added"
+    return pd.concat([removed, changed, added])[["op", "occurrence"] + columns]
+
+
+def build_changes(current_path, previous_path, previous_manifest, out_dir):
+    """Writes the delta against the previous master (if any) and the updated manifest."""
+    os.makedirs(out_dir, exist_ok=True)
+    version = file_version(current_path)
+    manifest = {"format": CHANGES_FORMAT, "version": version, "history": []}
+    if previous_manifest:
+        manifest["history"] = previous_manifest.get("history", [])
+
+    previous_version = None
+    if previous_manifest:
+        previous_version = previous_manifest["version"]
+    elif previous_path and os.path.exists(previous_path):
+        previous_version = file_version(previous_path)
+
+    if previous_version is None:
+        print("No previous release found; starting the change history at this version.")
+    elif previous_version == version:
+        print(f"Dataset unchanged since {version}; no delta written.")
+    else:
+        if not (previous_path and os.path.exists(previous_path)):
+            raise FileNotFoundError(f"Previous master dataset ({previous_version}) not found at {previous_path}")
+        print(f"Diffing {previous_version} -> {version}...")
+        delta = diff_masters(load_master(previous_path), load_master(current_path))
+        asset = delta_asset(previous_version, version)
+        delta.to_csv(os.path.join(out_dir, asset), index=False, compression="gzip")
+        counts = delta["op"].value_counts()
+        entry = {
+            "version": version,
+            "previous": previous_version,
+            "asset": asset,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            **{op: int(counts.get(op, 0)) for op in ("added", "removed", "changed")},
+        }
+        history = manifest["history"] + [entry]
+        manifest["history"] = history[-MAX_HISTORY:]
+        if len(history) > MAX_HISTORY:
+            print(f"Dropped {len(history) - MAX_HISTORY} old delta(s) from the history; upload_to_github.py deletes their assets.")
+        print(f"Wrote {asset}: {entry['added']} added, {entry['removed']} removed, {entry['changed']} changed.")
+
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the release-to-release change feed of the master dataset.")
+    parser.add_argument("--current", default="public/master_dataset_final.csv")
+    parser.add_argument("--previous-dir", default="public/previous",
+                        help="Where the previous release's master and change manifest are (downloaded unless --no-download)")
+    parser.add_argument("--no-download", action="store_true", help="Use files already in --previous-dir")
+    parser.add_argument("--out-dir", default="public/changes")
+    args = parser.parse_args()
+
+    if not args.no_download:
+        for name in ("master_dataset_final.csv", MANIFEST):
+            download_from_release(name, args.previous_dir, tag_name="dataset-latest")
+
+    previous_manifest = None
+    manifest_path = os.path.join(args.previous_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous_manifest = json.load(f)
+
+    build_changes(args.current, os.path.join(args.previous_dir, "master_dataset_final.csv"), previous_manifest, args.out_dir)
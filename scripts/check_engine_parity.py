@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+import filecmp
+import io
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add scripts directory to path to import the pipeline
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import process_data
+from generate_synthetic_data import generate, parse_rows
+from pipeline_metrics import RunReport
+
+CSV_FILES = ["master_dataset_final.csv", "biometric_full.csv", "demographic_full.csv", "enrollment_full.csv"]
+
+
+def run_engine(engine, data_dir, output_dir, options=None):
+    """Runs the full pipeline with `engine`, writing every artifact into output_dir."""
+    run = RunReport()
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_data.run_pipeline_in(run, data_dir, output_dir, engine, options)
+    return run
+
+
+def first_difference(a, b):
+    with open(a) as fa, open(b) as fb:
+        for number, (line_a, line_b) in enumerate(zip(fa, fb), 1):
+            if line_a != line_b:
+                return f"line {number}: {line_a.strip()!r} != {line_b.strip()!r}"
+    return "files differ in length"
+
+
+def compare(expected_dir, actual_dir):
+    """Returns a list of differences between two runs' artifacts (empty when identical)."""
+    problems = []
+    for name in CSV_FILES:
+        a, b = os.path.join(expected_dir, name), os.path.join(actual_dir, name)
+        if not filecmp.cmp(a, b, shallow=False):
+            problems.append(f"{name}: {first_difference(a, b)}")
+
+    reports = []
+    for directory in (expected_dir, actual_dir):
+        with open(os.path.join(directory, "data_quality_report.json")) as f:
+            report = json.load(f)
+        report.pop("generated_at")
+        reports.append(report)
+    for key in sorted(set(reports[0]) | set(reports[1])):
+        if reports[0].get(key) != reports[1].get(key):
+            problems.append(f"data_quality_report.json: '{key}' differs")
+
+    store_a, store_b = os.path.join(expected_dir, "columnar"), os.path.join(actual_dir, "columnar")
+    files = sorted(set(os.listdir(store_a)) | set(os.listdir(store_b)))
+    for name in files:
+        a, b = os.path.join(store_a, name), os.path.join(store_b, name)
+        if not (os.path.exists(a) and os.path.exists(b)):
+            problems.append(f"columnar/{name}: only in one store")
+        elif name.endswith(".npy"):
+            if not np.array_equal(np.load(a), np.load(b)):
+                problems.append(f"columnar/{name}: arrays differ")
+        elif not filecmp.cmp(a, b, shallow=False):
+            problems.append(f"columnar/{name}: contents differ")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that every processing engine produces identical artifacts.")
+    parser.add_argument("--data-dir", default="benchmarks/data", help="Directory with biometric/enrollment/demographic CSVs")
+    parser.add_argument("--rows", help="Generate synthetic data of this size first (1m, 10m, 50m or a number)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engines", nargs="+", default=list(process_data.ENGINES),
+                        help="Engines to run; the first is the reference (default: all)")
+    parser.add_argument("--memory-limit", help="DuckDB memory limit, e.g. 512MB to force spilling")
+    parser.add_argument("--threads", type=int, help="DuckDB worker threads")
+    args = parser.parse_args()
+
+    if args.rows:
+        generate(parse_rows(args.rows), args.data_dir, seed=args.seed)
+
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="uidai-parity-") as root:
+        outputs = {}
+        for engine in args.engines:
+            output_dir = os.path.join(root, engine)
+            os.makedirs(output_dir)
+            options = {"memory_limit": args.memory_limit, "threads": args.threads} if engine == "duckdb" else None
+            run = run_engine(engine, args.data_dir, output_dir, options)
+            outputs[engine] = output_dir
+            total = sum(s["wall_s"] for s in run.stages)
+            peak = max(s["peak_rss_mb"] for s in run.stages)
+            print(f"{engine:<8} {total:>8.2f}s wall, peak RSS {peak:.0f}MB")
+
+        reference, *others = args.engines
+        for engine in others:
+            problems = compare(outputs[reference], outputs[engine])
+            if problems:
+                failed = True
+                print(f"\n{engine} differs from {reference}:")
+                for problem in problems:
+                    print(f"  {problem}")
+            else:
+                print(f"{engine} matches {reference}: CSVs, quality report and columnar store are identical.")
+
+    sys.exit(1 if failed else 0)
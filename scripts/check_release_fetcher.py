@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from load_test import free_port, start_mock
+from release_fetcher import ReleaseFetcher, file_sha256
+
+REPO = "local/storage"
+RAW = ["biometric.csv", "enrollment.csv", "demographic.csv", "enrolment.csv"]
+
+
+def timed_fetch(fetcher, patterns, out_dir, tag="dataset-raw"):
+    started = time.perf_counter()
+    results = fetcher.fetch(tag, patterns, out_dir)
+    return results, time.perf_counter() - started
+
+
+def run_checks(asset_mb, segment_mb, bandwidth_mbps, fail_rate):
+    """Exercises the fetcher against the GitHub stand-in; raises AssertionError on a failed check."""
+    port = free_port()
+    mock, server = start_mock(
+        port, asset_size=int(asset_mb * 1024 * 1024), latency_ms=20,
+        bandwidth_mbps=bandwidth_mbps, fail_rate=fail_rate
+    )
+    url = f"http://127.0.0.1:{port}"
+    segment = int(segment_mb * 1024 * 1024)
+    work = tempfile.mkdtemp(prefix="fetcher_check_")
+    report = {}
+    try:
+        # Parallel ranged download with dropped connections; the missing enrollment spelling is skipped
+        out = os.path.join(work, "parallel")
+        fetcher = ReleaseFetcher(REPO, api_url=url, token="check", segment_size=segment, retry_delay=0.05)
+        results, elapsed = timed_fetch(fetcher, RAW, out)
+        assert results == {n: "downloaded" for n in ("biometric.csv", "enrolment.csv", "demographic.csv")}, results
+        for name in results:
+            assert file_sha256(os.path.join(out, name)) == mock.digest, f"{name}: content differs"
+        assert sorted(os.listdir(out)) == sorted(results), os.listdir(out)
+        report["parallel_s"] = round(elapsed, 2)
+
+        # Single connection, whole files, for comparison
+        serial = ReleaseFetcher(REPO, api_url=url, token="check", segment_size=1 << 40, workers=1, retry_delay=0.05)
+        _, elapsed = timed_fetch(serial, RAW, os.path.join(work, "serial"))
+        report["serial_s"] = round(elapsed, 2)
+
+        # Local copies matching the digest are not downloaded again
+        before = mock.requests
+        results, _ = timed_fetch(fetcher, RAW, out)
+        assert set(results.values()) == {"present"}, results
+        assert mock.requests - before == 1, "only the release listing should be requested"
+
+        # An interrupted download resumes from its missing segments
+        resume = os.path.join(work, "resume")
+        flaky = ReleaseFetcher(REPO, api_url=url, token="check", segment_size=segment, retries=0)
+        mock.fail_rate = max(fail_rate, 0.3)
+        results, _ = timed_fetch(flaky, ["biometric.csv"], resume)
+        mock.fail_rate = fail_rate
+        if results["biometric.csv"] != "downloaded":
+            with open(os.path.join(resume, "biometric.csv.part.json")) as f:
+                done = len(json.load(f)["done"])
+            segments = -(-mock.asset_size // segment)
+            before = mock.requests
+            results, _ = timed_fetch(fetcher, ["biometric.csv"], resume)
+            assert results == {"biometric.csv": "downloaded"}, results
+            requested = mock.requests - before - 1
+            assert requested < segments, f"{requested} segment requests for {segments - done} missing segments"
+            report["resumed_segments"] = f"{segments - done}/{segments}"
+        assert file_sha256(os.path.join(resume, "biometric.csv")) == mock.digest
+        assert sorted(os.listdir(resume)) == ["biometric.csv"], os.listdir(resume)
+
+        # A digest mismatch leaves neither the file nor partial state behind
+        bad = os.path.join(work, "bad")
+        asset = next(a for a in mock.assets.values() if a["name"] == "demographic.csv")
+        asset["digest"] = "0" * 64
+        results, _ = timed_fetch(fetcher, ["demographic.csv"], bad)
+        assert "checksum mismatch" in results["demographic.csv"], results
+        assert os.listdir(bad) == [], os.listdir(bad)
+    finally:
+        server.should_exit = True
+        shutil.rmtree(work, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check release_fetcher.py against the local GitHub stand-in.")
+    parser.add_argument("--asset-mb", type=float, default=24)
+    parser.add_argument("--segment-mb", type=float, default=2)
+    parser.add_argument("--bandwidth-mbps", type=float, default=200, help="Per-connection cap in megabits/s")
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    report = run_checks(args.asset_mb, args.segment_mb, args.bandwidth_mbps, args.fail_rate)
+    print("All release fetcher checks passed.")
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,200 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# One bit per issue, so a row's flags fit in a single uint8 and every
+# per-group tally is one bincount over (group, flags) pairs
+ISSUES = [
+    "invalid_state",
+    "unknown_district",
+    "fuzzy_matched_district",
+    "pincode_recovered_state",
+    "pincode_recovered_district",
+    "unparseable_date",
+    "negative_value",
+    "outlier_value",
+]
+BITS = {name: np.uint8(1 << i) for i, name in enumerate(ISSUES)}
+
+# Per-age-bucket counts; the totals are sums of these and would double count
+COUNT_COLUMNS = [
+    'bio_age_5_17', 'bio_age_17_',
+    'demo_age_5_17', 'demo_age_17_',
+    'age_0_5', 'age_5_17', 'age_18_greater'
+]
+
+# A count is an outlier when it exceeds OUTLIER_FACTOR x the column's
+# OUTLIER_QUANTILE among its source's non-zero values
+OUTLIER_QUANTILE = 0.99
+OUTLIER_FACTOR = 10
+
+
+class QualityTracker:
+    """
+    Collects data-quality signals while the pipeline runs. Stages hand over
+    masks they already compute (alias misses, pincode recoveries, the final
+    state filter), so the report costs no extra passes over the string
+    columns; everything is tallied once at the end from a per-row bitmask.
+    """
+
+    def __init__(self, top_n=50):
+        self.top_n = top_n
+        self.flags = None
+        self.source_codes = None
+        self.sources = []
+        self.state_codes = None
+        self.states = []
+        self.outlier_thresholds = {}
+        self.unmapped_districts = []
+        self.unmapped_states = []
+        self.fuzzy_matches = []
+
+    def _mark(self, issue, mask):
+        self.flags[np.asarray(mask, dtype=bool)] |= BITS[issue]
+
+    def _mark_rows(self, issue, index):
+        # `index` holds labels of the integrated frame, which are row positions
+        self.flags[np.asarray(index, dtype=np.int64)] |= BITS[issue]
+
+    def observe_integrated(self, master):
+        """Source, date and count checks on the merged MasterDataset."""
+        keys = master.keys
+        self.flags = np.zeros(len(keys), dtype=np.uint8)
+        sources = keys['source_dataset'].cat
+        self.source_codes = sources.codes.to_numpy().astype(np.int8)
+        self.sources = [str(s) for s in sources.categories]
+
+        self._mark("unparseable_date", keys['date'].isna().to_numpy())
+        for block in master.blocks.values():
+            # Block labels are row positions of the integrated frame
+            rows = block.index.to_numpy()
+            for col in block.columns.intersection(COUNT_COLUMNS):
+                values = block[col].to_numpy()
+                self._mark_rows("negative_value", rows[values < 0])
+                positive = values[values > 0]
+                if len(positive):
+                    threshold = float(np.quantile(positive, OUTLIER_QUANTILE)) * OUTLIER_FACTOR
+                    self.outlier_thresholds[col] = threshold
+                    self._mark_rows("outlier_value", rows[values > threshold])
+
+    def _top_per_state(self, entries):
+        """
+        Entries by descending rows (ties by spelling, state), keeping the
+        top_n of every state, so a list filtered to one state is complete up
+        to top_n and the first top_n overall are the global top.
+        """
+        kept, per_state = [], {}
+        for entry in sorted(entries, key=lambda d: (-d["rows"], d["spelling"], str(d["state"]))):
+            seen = per_state.get(entry["state"], 0)
+            if seen < self.top_n:
+                per_state[entry["state"]] = seen + 1
+                kept.append(entry)
+        return kept
+
+    def observe_names(self, state_norm, state_unmapped, district_norm, state, valid_dist_mask):
+        """Lower-cased spellings that no map or whitelist entry matched."""
+        missed = ~valid_dist_mask
+        self.observe_spellings(
+            pd.DataFrame({"spelling": district_norm[missed], "state": state[missed]}).value_counts(),
+            state_norm[state_unmapped].value_counts()
+        )
+
+    def observe_spellings(self, district_counts, state_counts):
+        """
+        Row counts per unmapped (spelling, state) and per unmapped state
+        spelling; the most frequent are kept (district spellings per state),
+        ties in spelling order.
+        """
+        districts = [
+            {"spelling": spelling, "state": st, "rows": int(rows)} for (spelling, st), rows in district_counts.items()
+        ]
+        self.unmapped_districts = self._top_per_state(districts)
+        states = [{"spelling": spelling, "rows": int(rows)} for spelling, rows in state_counts.items()]
+        self.unmapped_states = sorted(states, key=lambda d: (-d["rows"], d["spelling"]))[:self.top_n]
+
+    def observe_fuzzy(self, index, decisions):
+        """Rows whose district was resolved by the fuzzy index, and the spelling decisions."""
+        self._mark_rows("fuzzy_matched_district", index)
+        self.fuzzy_matches = self._top_per_state(decisions)
+
+    def observe_flags(self, flags, source_codes, sources, state_codes, states, outlier_thresholds):
+        """
+        Per-row flags computed elsewhere (an engine that evaluates the checks
+        itself), merged with any already recorded. `state_codes` index
+        `states` (-1 = invalid); `flags` use the bits in ISSUES.
+        """
+        flags = np.asarray(flags, dtype=np.uint8)
+        self.flags = flags if self.flags is None else self.flags | flags
+        self.source_codes = np.asarray(source_codes, dtype=np.int8)
+        self.sources = list(sources)
+        self.state_codes = np.asarray(state_codes, dtype=np.int16)
+        self.states = list(states)
+        self.outlier_thresholds = dict(outlier_thresholds)
+
+    def observe_recovery(self, state_recovered, district_recovered, district_unknown):
+        """Row labels fixed by the pincode majority maps, and those left Unknown."""
+        self._mark_rows("pincode_recovered_state", state_recovered)
+        self._mark_rows("pincode_recovered_district", district_recovered)
+        self._mark_rows("unknown_district", district_unknown)
+
+    def observe_states(self, index, state_codes, states):
+        """Final state codes (-1 = invalid, dropped) from the strict filter."""
+        positions = np.asarray(index, dtype=np.int64)
+        self.state_codes = np.full(len(self.flags), -1, dtype=np.int16)
+        self.state_codes[positions] = state_codes
+        self.states = [str(s) for s in states]
+        self._mark("invalid_state", self.state_codes < 0)
+
+    @staticmethod
+    def _summarize(counts, rows):
+        # counts: (groups, 2 ** len(ISSUES)) rows per flag combination
+        combos = np.arange(counts.shape[1])
+        summary = []
+        for g in range(counts.shape[0]):
+            entry = {"rows": int(rows[g])}
+            for issue, bit in BITS.items():
+                hit = int(counts[g, (combos & bit) != 0].sum())
+                entry[issue] = {"count": hit, "rate": round(hit / rows[g], 6) if rows[g] else 0.0}
+            summary.append(entry)
+        return summary
+
+    def _tally(self, codes, labels, keep=None):
+        width = 1 << len(ISSUES)
+        flags = self.flags
+        if keep is not None:
+            codes, flags = codes[keep], flags[keep]
+        counts = np.bincount(codes.astype(np.int64) * width + flags, minlength=len(labels) * width)
+        counts = counts.reshape(len(labels), width)
+        return dict(zip(labels, self._summarize(counts, counts.sum(axis=1))))
+
+    def report(self):
+        n = len(self.flags)
+        valid = self.state_codes >= 0
+        overall = self._tally(np.zeros(n, dtype=np.int8), ["all"])["all"]
+        by_state = self._tally(self.state_codes, self.states, keep=valid)
+        for entry in by_state.values():
+            entry.pop("invalid_state")
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rows_in": n,
+            "rows_out": int(valid.sum()),
+            "overall": overall,
+            "by_source": self._tally(self.source_codes, self.sources),
+            "by_state": {state: entry for state, entry in by_state.items() if entry["rows"]},
+            "unmapped_districts": self.unmapped_districts,
+            "unmapped_states": self.unmapped_states,
+            "fuzzy_matched_districts": self.fuzzy_matches,
+            "outlier_thresholds": {col: round(t, 2) for col, t in self.outlier_thresholds.items()},
+            "outlier_rule": f"count > {OUTLIER_FACTOR} x p{int(OUTLIER_QUANTILE * 100)} of the column's non-zero values",
+        }
+
+    def write(self, path):
+        report = self.report()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Data quality report written to {path}")
+        return report
@@ -0,0 +1,108 @@
+import re
+from collections import defaultdict
+
+GRAM = 3
+
+# Candidates (by shared trigrams) that get a full edit-distance check
+MAX_CANDIDATES = 25
+
+
+def match_key(name):
+    """Lowercase, alphanumerics only, single spaces: 'Nrth-Garo  Hills' -> 'nrth garo hills'."""
+    return re.sub(r'\s+', ' ', re.sub(r'[^a-z0-9 ]', ' ', str(name).lower())).strip()
+
+
+def grams(key):
+    padded = f"  {key} "
+    return {padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)}
+
+
+def max_edits(key):
+    """Edit budget by length: short names must match closely."""
+    if len(key) <= 8:
+        return 1
+    return 2
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 once it is known to exceed `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class DistrictMatcher:
+    """
+    Trigram inverted index over the district whitelist. A spelling is
+    resolved to the whitelisted name with the smallest edit distance among
+    the candidates sharing the most trigrams, restricted to the districts
+    known in the row's state. Ties between different districts and matches
+    over the length-based edit budget are left unresolved.
+
+    Decisions are cached per (spelling, state), so each distinct spelling is
+    scored once per run however many rows carry it.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.keys = [match_key(n) for n in self.names]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.index = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            for gram in grams(key):
+                self.index[gram].append(i)
+        self.cache = {}
+
+    def match(self, spelling, allowed=None):
+        """Returns (name, distance) or None. `allowed` is a set of candidate ids."""
+        if not isinstance(spelling, str):
+            return None
+        key = match_key(spelling)
+        if not key:
+            return None
+        shared = defaultdict(int)
+        for gram in grams(key):
+            for i in self.index.get(gram, ()):
+                if allowed is None or i in allowed:
+                    shared[i] += 1
+        if not shared:
+            return None
+
+        limit = max_edits(key)
+        best, best_distance, tied = None, limit + 1, False
+        for i in sorted(shared, key=shared.get, reverse=True)[:MAX_CANDIDATES]:
+            distance = edit_distance(key, self.keys[i], limit)
+            if distance < best_distance:
+                best, best_distance, tied = i, distance, False
+            elif distance == best_distance and best is not None and self.keys[i] != self.keys[best]:
+                tied = True
+        if best is None or tied:
+            return None
+        return self.names[best], best_distance
+
+    def resolve(self, pairs, scopes):
+        """
+        Resolves (spelling, state) pairs in bulk. `scopes` maps a state to the
+        whitelisted districts seen in it; states without a scope (invalid or
+        unseen) are matched against the whole whitelist.
+        Returns one (name, distance) or None per pair.
+        """
+        allowed = {
+            state: {self.ids[d] for d in districts if d in self.ids}
+            for state, districts in scopes.items()
+        }
+        results = []
+        for spelling, state in pairs:
+            cache_key = (spelling, state)
+            if cache_key not in self.cache:
+                self.cache[cache_key] = self.match(spelling, allowed.get(state))
+            results.append(self.cache[cache_key])
+        return results
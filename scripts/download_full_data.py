@@ -4,6 +4,7 @@ import sys
 # Add scripts directory to path to import utils
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from github_utils import upload_to_release
+from page_decoder import ColumnBuffer, ColumnWriter, decode_page
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import pandas as pd
@@ -70,9 +71,10 @@ def get_session():
     session.mount("http://", adapter)
     return session
 
-def fetch_chunk(session, resource_id, offset, limit=10000, sort_order="asc"):
+def fetch_chunk(session, resource_id, offset, limit=10000, sort_order="asc", fields=None):
     """
     Fetches a chunk of data with retries. Adds sort params for stability.
+    Returns the page decoded into columns (see page_decoder) and the total.
     """
     url = f"https://api.data.gov.in/resource/{resource_id}"
     params = {
@@ -93,18 +95,18 @@ def fetch_chunk(session, resource_id, offset, limit=10000, sort_order="asc"):
             resp = session.get(url, params=params, timeout=(10, 60))
             resp.raise_for_status()
             
-            data = resp.json()
-            if data.get("status") == "ok":
-                return data.get("records", []), data.get("total", 0)
+            page = decode_page(resp.content, fields)
+            if page.status == "ok":
+                return page, page.total
             else:
-                print(f"API Error at offset {offset}: {data.get('message', 'Unknown error')}")
+                print(f"API Error at offset {offset}: {page.message or 'Unknown error'}")
                 
         except Exception as e:
             print(f"Error fetching offset {offset} (Attempt {i+1}/{max_retries}): {e}")
             if i < max_retries - 1:
                 time.sleep(5 * (i + 1))
             
-    return [], 0
+    return None, 0
 
 def download_resource(session, name, resource_id):
     print(f"\nStarting download for {name} ({resource_id})...")
@@ -113,75 +115,67 @@ def download_resource(session, name, resource_id):
     chunk_size = 10000 
     
     # Initial fetch to get total count
-    records, total_count = fetch_chunk(session, resource_id, 0, chunk_size)
-    if not records and total_count == 0:
+    page, total_count = fetch_chunk(session, resource_id, 0, chunk_size)
+    if not page and total_count == 0:
         raise Exception(f"No records found for {name} or initial fetch failed.")
 
     print(f"Total records to fetch: {total_count}")
     
     if total_count <= 5000000:
-        # Standard forward download
-        df_all = []
-        df_all.append(pd.DataFrame(records))
-        fetched_count = len(records)
-        
-        current_offset = chunk_size
-        while current_offset < total_count:
-            chunk_records, _ = fetch_chunk(session, resource_id, current_offset, chunk_size)
-            if chunk_records:
-                df_all.append(pd.DataFrame(chunk_records))
-                fetched_count += len(chunk_records)
-                print(f"fetched {fetched_count}/{total_count}", end='\r')
-                current_offset += chunk_size
-            else:
-                raise Exception(f"Download incomplete for {name}. Stopped at {current_offset}/{total_count}")
-        
-        final_df = pd.concat(df_all)
-        final_df.to_csv(output_file, index=False)
+        # Standard forward download, each page appended to the CSV as it arrives
+        writer = ColumnWriter(output_file)
+        try:
+            writer.append(page)
+            current_offset = chunk_size
+            while current_offset < total_count:
+                chunk, _ = fetch_chunk(session, resource_id, current_offset, chunk_size, fields=writer.fields)
+                if chunk:
+                    writer.append(chunk)
+                    print(f"fetched {writer.rows}/{total_count}", end='\r')
+                    current_offset += chunk_size
+                else:
+                    raise Exception(f"Download incomplete for {name}. Stopped at {current_offset}/{total_count}")
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
     else:
         # Bi-directional download to bypass 5M offset limit
         print(f"Large dataset detected ({total_count}). Using bi-directional download...")
         
         # Part 1: First 4,000,000 records (ASC)
-        df_asc = []
-        df_asc.append(pd.DataFrame(records))
-        fetched_asc = len(records)
+        asc = ColumnBuffer()
+        asc.append(page)
         limit_asc = 4000000
         
         current_offset = chunk_size
         while current_offset < limit_asc:
-            chunk_records, _ = fetch_chunk(session, resource_id, current_offset, chunk_size, sort_order="asc")
-            if chunk_records:
-                df_asc.append(pd.DataFrame(chunk_records))
-                fetched_asc += len(chunk_records)
-                print(f"Phase 1 (ASC): fetched {fetched_asc}/{total_count}", end='\r')
+            chunk, _ = fetch_chunk(session, resource_id, current_offset, chunk_size, sort_order="asc", fields=list(asc.columns))
+            if chunk:
+                asc.append(chunk)
+                print(f"Phase 1 (ASC): fetched {asc.rows}/{total_count}", end='\r')
                 current_offset += chunk_size
             else:
                 break
         
         # Part 2: Remaining records from the end (DESC)
         # We fetch (Total - 4,000,000) + a small overlap to be safe
-        df_desc = []
+        desc = ColumnBuffer()
         limit_desc = total_count - limit_asc + chunk_size
-        fetched_desc = 0
         current_offset = 0
         
         while current_offset < limit_desc:
-            chunk_records, _ = fetch_chunk(session, resource_id, current_offset, chunk_size, sort_order="desc")
-            if chunk_records:
-                df_desc.append(pd.DataFrame(chunk_records))
-                fetched_desc += len(chunk_records)
-                print(f"Phase 2 (DESC): fetched {fetched_asc + fetched_desc}/{total_count} (Desc Offset: {current_offset})", end='\r')
+            chunk, _ = fetch_chunk(session, resource_id, current_offset, chunk_size, sort_order="desc", fields=list(asc.columns))
+            if chunk:
+                desc.append(chunk)
+                print(f"Phase 2 (DESC): fetched {asc.rows + desc.rows}/{total_count} (Desc Offset: {current_offset})", end='\r')
                 current_offset += chunk_size
             else:
                 break
 
         print("\nMerging and de-duplicating...")
-        df_1 = pd.concat(df_asc)
-        df_2 = pd.concat(df_desc)
-        
         # Combined
-        final_df = pd.concat([df_1, df_2])
+        final_df = pd.concat([asc.to_frame(), desc.to_frame()])
         # Sorting and de-duplicating on all columns ensures consistency
         final_df = final_df.drop_duplicates().sort_values(["date", "state", "district", "pincode"])
         
@@ -3,19 +3,18 @@ import os
 
 # Add scripts directory to path to import utils
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from github_utils import download_from_release
+from github_utils import download_release_assets
 
 def download_raw_data():
+    # Both enrollment spellings; whichever the release has is fetched
     files = ["biometric.csv", "enrollment.csv", "demographic.csv", "enrolment.csv"]
     output_dir = "public/datasets"
-    
+
     print("Starting download of raw datasets from GitHub...")
-    for f in files:
-        # We try both enrollment spellings just in case
-        try:
-             download_from_release(f, output_dir, tag_name="dataset-raw")
-        except Exception as e:
-            print(f"Note: Could not download {f}, might be optional or named differently.")
+    results = download_release_assets(files, output_dir, tag_name="dataset-raw")
+    failed = [name for name, result in results.items() if result not in ("present", "downloaded")]
+    if failed or not results:
+        sys.exit(f"Raw dataset download failed: {', '.join(failed) or 'no assets found'}")
 
 if __name__ == "__main__":
     download_raw_data()
@@ -0,0 +1,309 @@
+import os
+import shutil
+import tempfile
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from data_quality import BITS, COUNT_COLUMNS, OUTLIER_FACTOR, OUTLIER_QUANTILE
+from master_layout import CSV_FLOAT_COLUMNS, SOURCE_METRICS, SOURCE_TOTALS, WIDE_COLUMNS
+from process_data import (
+    MANUAL_STATE_OVERRIDES, VALID_DISTRICTS, VALID_STATES, basic_clean, majority_map, match_district_pairs,
+    normalize_district_values, normalize_state_values, parse_dates, source_paths, write_columnar_store
+)
+# process_data puts the repo root on the path
+from app.core.columnar import DICTIONARY_COLUMNS
+
+# Strings pandas.read_csv reads as NaN by default
+PANDAS_NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+}
+
+SOURCES = list(SOURCE_METRICS)
+METRIC_COLUMNS = [col for metrics in SOURCE_METRICS.values() for col in metrics]
+
+
+def _literal(value):
+    """A SQL string literal, for statements that take no parameters (SET, COPY ... TO)."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _owner(col):
+    return next(i for i, metrics in enumerate(SOURCE_METRICS.values()) if col in metrics)
+
+
+class DuckDBEngine:
+    """
+    Out-of-core engine on an embedded DuckDB database. Raw CSVs are loaded
+    into on-disk tables (spilling beyond `memory_limit`) and every row-level
+    step runs as multi-threaded SQL. The name logic itself stays in Python
+    and runs on the distinct (state, district) spellings and pincode tallies,
+    through the same helpers the pandas engine uses, so both engines produce
+    identical artifacts (see check_engine_parity.py).
+    """
+
+    name = "duckdb"
+
+    def __init__(self, quality, memory_limit=None, threads=None, temp_dir=None):
+        self.quality = quality
+        self.workdir = tempfile.mkdtemp(prefix="uidai-duckdb-", dir=temp_dir)
+        self.con = duckdb.connect(os.path.join(self.workdir, "pipeline.duckdb"))
+        self.con.execute(f"SET temp_directory = {_literal(os.path.join(self.workdir, 'spill'))}")
+        if memory_limit:
+            self.con.execute(f"SET memory_limit = {_literal(memory_limit)}")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        self.names = None
+        self.decisions = []
+
+    def _table(self, name, df):
+        self.con.register(f"{name}_df", df)
+        self.con.execute(f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM {name}_df")
+        self.con.unregister(f"{name}_df")
+
+    def _scalar(self, sql, params=None):
+        return self.con.execute(sql, params or []).fetchone()[0]
+
+    def load(self, base_dir):
+        rows = 0
+        for i, (source, path) in enumerate(source_paths(base_dir).items()):
+            print(f"Loading {source} Data from {path}...")
+            self.con.execute(
+                f"CREATE OR REPLACE TABLE raw_{i} AS SELECT * FROM read_csv(?, all_varchar = true, header = true)", [path]
+            )
+            rows += self._scalar(f"SELECT count(*) FROM raw_{i}")
+        return rows
+
+    def _number(self, columns, col):
+        if col not in columns:
+            return "0.0"
+        return f"TRY_CAST(\"{col}\" AS DOUBLE)"
+
+    def integrate(self):
+        print("Merging datasets...")
+        selects = []
+        for i, (source, metrics) in enumerate(SOURCE_METRICS.items()):
+            columns = {r[0] for r in self.con.execute(f"DESCRIBE raw_{i}").fetchall()}
+            counts, total = metrics[:-1], metrics[-1]
+            # Same as pandas: a missing value makes the total NaN, and NaN becomes 0
+            values = {col: f"COALESCE(CAST(trunc({self._number(columns, col)}) AS INTEGER), 0)" for col in counts}
+            values[total] = f"COALESCE(CAST(trunc({' + '.join(self._number(columns, c) for c in counts)}) AS INTEGER), 0)"
+            metric_sql = ", ".join(f"{values.get(col, '0')} AS {col}" for col in METRIC_COLUMNS)
+            selects.append(f"""
+                SELECT {i}::TINYINT AS source_id, rowid AS row_id, "date" AS raw_date,
+                       COALESCE("state", 'nan') AS raw_state, COALESCE("district", 'nan') AS raw_district,
+                       TRY_CAST("pincode" AS BIGINT) AS pincode, {metric_sql}
+                FROM raw_{i}""")
+        self.con.execute("CREATE OR REPLACE TABLE master AS " + " UNION ALL ".join(selects))
+        for i in range(len(SOURCES)):
+            self.con.execute(f"DROP TABLE raw_{i}")
+
+        # Dates are parsed once per distinct string
+        raw_dates = self.con.execute("SELECT DISTINCT raw_date FROM master WHERE raw_date IS NOT NULL").df()['raw_date']
+        parsed = parse_dates(raw_dates.where(~raw_dates.isin(PANDAS_NA_STRINGS)))
+        self._table("date_map", pd.DataFrame({'raw_date': raw_dates, 'date': parsed}))
+
+        rows = self._scalar("SELECT count(*) FROM master")
+        return rows, self._scalar("SELECT COALESCE(sum(memory_usage_bytes), 0) FROM duckdb_memory()")
+
+    def normalize(self):
+        """Resolves every distinct raw (state, district) spelling to its final names."""
+        pairs = self.con.execute(
+            "SELECT raw_state, raw_district, count(*) AS rows FROM master GROUP BY ALL"
+        ).df()
+        # NaN where pandas.read_csv would have read NaN, so basic_clean behaves the same
+        raw = pairs[['raw_state', 'raw_district']].astype(object)
+        raw = raw.mask(raw.isin(PANDAS_NA_STRINGS), np.nan)
+        cleaned = basic_clean(raw.rename(columns={'raw_state': 'state', 'raw_district': 'district'}))
+
+        state_norm, state_clean = normalize_state_values(cleaned['state'])
+        state_unmapped = state_clean.isna()
+        state_clean = state_clean.fillna(cleaned['state'].str.title())
+        district_norm, district_clean = normalize_district_values(cleaned['district'])
+
+        # Majority vote over the rows each spelling pair stands for
+        district_state_counts = (
+            pd.DataFrame({'district': district_clean, 'state': state_clean, 'count': pairs['rows']})
+            .groupby(['district', 'state'])['count'].sum().reset_index()
+        )
+        authoritative = majority_map(district_state_counts, 'district', 'state')
+        authoritative.update(MANUAL_STATE_OVERRIDES)
+        state = district_clean.map(authoritative).fillna(state_clean)
+
+        # Whitelist, then fuzzy matching of the remaining (district, state) pairs
+        valid = district_clean.isin(VALID_DISTRICTS)
+        codes, unmatched = pd.MultiIndex.from_arrays([district_clean[~valid], state[~valid]]).factorize()
+        results = match_district_pairs(list(unmatched), district_state_counts)
+        rows = np.bincount(codes, weights=pairs['rows'][~valid], minlength=len(results)).astype(np.int64)
+        self.decisions = [
+            {"spelling": d, "state": s, "match": r[0], "distance": r[1], "rows": int(n)}
+            for (d, s), r, n in zip(unmatched, results, rows) if r
+        ]
+        if self.decisions:
+            print(f"Fuzzy-matched {len(self.decisions)} district spellings ({sum(d['rows'] for d in self.decisions)} rows).")
+
+        names = np.array([r[0] if r else None for r in results], dtype=object)
+        matched = pd.Series(names[codes] if len(codes) else [], index=district_clean.index[~valid], dtype=object)
+        fuzzy = matched.notna().reindex(pairs.index, fill_value=False)
+        district = district_clean.where(valid, matched.fillna('Unknown'))
+
+        self.quality.observe_spellings(
+            pd.DataFrame({'spelling': district_norm, 'state': state, 'rows': pairs['rows']})[~valid & ~fuzzy]
+            .groupby(['spelling', 'state'])['rows'].sum(),
+            pairs['rows'][state_unmapped].groupby(state_norm[state_unmapped]).sum()
+        )
+        self.names = pd.DataFrame({
+            'raw_state': pairs['raw_state'], 'raw_district': pairs['raw_district'],
+            'state': state, 'district': district, 'fuzzy': fuzzy, 'rows': pairs['rows']
+        })
+        self._table("name_map", self.names)
+        self._table("valid_states", pd.DataFrame({'state': sorted(VALID_STATES)}))
+        self._table("valid_districts", pd.DataFrame({'district': sorted(VALID_DISTRICTS)}))
+        return int(pairs['rows'].sum())
+
+    def unknown_districts(self):
+        if self.con.execute("SELECT count(*) FROM information_schema.tables WHERE table_name = 'final'").fetchone()[0]:
+            return self._scalar("SELECT count(*) FROM final WHERE district = 'Unknown'")
+        return int(self.names.loc[self.names['district'] == 'Unknown', 'rows'].sum())
+
+    def recover(self):
+        print("Running Pincode Recovery for Missing/Invalid Locations...")
+        trusted = self.con.execute("""
+            SELECT m.pincode, n.state, n.district, count(*) AS count
+            FROM master m JOIN name_map n USING (raw_state, raw_district)
+            WHERE m.pincode IS NOT NULL
+              AND n.state IN (SELECT state FROM valid_states)
+              AND n.district IN (SELECT district FROM valid_districts)
+            GROUP BY ALL
+        """).df()
+        pin_state = trusted.groupby(['pincode', 'state'])['count'].sum().reset_index()
+        pin_district = trusted.groupby(['pincode', 'district'])['count'].sum().reset_index()
+        state_map = majority_map(pin_state, 'pincode', 'state')
+        district_map = majority_map(pin_district, 'pincode', 'district')
+        self._table("pin_map", pd.DataFrame({
+            'pincode': pd.Series(list(state_map), dtype='int64'),
+            'pin_state': pd.Series(list(state_map.values()), dtype=object),
+            'pin_district': pd.Series([district_map[p] for p in state_map], dtype=object),
+        }))
+
+        self.con.execute("""
+            CREATE OR REPLACE TABLE final AS
+            SELECT m.source_id, m.row_id, d.date, m.pincode,
+                   n.state AS name_state, n.district AS name_district, n.fuzzy,
+                   CASE WHEN COALESCE(n.state IN (SELECT state FROM valid_states), false) THEN n.state
+                        ELSE COALESCE(p.pin_state, n.state) END AS state,
+                   CASE WHEN n.district = 'Unknown' OR n.district IS NULL THEN COALESCE(p.pin_district, n.district)
+                        ELSE n.district END AS district,
+                   """ + ", ".join(f"m.{col}" for col in METRIC_COLUMNS) + """
+            FROM master m
+            JOIN name_map n USING (raw_state, raw_district)
+            LEFT JOIN date_map d USING (raw_date)
+            LEFT JOIN pin_map p USING (pincode)
+        """)
+        self.con.execute("DROP TABLE master")
+        print("Pincode Recovery Complete.")
+        return self._scalar("SELECT count(*) FROM final")
+
+    def filter(self):
+        print("Filtering invalid states...")
+        states = sorted(VALID_STATES)
+        self._table("state_codes", pd.DataFrame({'state': states, 'code': np.arange(len(states), dtype=np.int16)}))
+
+        thresholds = {}
+        aggregates = ", ".join(
+            f"quantile_cont({col}, {OUTLIER_QUANTILE}) FILTER (WHERE {col} > 0 AND source_id = {_owner(col)})"
+            for col in COUNT_COLUMNS
+        )
+        for col, value in zip(COUNT_COLUMNS, self.con.execute(f"SELECT {aggregates} FROM final").fetchone()):
+            if value is not None:
+                thresholds[col] = float(value) * OUTLIER_FACTOR
+
+        # NULL (NaN) names count as invalid, as with isin() in pandas
+        valid_state = "COALESCE(state IN (SELECT state FROM valid_states), false)"
+        checks = [
+            (BITS["invalid_state"], f"NOT {valid_state}"),
+            (BITS["unknown_district"], "district = 'Unknown'"),
+            (BITS["fuzzy_matched_district"], "fuzzy"),
+            (BITS["pincode_recovered_state"],
+             f"NOT COALESCE(name_state IN (SELECT state FROM valid_states), false) AND {valid_state}"),
+            (BITS["pincode_recovered_district"], "name_district = 'Unknown' AND district <> 'Unknown'"),
+            (BITS["unparseable_date"], "date IS NULL"),
+            (BITS["negative_value"], " OR ".join(f"{col} < 0" for col in COUNT_COLUMNS)),
+        ]
+        if thresholds:
+            checks.append((BITS["outlier_value"], " OR ".join(f"{col} > {t!r}" for col, t in thresholds.items())))
+        flags = " + ".join(f"(CASE WHEN {cond} THEN {int(bit)} ELSE 0 END)" for bit, cond in checks)
+        result = self.con.execute(f"""
+            SELECT ({flags})::UTINYINT AS flags, source_id, COALESCE(c.code, -1)::SMALLINT AS state_code
+            FROM final LEFT JOIN state_codes c USING (state)
+        """).fetchnumpy()
+
+        self.quality.observe_flags(result['flags'], result['source_id'], SOURCES, result['state_code'], states, thresholds)
+        self.quality.observe_fuzzy([], self.decisions)
+
+        kept = self._scalar(f"SELECT count(*) FROM final WHERE {valid_state}")
+        dropped = len(result['flags']) - kept
+        if dropped > 0:
+            print(f"Dropped {dropped} rows with invalid/garbage state names.")
+        return kept
+
+    def _wide_sql(self, where="", csv=False):
+        """The final rows in the wide layout; `csv` writes metrics as floats, like the pandas writer."""
+        sources = " ".join(f"WHEN {i} THEN '{s}'" for i, s in enumerate(SOURCES))
+        totals = " ".join(f"WHEN {i} THEN {SOURCE_TOTALS[s]}" for i, s in enumerate(SOURCES))
+        exprs = {
+            'date': "CAST(date AS DATE)",
+            'source_dataset': f"CASE source_id {sources} END",
+            'total_activity': f"CASE source_id {totals} END",
+        }
+        if csv:
+            for col in CSV_FLOAT_COLUMNS:
+                exprs[col] = f"CAST({exprs.get(col, col)} AS DOUBLE)"
+        select = ", ".join(f"{exprs[col]} AS {col}" if col in exprs else col for col in WIDE_COLUMNS)
+        return f"""
+            SELECT {select} FROM final
+            WHERE state IN (SELECT state FROM valid_states) {where}
+            ORDER BY source_id, row_id
+        """
+
+    def write(self, output_path, datasets_dir):
+        print(f"Saving Master Dataset to {output_path}...")
+        self.con.execute(f"COPY ({self._wide_sql(csv=True)}) TO {_literal(output_path)} (HEADER, DELIMITER ',')")
+
+        print("Saving Individual Normalized Datasets...")
+        os.makedirs(datasets_dir, exist_ok=True)
+        files = {'Biometric': 'biometric_full.csv', 'Demographic': 'demographic_full.csv', 'Enrollment': 'enrollment_full.csv'}
+        for i, source in enumerate(SOURCES):
+            file_path = os.path.join(datasets_dir, files[source])
+            self.con.execute(f"COPY ({self._wide_sql(f'AND source_id = {i}', csv=True)}) TO {_literal(file_path)} (HEADER, DELIMITER ',')")
+            print(f"Saved {source} dataset to {file_path}")
+
+    def wide_batches(self, vectors=256):
+        """The final rows in the wide layout, as DataFrames of `vectors` x 2048 rows (at least one)."""
+        result = self.con.execute(self._wide_sql())
+        batch = result.fetch_df_chunk(vectors)
+        yield batch
+        while len(batch):
+            batch = result.fetch_df_chunk(vectors)
+            if len(batch):
+                yield batch
+
+    def store_dictionaries(self):
+        """Sorted distinct values of the store's dictionary columns, as store_dictionaries() gives them."""
+        wide = self._wide_sql()
+        return {
+            name: sorted(r[0] for r in self.con.execute(
+                f"SELECT DISTINCT COALESCE(CAST({name} AS VARCHAR), 'Unknown') FROM ({wide})"
+            ).fetchall())
+            for name in DICTIONARY_COLUMNS
+        }
+
+    def write_columnar(self, store_dir, archive_path):
+        # Batches are encoded as they are read, so the wide rows are never all in pandas
+        write_columnar_store(self.wide_batches(), self.store_dictionaries(), store_dir, archive_path)
+
+    def close(self):
+        self.con.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add scripts directory to path to import the pipeline's maps
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from process_data import DISTRICT_ALIAS_MAP, STATE_STANDARD_MAP, VALID_DISTRICTS, VALID_STATES
+
+SCALES = {
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+    "50m": 50_000_000,
+}
+
+# Same file names and columns as the data.gov.in downloads
+SOURCES = {
+    "biometric": {
+        "file": "biometric.csv",
+        "share": 0.45,
+        "metrics": {"bio_age_5_17": 6.0, "bio_age_17_": 9.0},
+    },
+    "enrollment": {
+        "file": "enrollment.csv",
+        "share": 0.15,
+        "metrics": {"age_0_5": 3.0, "age_5_17": 1.5, "age_18_greater": 0.5},
+    },
+    "demographic": {
+        "file": "demographic.csv",
+        "share": 0.40,
+        "metrics": {"demo_age_5_17": 1.5, "demo_age_17_": 12.0},
+    },
+}
+
+CHUNK_ROWS = 1_000_000
+
+
+def spelling_variants(canonical, aliases):
+    """Canonical name first, followed by dirty spellings the pipeline must repair."""
+    variants = [canonical, canonical.upper(), canonical.lower(), f"  {canonical} ", canonical.replace(" ", "  ")]
+    if " and " in canonical:
+        variants.append(canonical.replace(" and ", " & "))
+    for alias in aliases:
+        variants.extend([alias, alias.title(), alias.upper()])
+    # De-duplicate while keeping the canonical spelling at index 0
+    return list(dict.fromkeys(variants))
+
+
+def typo(name, rng):
+    """Drops one inner character, producing a spelling no alias map covers."""
+    if len(name) < 5:
+        return name + "x"
+    pos = rng.integers(1, len(name) - 1)
+    return name[:pos] + name[pos + 1:]
+
+
+def build_geography(rng):
+    """
+    Builds a skewed synthetic geography: each whitelisted district is assigned
+    to a state, owns a handful of pincodes and carries a lognormal weight so a
+    few districts dominate row counts, as in the real data.
+    """
+    states = sorted(VALID_STATES)
+    districts = sorted(VALID_DISTRICTS - {"Unknown"})
+
+    state_weight = rng.lognormal(0.0, 1.0, len(states))
+    district_state = rng.choice(len(states), size=len(districts), p=state_weight / state_weight.sum())
+    district_weight = rng.lognormal(0.0, 1.2, len(districts))
+
+    pin_codes, pin_district, pin_weight = [], [], []
+    used = set()
+    for d, s in enumerate(district_state):
+        n_pins = 3 + rng.poisson(12)
+        shares = rng.exponential(1.0, n_pins)
+        shares /= shares.sum()
+        for share in shares:
+            code = (11 + s) * 10000 + int(rng.integers(0, 10000))
+            while code in used:
+                code = (11 + s) * 10000 + int(rng.integers(0, 10000))
+            used.add(code)
+            pin_codes.append(code)
+            pin_district.append(d)
+            pin_weight.append(district_weight[d] * share)
+
+    pin_weight = np.asarray(pin_weight)
+    return {
+        "states": states,
+        "districts": districts,
+        "district_state": district_state,
+        "pin_codes": np.asarray(pin_codes, dtype=np.int64),
+        "pin_district": np.asarray(pin_district, dtype=np.int64),
+        "pin_p": pin_weight / pin_weight.sum(),
+    }
+
+
+def build_vocab(names, alias_source, rng, typo_names=False):
+    """
+    Flattens per-name spelling variants into one array.
+    Returns (vocab, offsets, counts) so variant j of name i is vocab[offsets[i] + j].
+    """
+    reverse = {}
+    for alias, target in alias_source.items():
+        if alias.lower() != target.lower():
+            reverse.setdefault(target, []).append(alias)
+
+    vocab, offsets, counts = [], [], []
+    for name in names:
+        variants = spelling_variants(name, reverse.get(name, []))
+        if typo_names:
+            variants.append(typo(name, rng))
+        offsets.append(len(vocab))
+        counts.append(len(variants))
+        vocab.extend(variants)
+    return np.asarray(vocab, dtype=object), np.asarray(offsets), np.asarray(counts)
+
+
+def build_dates(rng, start="2025-03-01", end="2025-12-31"):
+    """A few hundred distinct reporting days with weekday/month-end seasonality."""
+    days = pd.date_range(start, end, freq="D")
+    weight = np.where(days.dayofweek < 5, 1.0, 0.35) * np.where(days.is_month_end, 3.0, 1.0)
+    weight *= rng.lognormal(0.0, 0.3, len(days))
+    # Roughly 15% of days have no reports at all
+    weight[rng.random(len(days)) < 0.15] = 0
+    return np.asarray(days.strftime("%d-%m-%Y"), dtype=object), weight / weight.sum()
+
+
+def pick_variants(index, offsets, counts, dirty_rate, rng):
+    n = len(index)
+    dirty = rng.random(n) < dirty_rate
+    extra = 1 + (rng.random(n) * np.maximum(counts[index] - 1, 1)).astype(np.int64)
+    return offsets[index] + np.where(dirty & (counts[index] > 1), extra, 0)
+
+
+def generate_chunk(n, source, geo, vocab, dates, dirty_rate, garbage_rate, rng):
+    pin_idx = rng.choice(len(geo["pin_codes"]), size=n, p=geo["pin_p"])
+    district_idx = geo["pin_district"][pin_idx]
+    state_idx = geo["district_state"][district_idx]
+
+    state_vocab, state_offsets, state_counts = vocab["state"]
+    district_vocab, district_offsets, district_counts = vocab["district"]
+
+    state = state_vocab[pick_variants(state_idx, state_offsets, state_counts, dirty_rate, rng)]
+    district = district_vocab[pick_variants(district_idx, district_offsets, district_counts, dirty_rate, rng)]
+
+    # Garbage states (seen in the raw feed as numeric junk) that only pincode recovery can fix
+    garbage = rng.random(n) < garbage_rate
+    state[garbage] = "100000"
+
+    date_values, date_p = dates
+    chunk = {
+        "date": date_values[rng.choice(len(date_values), size=n, p=date_p)],
+        "state": state,
+        "district": district,
+        "pincode": geo["pin_codes"][pin_idx],
+    }
+    for metric, mean in SOURCES[source]["metrics"].items():
+        # Negative binomial gives the heavy right tail of real per-pincode counts
+        values = rng.negative_binomial(1.2, 1.2 / (1.2 + mean), size=n)
+        outliers = rng.random(n) < 0.0005
+        values[outliers] *= 50
+        chunk[metric] = values
+    return pd.DataFrame(chunk)
+
+
+def generate(rows, output_dir, seed=42, dirty_rate=0.05, garbage_rate=0.002):
+    rng = np.random.default_rng(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    geo = build_geography(rng)
+    vocab = {
+        "state": build_vocab(geo["states"], STATE_STANDARD_MAP, rng),
+        "district": build_vocab(geo["districts"], DISTRICT_ALIAS_MAP, rng, typo_names=True),
+    }
+    dates = build_dates(rng)
+
+    manifest = {"seed": seed, "rows": rows, "dirty_rate": dirty_rate, "garbage_rate": garbage_rate, "sources": {}}
+    for source, spec in SOURCES.items():
+        target = int(rows * spec["share"])
+        path = os.path.join(output_dir, spec["file"])
+        print(f"Generating {target} {source} rows -> {path}")
+        started = time.perf_counter()
+
+        written = 0
+        with open(path, "w", newline="") as f:
+            while written < target:
+                n = min(CHUNK_ROWS, target - written)
+                chunk = generate_chunk(n, source, geo, vocab, dates, dirty_rate, garbage_rate, rng)
+                chunk.to_csv(f, index=False, header=(written == 0))
+                written += n
+                print(f"  {written}/{target}", end="\r")
+
+        manifest["sources"][source] = {"file": spec["file"], "rows": written, "seconds": round(time.perf_counter() - started, 2)}
+        print(f"\n  Done in {manifest['sources'][source]['seconds']}s")
+
+    with open(os.path.join(output_dir, "synthetic_manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def parse_rows(value):
+    value = value.lower()
+    if value in SCALES:
+        return SCALES[value]
+    return int(float(value))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic UIDAI-shaped raw datasets.")
+    parser.add_argument("--rows", default="1m", help="Total rows across all sources: 1m, 10m, 50m or a number")
+    parser.add_argument("--output-dir", default="benchmarks/data", help="Directory for the generated CSVs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dirty-rate", type=float, default=0.05, help="Share of rows with a dirty state/district spelling")
+    parser.add_argument("--garbage-rate", type=float, default=0.002, help="Share of rows with a garbage state value")
+    args = parser.parse_args()
+
+    generate(parse_rows(args.rows), args.output_dir, args.seed, args.dirty_rate, args.garbage_rate)
@@ -3,6 +3,11 @@ import os
 import sys
 import time
 
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from release_fetcher import ReleaseFetcher
+
 # Repo name for storage
 STORAGE_REPO = "sreecharan-desu/uidai-data-storage"
 
@@ -74,24 +79,33 @@ def upload_to_release(file_path, tag_name="dataset-raw"):
         print(f"❌ Failed to upload {file_path} after multiple attempts.")
         return False
 
-def download_from_release(filename, output_dir, tag_name="dataset-raw"):
-    """Downloads a file from a release with retries."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    print(f"Downloading {filename} from {STORAGE_REPO} @ {tag_name}...")
-    
-    cmd = [
-        "gh", "release", "download", tag_name, 
-        "--repo", STORAGE_REPO, 
-        "--pattern", filename,
-        "--dir", output_dir,
-        "--clobber"
-    ]
-    
+def list_release_assets(tag_name):
+    """Names of the assets currently on a release."""
+    return [asset["name"] for asset in ReleaseFetcher(STORAGE_REPO).release_assets(tag_name)]
+
+def delete_release_asset(asset_name, tag_name):
+    """Deletes one asset from a release with retries."""
+    print(f"Deleting {asset_name} from {STORAGE_REPO} @ {tag_name}...")
+    cmd = ["gh", "release", "delete-asset", tag_name, asset_name, "--repo", STORAGE_REPO, "--yes"]
     if retry_command(cmd):
-        print(f"✅ Successfully downloaded {filename}")
+        print(f"🗑️ Deleted {asset_name}")
         return True
-    else:
-        print(f"❌ Failed to download {filename} after multiple attempts.")
-        return False
+    print(f"❌ Failed to delete {asset_name} after multiple attempts.")
+    return False
+
+def download_release_assets(patterns, output_dir, tag_name="dataset-raw"):
+    """
+    Downloads every asset matching one of `patterns` in parallel (see
+    release_fetcher.py); returns {asset name: "present", "downloaded" or the error}.
+    """
+    print(f"Downloading {', '.join(patterns)} from {STORAGE_REPO} @ {tag_name}...")
+    try:
+        return ReleaseFetcher(STORAGE_REPO).fetch(tag_name, patterns, output_dir)
+    except requests.RequestException as e:
+        print(f"❌ Could not list release '{tag_name}': {e}")
+        return {}
+
+def download_from_release(filename, output_dir, tag_name="dataset-raw"):
+    """Downloads a file (or glob pattern) from a release; True if anything matched and arrived intact."""
+    results = download_release_assets([filename], output_dir, tag_name)
+    return bool(results) and all(r in ("present", "downloaded") for r in results.values())
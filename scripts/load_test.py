@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from mock_github_server import MockGitHub
+from pipeline_metrics import current_rss_mb
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_KEY = "load-test-key"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def process_rss_mb(pid):
+    """Resident memory of another process from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_mock(port, **kwargs):
+    """Runs the GitHub stand-in on a background thread of this process."""
+    import uvicorn
+
+    mock = MockGitHub(**kwargs)
+    server = uvicorn.Server(uvicorn.Config(mock.app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return mock, server
+
+
+def start_api(port, mock_url, extra_env):
+    """Runs the FastAPI app in its own interpreter so its RSS can be measured on its own."""
+    env = dict(os.environ)
+    env.update({
+        "VERCEL": "1",  # skip .env loading and the static mount
+        "GITHUB_API_URL": mock_url,
+        "GH_PAT": "load-test-token",
+        "CLIENT_API_KEY": API_KEY,
+        "PREWARM_ON_STARTUP": "false",
+        "CACHE_BACKEND": "memory",
+        "RATE_LIMIT_ENABLED": "false",
+    })
+    env.update(extra_env)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env
+    )
+
+
+async def wait_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(f"{base_url}/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"API did not start within {timeout}s")
+
+
+async def download(client, url, results):
+    started = time.perf_counter()
+    record = {"ttfb_s": None, "bytes": 0, "status": None}
+    try:
+        async with client.stream("GET", url, headers={"X-API-Key": API_KEY}) as r:
+            record["status"] = r.status_code
+            async for chunk in r.aiter_raw():
+                if record["ttfb_s"] is None:
+                    record["ttfb_s"] = time.perf_counter() - started
+                record["bytes"] += len(chunk)
+    except httpx.HTTPError as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["total_s"] = time.perf_counter() - started
+    results.append(record)
+
+
+async def sample_rss(pid, samples, stop):
+    while not stop.is_set():
+        rss = process_rss_mb(pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(base_url, path, concurrency, requests, api_pid=None):
+    """Issues `requests` downloads of `path`, at most `concurrency` at a time."""
+    results, rss_samples = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    url = f"{base_url}{path}"
+
+    async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(300, connect=10)) as client:
+        # One request to warm the release lookup so TTFB reflects steady state
+        await download(client, url, [])
+
+        idle_rss = process_rss_mb(api_pid) if api_pid else None
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(api_pid, rss_samples, stop)) if api_pid else None
+
+        async def limited():
+            async with semaphore:
+                await download(client, url, results)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        if sampler:
+            await sampler
+
+    ok = [r for r in results if r["status"] == 200 and "error" not in r]
+    ttfb = [r["ttfb_s"] for r in ok if r["ttfb_s"] is not None]
+    total_bytes = sum(r["bytes"] for r in results)
+    statuses = {}
+    for r in results:
+        key = str(r["status"]) if "error" not in r else "error"
+        statuses[key] = statuses.get(key, 0) + 1
+
+    report = {
+        "path": path,
+        "concurrency": concurrency,
+        "requests": requests,
+        "succeeded": len(ok),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "ttfb_ms": {
+            f"p{q}": round(percentile(ttfb, q) * 1000, 2) if ttfb else None
+            for q in (50, 95, 99)
+        },
+        "throughput_mb_s": round(total_bytes / 1024 / 1024 / elapsed, 2) if elapsed else None,
+        "requests_per_s": round(len(results) / elapsed, 2) if elapsed else None,
+        "bytes_total": total_bytes,
+        "errors": [r["error"] for r in results if "error" in r][:5],
+    }
+    if rss_samples and idle_rss is not None:
+        peak = max(rss_samples)
+        report["server_rss_mb"] = {"idle": round(idle_rss, 1), "peak": round(peak, 1)}
+        report["server_rss_per_connection_mb"] = round((peak - idle_rss) / concurrency, 3)
+    return report
+
+
+async def main(args):
+    mock_port = args.mock_port or free_port()
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    mock, mock_server = start_mock(
+        mock_port,
+        asset_size=int(args.asset_size_mb * 1024 * 1024),
+        latency_ms=args.latency_ms,
+        bandwidth_mbps=args.bandwidth_mbps
+    )
+
+    api = None
+    base_url = args.target
+    if base_url is None:
+        api_port = free_port()
+        extra_env = dict(item.split("=", 1) for item in args.env)
+        api = start_api(api_port, mock_url, extra_env)
+        base_url = f"http://127.0.0.1:{api_port}"
+
+    try:
+        await wait_ready(base_url)
+        reports = []
+        for concurrency in args.concurrency:
+            requests = args.requests or concurrency * 2
+            print(f"Running {requests} downloads of {args.path} at concurrency {concurrency}...")
+            report = await run_load(base_url, args.path, concurrency, requests, api.pid if api else None)
+            print(
+                f"  ok {report['succeeded']}/{requests}  ttfb p50/p95/p99 "
+                f"{report['ttfb_ms']['p50']}/{report['ttfb_ms']['p95']}/{report['ttfb_ms']['p99']} ms  "
+                f"{report['throughput_mb_s']} MB/s  "
+                f"{report.get('server_rss_per_connection_mb', 'n/a')} MB/conn"
+            )
+            reports.append(report)
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait(timeout=10)
+        mock_server.should_exit = True
+
+    return {
+        "mock": {
+            "asset_size_mb": args.asset_size_mb,
+            "latency_ms": args.latency_ms,
+            "bandwidth_mbps": args.bandwidth_mbps,
+            "upstream_requests": mock.requests,
+        },
+        "client_rss_mb": round(current_rss_mb(), 1),
+        "runs": reports,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent download load test for /api/datasets against a local GitHub stand-in.")
+    parser.add_argument("--path", default="/api/datasets/master", help="Endpoint to download")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50], help="One run per concurrency level")
+    parser.add_argument("--requests", type=int, help="Downloads per run (default: 2x concurrency)")
+    parser.add_argument("--asset-size-mb", type=float, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="Per-connection upstream cap in megabits/s (0 = unlimited)")
+    parser.add_argument("--mock-port", type=int, help="Port for the GitHub stand-in (default: random)")
+    parser.add_argument("--target", help="Use an already running API (pointed at the mock via GITHUB_API_URL) instead of starting one")
+    parser.add_argument("--env", action="append", default=[], help="Extra KEY=VALUE settings for the API process")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+
+    output = args.output or os.path.join("benchmarks", "results", f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {output}")
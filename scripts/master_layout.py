@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode', 'source_dataset']
+
+# Metric columns each source actually carries (its per-age counts and total),
+# in the order the sources are concatenated
+SOURCE_METRICS = {
+    'Biometric': ['bio_age_5_17', 'bio_age_17_', 'total_biometric_updates'],
+    'Demographic': ['demo_age_5_17', 'demo_age_17_', 'total_demographic_updates'],
+    'Enrollment': ['age_0_5', 'age_5_17', 'age_18_greater', 'total_enrolment'],
+}
+SOURCE_TOTALS = {source: metrics[-1] for source, metrics in SOURCE_METRICS.items()}
+
+# Column order of master_dataset_final.csv and the per-source CSVs
+WIDE_COLUMNS = [
+    'date', 'state', 'district', 'pincode', 'bio_age_5_17', 'bio_age_17_', 'source_dataset',
+    'total_biometric_updates', 'demo_age_5_17', 'demo_age_17_', 'total_demographic_updates',
+    'age_0_5', 'age_5_17', 'age_18_greater', 'total_enrolment', 'total_activity'
+]
+
+# The published CSVs have always held the metrics as floats ("15.0"), the
+# dtype the wide concat gave them; writers cast back to keep that format
+CSV_FLOAT_COLUMNS = [col for metrics in SOURCE_METRICS.values() for col in metrics] + ['total_activity']
+
+
+class MasterDataset:
+    """
+    The integrated dataset as one shared key frame plus a block of int32
+    metric columns per source. The sources' metrics are disjoint, so the old
+    wide concat padded every row with the other sources' columns as float64
+    zeros; here a row only stores its own source's counts.
+
+    `keys` holds date, state, district, pincode and source_dataset for every
+    row (labels are row positions of the integrated frame, sources in
+    SOURCE_METRICS order). `blocks[source]` is indexed by the labels of that
+    source's rows. Name normalization and filtering only touch `keys`;
+    `select()` re-aligns the blocks, and `to_wide()` builds the wide layout
+    for writers on demand.
+    """
+
+    def __init__(self, keys, blocks):
+        self.keys = keys
+        self.blocks = blocks
+
+    @classmethod
+    def from_sources(cls, frames):
+        """Builds the dataset from {source: cleaned per-source frame}."""
+        keys, blocks, offset = [], {}, 0
+        for source, metrics in SOURCE_METRICS.items():
+            df = frames[source]
+            index = pd.RangeIndex(offset, offset + len(df))
+            key = df.reindex(columns=KEY_COLUMNS[:-1])
+            key.index = index
+            keys.append(key)
+            block = df.reindex(columns=metrics).fillna(0).astype(np.int32)
+            block.index = index
+            blocks[source] = block
+            offset += len(df)
+
+        keys = pd.concat(keys)
+        keys['source_dataset'] = pd.Categorical.from_codes(
+            np.repeat(np.arange(len(SOURCE_METRICS), dtype=np.int8), [len(blocks[s]) for s in SOURCE_METRICS]),
+            categories=list(SOURCE_METRICS)
+        )
+        return cls(keys, blocks)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def select(self, keys):
+        """Returns a dataset over `keys` (a row subset of self.keys, same order)."""
+        labels = keys.index.to_numpy()
+        blocks = {}
+        for source, block in self.blocks.items():
+            if len(block) == 0:
+                blocks[source] = block
+                continue
+            # Each source's labels are one contiguous, ascending run
+            lo, hi = np.searchsorted(labels, [block.index[0], block.index[-1] + 1])
+            blocks[source] = block.iloc[block.index.searchsorted(labels[lo:hi])]
+        return MasterDataset(keys, blocks)
+
+    def source_keys(self, source):
+        block = self.blocks[source]
+        if len(block) == 0:
+            return self.keys.iloc[:0]
+        lo, hi = np.searchsorted(self.keys.index.to_numpy(), [block.index[0], block.index[-1] + 1])
+        return self.keys.iloc[lo:hi]
+
+    def to_wide(self, source=None):
+        """
+        The wide layout (WIDE_COLUMNS, other sources' metrics as 0) for one
+        source, or for all sources concatenated in order.
+        """
+        if source is None:
+            return pd.concat([self.to_wide(s) for s in SOURCE_METRICS])
+
+        keys, block = self.source_keys(source), self.blocks[source]
+        wide = keys.copy()
+        zeros = np.zeros(len(block), dtype=np.int32)
+        for metrics in SOURCE_METRICS.values():
+            for col in metrics:
+                wide[col] = block[col].to_numpy() if col in block.columns else zeros
+        wide['total_activity'] = block[SOURCE_TOTALS[source]].to_numpy()
+        return wide[WIDE_COLUMNS]
+
+    def memory_usage(self):
+        """Bytes held by the keys and metric blocks."""
+        total = int(self.keys.memory_usage(deep=True).sum())
+        return total + sum(int(b.memory_usage().sum()) for b in self.blocks.values())
@@ -0,0 +1,191 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import time
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+# Asset names published by the monthly workflows
+DEFAULT_ASSETS = {
+    "dataset-latest": ["master_dataset_final.csv", "biometric_full.csv", "enrollment_full.csv", "demographic_full.csv"],
+    "dataset-raw": ["biometric.csv", "enrolment.csv", "demographic.csv"],
+}
+
+# Deterministic CSV-looking content; byte i of every asset is BLOCK[i % len(BLOCK)]
+ROW = b"2025-03-01,Karnataka,Bengaluru,560001,12,34,0,0,0,0,46,0,0,46,Biometric\n"
+BLOCK = b"".join(ROW for _ in range(1024))
+HEADER_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def content_slice(start, end):
+    """Bytes [start, end) of the synthetic asset content."""
+    out = bytearray()
+    pos = start
+    while pos < end:
+        offset = pos % len(BLOCK)
+        take = min(len(BLOCK) - offset, end - pos)
+        out += BLOCK[offset:offset + take]
+        pos += take
+    return bytes(out)
+
+
+def content_digest(size):
+    digest = hashlib.sha256()
+    for start in range(0, size, 1 << 20):
+        digest.update(content_slice(start, min(size, start + (1 << 20))))
+    return digest.hexdigest()
+
+
+class MockGitHub:
+    """
+    Stand-in for the GitHub Releases API and asset downloads.
+
+    Assets have configurable size; responses wait `latency_ms` before the
+    first byte and are paced to `bandwidth_mbps` per connection. Range
+    requests are honoured so ranged/resumable clients can be exercised.
+    Files in `asset_dir` are published on `dataset-latest` with their real
+    content, e.g. artifacts written by process_data.py.
+    """
+
+    def __init__(self, asset_size=50 * 1024 * 1024, latency_ms=50.0, bandwidth_mbps=0.0,
+                 chunk_size=64 * 1024, assets=None, fail_rate=0.0, asset_dir=None):
+        self.asset_size = asset_size
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth_mbps * 1024 * 1024 / 8  # bytes per second; 0 = unthrottled
+        self.chunk_size = chunk_size
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.digest = content_digest(asset_size)
+        self.assets = {}
+        asset_id = 1000
+        for tag, names in (assets or DEFAULT_ASSETS).items():
+            for name in names:
+                asset_id += 1
+                self.assets[asset_id] = {"tag": tag, "name": name}
+        for name in sorted(os.listdir(asset_dir)) if asset_dir else []:
+            path = os.path.join(asset_dir, name)
+            if os.path.isfile(path):
+                asset_id += 1
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.assets[asset_id] = {
+                    "tag": "dataset-latest", "name": name, "data": data,
+                    "digest": hashlib.sha256(data).hexdigest()
+                }
+
+    def asset_json(self, base_url, owner, repo, asset_id, info):
+        return {
+            "id": asset_id,
+            "name": info["name"],
+            "url": f"{base_url}repos/{owner}/{repo}/releases/assets/{asset_id}",
+            "browser_download_url": f"{base_url}download/{info['tag']}/{info['name']}",
+            "size": len(info["data"]) if "data" in info else self.asset_size,
+            "updated_at": "2026-01-01T00:00:00Z",
+            "digest": f"sha256:{info.get('digest', self.digest)}",
+        }
+
+    async def release(self, request: Request):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        tag = request.path_params["tag"]
+        owner, repo = request.path_params["owner"], request.path_params["repo"]
+        base_url = str(request.base_url)
+        assets = [
+            self.asset_json(base_url, owner, repo, asset_id, info)
+            for asset_id, info in self.assets.items() if info["tag"] == tag
+        ]
+        if not assets:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+        return JSONResponse({"id": 1, "tag_name": tag, "assets": assets})
+
+    async def rate_limit(self, request: Request):
+        return JSONResponse({"rate": {"limit": 5000, "remaining": 5000}})
+
+    async def asset(self, request: Request):
+        self.requests += 1
+        asset_id = int(request.path_params["asset_id"])
+        if asset_id not in self.assets:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+
+        data = self.assets[asset_id].get("data")
+        size = len(data) if data is not None else self.asset_size
+        read = (lambda a, b: data[a:b]) if data is not None else content_slice
+
+        start, end, status = 0, size, 200
+        match = HEADER_RE.match(request.headers.get("range", ""))
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(size, int(match.group(2)) + 1) if match.group(2) else size
+            else:
+                start = max(0, size - int(match.group(2)))
+            if start >= size:
+                return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+            status = 206
+
+        headers = {"Content-Length": str(end - start), "Accept-Ranges": "bytes"}
+        if status == 206:
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+
+        fail_at = None
+        if self.fail_rate and (self.requests * 7919 % 1000) / 1000 < self.fail_rate:
+            # Drop the connection half way through to exercise retries/resume
+            fail_at = start + (end - start) // 2
+
+        async def body():
+            await asyncio.sleep(self.latency)
+            started = time.perf_counter()
+            sent = 0
+            pos = start
+            while pos < end:
+                if fail_at is not None and pos >= fail_at:
+                    raise ConnectionResetError("mock: simulated connection drop")
+                chunk = read(pos, min(end, pos + self.chunk_size))
+                pos += len(chunk)
+                sent += len(chunk)
+                yield chunk
+                if self.bandwidth:
+                    ahead = sent / self.bandwidth - (time.perf_counter() - started)
+                    if ahead > 0:
+                        await asyncio.sleep(ahead)
+
+        return StreamingResponse(body(), status_code=status, media_type="application/octet-stream", headers=headers)
+
+    def app(self):
+        return Starlette(routes=[
+            Route("/rate_limit", self.rate_limit),
+            Route("/repos/{owner}/{repo}/releases/tags/{tag}", self.release),
+            Route("/repos/{owner}/{repo}/releases/assets/{asset_id}", self.asset),
+        ])
+
+
+def create_app(**kwargs):
+    return MockGitHub(**kwargs).app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the GitHub Releases API.")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--asset-size-mb", type=float, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="Per-connection cap in megabits/s (0 = unlimited)")
+    parser.add_argument("--fail-rate", type=float, default=0, help="Share of downloads dropped mid-transfer")
+    parser.add_argument("--asset-dir", help="Also publish the files in this directory on dataset-latest")
+    args = parser.parse_args()
+
+    mock = MockGitHub(
+        asset_size=int(args.asset_size_mb * 1024 * 1024),
+        latency_ms=args.latency_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        fail_rate=args.fail_rate,
+        asset_dir=args.asset_dir
+    )
+    print(f"Mock GitHub on http://127.0.0.1:{args.port} (set GITHUB_API_URL to this)")
+    uvicorn.run(mock.app(), host="127.0.0.1", port=args.port, log_level="warning")
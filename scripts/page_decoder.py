@@ -0,0 +1,166 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+class Page:
+    """One decoded API page: envelope fields plus its records as columns."""
+
+    def __init__(self, status, total, message, columns):
+        self.status = status
+        self.total = total
+        self.message = message
+        # {field: list of values}, in the API's field order
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+
+def record_fields(records):
+    """Field order of a page as pd.DataFrame(records) would pick it: first seen, first listed."""
+    fields = {}
+    for record in records:
+        if record.keys() != fields.keys():
+            fields.update(dict.fromkeys(record))
+    return list(fields)
+
+
+def decode_page(raw, fields=None):
+    """
+    Decodes a data.gov.in JSON page (bytes or str) straight into columns.
+
+    The envelope is parsed once (orjson when installed) and each field is
+    gathered with one list comprehension over the records, so no per-page
+    DataFrame is built. `fields` fixes the column order (e.g. from an
+    earlier page); records missing a field get None, fields outside it
+    are added at the end as DataFrame construction would.
+    """
+    data = loads(raw)
+    records = data.get("records") or []
+    if fields is None:
+        fields = record_fields(records)
+    else:
+        fields = list(fields) + [f for f in record_fields(records) if f not in fields]
+
+    complete = all(len(record) == len(fields) for record in records)
+    columns = {}
+    for field in fields:
+        if complete:
+            columns[field] = [record[field] for record in records]
+        else:
+            columns[field] = [record.get(field) for record in records]
+    return Page(data.get("status"), int(data.get("total", 0) or 0), data.get("message"), columns)
+
+
+class ColumnWriter:
+    """
+    Appends decoded pages to a CSV file as they arrive. The output is what
+    concatenating pd.DataFrame(records) per page and calling
+    to_csv(index=False) produced, without holding the pages in memory.
+    The file is written next to `path` and moved into place by close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.partial = f"{path}.part"
+        self.file = open(self.partial, "w", newline="")
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        self.fields = None
+        self.rows = 0
+
+    def append(self, page):
+        if self.fields is None:
+            self.fields = list(page.columns)
+            self.writer.writerow(self.fields)
+        elif list(page.columns) != self.fields:
+            raise ValueError(f"Page fields {list(page.columns)} differ from {self.fields}")
+        self.writer.writerows(zip(*page.columns.values()))
+        self.rows += len(page)
+
+    def close(self):
+        self.file.close()
+        os.replace(self.partial, self.path)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.partial):
+            os.remove(self.partial)
+
+
+class ColumnBuffer:
+    """Accumulates decoded pages column by column for a single DataFrame at the end."""
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = 0
+
+    def append(self, page):
+        for field, values in page.columns.items():
+            if field not in self.columns:
+                self.columns[field] = [None] * self.rows
+            self.columns[field].extend(values)
+        self.rows += len(page)
+        for values in self.columns.values():
+            if len(values) < self.rows:
+                values.extend([None] * (self.rows - len(values)))
+
+    def to_frame(self):
+        return pd.DataFrame(self.columns)
+
+
+if __name__ == "__main__":
+    # Checks decode_page + ColumnWriter against the DataFrame path on saved
+    # API pages, e.g. recorded with:
+    #   curl -o page.json "https://api.data.gov.in/resource/<id>?api-key=$KEY&format=json&limit=10000&offset=0"
+    parser = argparse.ArgumentParser(description="Compare columnar page decoding with the DataFrame path on saved pages.")
+    parser.add_argument("pages", nargs="+", help="Saved JSON pages of one resource, in order")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raws = []
+    for path in args.pages:
+        with open(path, "rb") as f:
+            raws.append(f.read())
+
+    def dataframe_path():
+        frames = [pd.DataFrame(json.loads(raw).get("records", [])) for raw in raws]
+        return pd.concat(frames).to_csv(index=False)
+
+    def columnar_path():
+        out = os.path.join(tmp, "pages.csv")
+        writer = ColumnWriter(out)
+        for raw in raws:
+            writer.append(decode_page(raw, writer.fields))
+        writer.close()
+        with open(out) as f:
+            return f.read()
+
+    with tempfile.TemporaryDirectory(prefix="uidai-pages-") as tmp:
+        results = {}
+        for fn in (dataframe_path, columnar_path):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results[fn.__name__] = fn()
+            print(f"{fn.__name__:<16} {(time.perf_counter() - start) / args.repeat:.3f}s")
+
+    if results["dataframe_path"] != results["columnar_path"]:
+        expected = io.StringIO(results["dataframe_path"]).readlines()
+        actual = io.StringIO(results["columnar_path"]).readlines()
+        line = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+        print(f"Outputs differ at line {line + 1}")
+        sys.exit(1)
+    print(f"Identical CSV output ({len(raws)} pages, json parser: {loads.__module__})")
@@ -0,0 +1,139 @@
+import contextlib
+import json
+import os
+import platform
+import resource
+import threading
+import time
+
+
+def current_rss_mb():
+    """Resident set size of this process (Linux /proc, falling back to the peak)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RssSampler(threading.Thread):
+    """Polls RSS in the background to capture the peak within a single stage."""
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+class StageRecord(dict):
+    """Metrics for one stage. Stages set rows_out (and any extra keys) while running."""
+
+    @property
+    def rows_out(self):
+        return self.get("rows_out")
+
+    @rows_out.setter
+    def rows_out(self, value):
+        self["rows_out"] = int(value)
+
+
+class RunReport:
+    """
+    Collects per-stage metrics for a pipeline run: wall time, CPU time, peak
+    RSS, rows in/out/dropped. With `profile_dir` set, each stage is also
+    profiled (cProfile .prof files, or pyinstrument HTML if requested).
+    """
+
+    def __init__(self, profile_dir=None, profiler="cprofile"):
+        self.profile_dir = profile_dir
+        self.profiler = profiler
+        self.stages = []
+        self.started = time.perf_counter()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def _profile(self, name):
+        if not self.profile_dir:
+            yield
+            return
+
+        if self.profiler == "pyinstrument":
+            from pyinstrument import Profiler  # optional dependency
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(os.path.join(self.profile_dir, f"{name}.html"), "w") as f:
+                    f.write(profiler.output_html())
+            return
+
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        record = StageRecord(stage=name)
+        if rows_in is not None:
+            record["rows_in"] = int(rows_in)
+
+        sampler = RssSampler()
+        rss_before = current_rss_mb()
+        sampler.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            with self._profile(name):
+                yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 4)
+            record["cpu_s"] = round(time.process_time() - cpu, 4)
+            sampler.stop()
+            record["rss_before_mb"] = round(rss_before, 1)
+            record["rss_after_mb"] = round(current_rss_mb(), 1)
+            record["peak_rss_mb"] = round(sampler.peak, 1)
+            if "rows_in" in record and "rows_out" in record:
+                record["rows_dropped"] = record["rows_in"] - record["rows_out"]
+            self.stages.append(record)
+            print(f"[{name}] {record['wall_s']:.3f}s wall, {record['cpu_s']:.3f}s cpu, peak RSS {record['peak_rss_mb']:.0f}MB")
+
+    def add(self, record):
+        """Appends an externally measured stage record."""
+        self.stages.append(StageRecord(record))
+
+    def to_dict(self, **extra):
+        report = {
+            "started_at": self.started_at,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "total_wall_s": round(time.perf_counter() - self.started, 4),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+        report.update(extra)
+        report["stages"] = self.stages
+        return report
+
+    def write(self, path, **extra):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(**extra), f, indent=2)
+        print(f"Run report written to {path}")
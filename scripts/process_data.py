@@ -1,8 +1,21 @@
 
 import pandas as pd
 import numpy as np
+import argparse
 import re
 import os
+import sys
+
+# Add scripts directory to path to import utils, and the repo root for the shared store format
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline_metrics import RunReport
+from data_quality import QualityTracker
+from district_matcher import DistrictMatcher
+from master_layout import CSV_FLOAT_COLUMNS, MasterDataset
+from stratified_samples import write_samples
+from app.core.columnar import pack_store, store_dictionaries, write_store_batches
+from app.core.partitions import write_partitions
 
 # ==========================================
 # CONSTANTS & MAPS
@@ -273,6 +286,32 @@ def normalize_text(x):
     return x
 
 
+# Tried in order on each distinct value; the raw feeds use dd-mm-yyyy
+DATE_FORMATS = ['%d-%m-%Y', '%Y-%m-%d', '%d/%m/%Y', '%Y/%m/%d', '%d.%m.%Y', '%Y%m%d', '%d-%m-%y']
+
+def parse_dates(values):
+    """
+    Parses a date column through its distinct values (a few hundred days
+    across millions of rows). Each value gets the first of DATE_FORMATS that
+    fits it, with a day-first guess for anything else, and the results are
+    mapped back to the rows as datetime64 (NaT when unparseable).
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    for fmt in DATE_FORMATS:
+        todo = parsed.isna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(text[todo], format=fmt, errors='coerce').astype('datetime64[ns]')
+    for i in parsed.index[parsed.isna()]:
+        parsed[i] = pd.to_datetime(text[i], dayfirst=True, errors='coerce')
+
+    # code -1 (missing) picks the trailing NaT
+    lookup = np.append(parsed.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
 # Valid Districts Whitelist (Extracted from Ideal Dataset)
 VALID_DISTRICTS = {
     "Adilabad", "Agar Malwa", "Agra", "Ahilyanagar", "Ahmedabad", "Aizawl", "Ajmer", "Akola", "Alappuzha", "Aligarh",
@@ -402,7 +441,7 @@ def process_biometric(file_path):
     df = basic_clean(df)
     
     # Ensure date parsing
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = parse_dates(df['date'])
     
     # Ensure required columns exist
     required_cols = ['bio_age_5_17', 'bio_age_17_']
@@ -422,7 +461,7 @@ def process_enrollment(file_path):
     df = basic_clean(df)
     
     # Ensure date parsing
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = parse_dates(df['date'])
     
     # Ensure required columns exist
     required_cols = ['age_0_5', 'age_5_17', 'age_18_greater']
@@ -442,10 +481,7 @@ def process_demographic(file_path):
     df = basic_clean(df)
     
     # Ensure date parsing (Demographic often has dd-mm-yyyy)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    # Use standard format if above fails or mixed
-    if df['date'].isna().sum() > len(df) * 0.5:
-         df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = parse_dates(df['date'])
 
     # Ensure required columns exist
     required_cols = ['demo_age_5_17', 'demo_age_17_']
@@ -463,71 +499,84 @@ def process_demographic(file_path):
 # MAIN EXECUTION
 # ==========================================
 
-def integrate_datasets():
-    # Define file paths
-    # Define file paths
-    base_dir = "public/datasets"
-    bio_path = os.path.join(base_dir, "biometric.csv")
+def source_paths(base_dir="public/datasets"):
+    """Raw file of each source dataset."""
     enroll_path = os.path.join(base_dir, "enrollment.csv")
     if not os.path.exists(enroll_path):
         enroll_path = os.path.join(base_dir, "enrolment.csv")
-    
-    demo_path = os.path.join(base_dir, "demographic.csv")
+    return {
+        'Biometric': os.path.join(base_dir, "biometric.csv"),
+        'Demographic': os.path.join(base_dir, "demographic.csv"),
+        'Enrollment': enroll_path
+    }
+
+def load_datasets(base_dir="public/datasets"):
+    """Loads and cleans the three raw source files."""
+    paths = source_paths(base_dir)
     
     # 1. Load and clean individual datasets
-    df_bio = process_biometric(bio_path)
-    df_enroll = process_enrollment(enroll_path)
-    df_demo = process_demographic(demo_path)
-    
-    # 2. Prepare for Merge
-    # Drop auxiliary columns to avoid conflict
-    df_bio_clean = df_bio.drop(columns=['state_original', 'month'], errors='ignore')
-    df_enroll_clean = df_enroll.drop(columns=['state_original', 'month'], errors='ignore')
-    df_demo_clean = df_demo.drop(columns=['state_needs_correction', 'district_raw', 'month'], errors='ignore')
+    df_bio = process_biometric(paths['Biometric'])
+    df_enroll = process_enrollment(paths['Enrollment'])
+    df_demo = process_demographic(paths['Demographic'])
     
-    # 3. Concatenate into Master DataFrame
+    return df_bio, df_enroll, df_demo
+
+def merge_datasets(df_bio, df_enroll, df_demo):
+    # 2. Combine into the Master Dataset: one shared key frame plus each
+    # source's own metric columns (int32), instead of a NaN-padded wide concat.
+    # total_activity and the other sources' columns are filled in by writers.
     print("Merging datasets...")
-    master_df = pd.concat([df_bio_clean, df_demo_clean, df_enroll_clean], ignore_index=True)
-    
-    # Fill NaNs for numerical analysis
-    metric_cols = [
-        'bio_age_5_17', 'bio_age_17_', 
-        'demo_age_5_17', 'demo_age_17_', 
-        'age_0_5', 'age_5_17', 'age_18_greater', 
-        'total_biometric_updates', 'total_enrolment', 'total_demographic_updates'
-    ]
-    for col in metric_cols:
-        if col in master_df.columns:
-            master_df[col] = master_df[col].fillna(0)
-            
-    # Calculate Total Activity (Row-wise sum of available columns)
-    master_df['total_activity'] = (
-        master_df['total_biometric_updates'] + 
-        master_df['total_enrolment'] + 
-        master_df['total_demographic_updates']
-    )
-    
-    return master_df
+    return MasterDataset.from_sources({
+        'Biometric': df_bio,
+        'Demographic': df_demo,
+        'Enrollment': df_enroll
+    })
+
+# Districts whose state is fixed regardless of the majority vote
+MANUAL_STATE_OVERRIDES = {
+    'Leh': 'Ladakh', 'Kargil': 'Ladakh',
+    'Mahabubnagar': 'Telangana', 'Rangareddy': 'Telangana', 'Khammam': 'Telangana'
+}
+
+NORMALIZED_ALIAS_MAP = {k.lower(): v for k, v in DISTRICT_ALIAS_MAP.items()}
+
+def normalize_state_values(states):
+    """Returns (state_norm, state mapped via STATE_STANDARD_MAP, NaN where the map misses)."""
+    state_norm = states.apply(normalize_text)
+    return state_norm, state_norm.map(STATE_STANDARD_MAP)
+
+def normalize_district_values(districts):
+    """Returns (district_norm, district after DISTRICT_ALIAS_MAP, title-cased)."""
+    district_norm = districts.astype(str).str.lower().str.strip().str.replace(r'\s+', ' ', regex=True)
+    return district_norm, district_norm.replace(NORMALIZED_ALIAS_MAP).str.title()
+
+def majority_map(counts, key, value):
+    """
+    {key: most frequent value} from a (key, value, count) frame sorted by
+    (key, value), as groupby().size() returns it. Ties go to the first value
+    in sort order, so every engine picks the same winner.
+    """
+    winners = counts.sort_values('count', ascending=False, kind='stable').drop_duplicates(key)
+    return dict(zip(winners[key], winners[value]))
 
-def apply_strict_normalization(master_df):
-    print("Applying Strict Name Normalization...")
+def normalize_names(master_df, quality=None):
+    """State/district alias mapping, majority-vote state audit and whitelist enforcement."""
     
     # 1. State Normalization
-    master_df['state_norm'] = master_df['state'].apply(normalize_text)
-    master_df['state_clean'] = master_df['state_norm'].map(STATE_STANDARD_MAP)
-    master_df['state_clean'].fillna(master_df['state'].str.title(), inplace=True)
+    master_df['state_norm'], master_df['state_clean'] = normalize_state_values(master_df['state'])
+    if quality is not None:
+        state_unmapped = master_df['state_clean'].isna()
+    master_df['state_clean'] = master_df['state_clean'].fillna(master_df['state'].str.title())
     
-    # 2. District Normalization
-    # Standard Lower/Strip
-    master_df['district_norm'] = master_df['district'].astype(str).str.lower().str.strip().str.replace(r'\s+', ' ', regex=True)
-    
-    # Map Replacements
-    normalized_alias_map = {k.lower(): v for k, v in DISTRICT_ALIAS_MAP.items()}
-    master_df['district_clean'] = master_df['district_norm'].replace(normalized_alias_map).str.title()
+    # 2. District Normalization (lower/strip, alias replacements)
+    master_df['district_norm'], master_df['district_clean'] = normalize_district_values(master_df['district'])
     
     # Update Standard Columns
     master_df['state'] = master_df['state_clean']
     master_df['district'] = master_df['district_clean']
+    if quality is not None:
+        # Keep the pre-map spellings for the unmapped-name report
+        state_norm, district_norm = master_df['state_norm'], master_df['district_norm']
     
     # Cleanup intermediate columns
     master_df.drop(columns=['state_norm', 'state_clean', 'district_norm', 'district_clean'], inplace=True, errors='ignore')
@@ -538,15 +587,10 @@ def apply_strict_normalization(master_df):
     # The original report script used this, so we retain it for consistency.
     
     district_state_counts = master_df.groupby(['district', 'state']).size().reset_index(name='count')
-    authoritative_map = district_state_counts.sort_values('count', ascending=False).drop_duplicates('district')[['district', 'state']]
-    authoritative_dict = dict(zip(authoritative_map['district'], authoritative_map['state']))
+    authoritative_dict = majority_map(district_state_counts, 'district', 'state')
     
     # Explicit Overrides from Report
-    manual_overrides = {
-        'Leh': 'Ladakh', 'Kargil': 'Ladakh',
-        'Mahabubnagar': 'Telangana', 'Rangareddy': 'Telangana', 'Khammam': 'Telangana'
-    }
-    authoritative_dict.update(manual_overrides)
+    authoritative_dict.update(MANUAL_STATE_OVERRIDES)
     
     # Apply standard state mapping based on district
     # Note: This is aggressive. It assumes a district name matches strictly to ONE state.
@@ -571,8 +615,66 @@ def apply_strict_normalization(master_df):
     # If we have "Garbage", it becomes Unknown.
     
     valid_dist_mask = master_df['district'].isin(VALID_DISTRICTS)
+
+    # 3.4.1 Fuzzy resolution: typos that no alias covers get the closest
+    # whitelisted district of the row's state before falling back to Unknown
+    resolved, decisions = resolve_fuzzy_districts(master_df, ~valid_dist_mask, district_state_counts)
+    if len(resolved):
+        master_df.loc[resolved.index, 'district'] = resolved
+        valid_dist_mask[resolved.index] = True
+        print(f"Fuzzy-matched {len(decisions)} district spellings ({len(resolved)} rows).")
+
+    if quality is not None:
+        quality.observe_fuzzy(resolved.index, decisions)
+        quality.observe_names(state_norm, state_unmapped, district_norm, master_df['state'], valid_dist_mask)
     master_df.loc[~valid_dist_mask, 'district'] = 'Unknown'
     
+    return master_df
+
+_district_matcher = None
+
+
+def get_district_matcher():
+    """The trigram index over VALID_DISTRICTS, built once per process."""
+    global _district_matcher
+    if _district_matcher is None:
+        _district_matcher = DistrictMatcher(VALID_DISTRICTS - {"Unknown"})
+    return _district_matcher
+
+
+def match_district_pairs(pairs, district_state_counts):
+    """Fuzzy-matches (district, state) pairs, scoped by the valid pairs seen in the data."""
+    known = district_state_counts[
+        district_state_counts['district'].isin(VALID_DISTRICTS) & district_state_counts['state'].isin(VALID_STATES)
+    ]
+    scopes = known.groupby('state')['district'].agg(set).to_dict()
+    return get_district_matcher().resolve(pairs, scopes)
+
+
+def resolve_fuzzy_districts(master_df, unmatched_mask, district_state_counts):
+    """
+    Matches each distinct (district, state) pair among the unmatched rows once.
+    Returns the resolved district per row (indexed like master_df) and one
+    decision dict per matched pair.
+    """
+    subset = master_df.loc[unmatched_mask, ['district', 'state']]
+    if subset.empty:
+        return subset['district'], []
+
+    codes, pairs = pd.MultiIndex.from_frame(subset).factorize()
+    results = match_district_pairs(list(pairs), district_state_counts)
+
+    names = np.array([r[0] if r else None for r in results], dtype=object)
+    rows = np.bincount(codes, minlength=len(results))
+    decisions = [
+        {"spelling": spelling, "state": state, "match": r[0], "distance": r[1], "rows": int(n)}
+        for (spelling, state), r, n in zip(pairs, results, rows) if r
+    ]
+    matched = names[codes]
+    hit = pd.notna(matched)
+    return pd.Series(matched[hit], index=subset.index[hit], dtype=object), decisions
+
+def recover_locations_by_pincode(master_df, quality=None):
     # ---------------------------------------------------------
     # 3.5 Pincode-Based Recovery (Crusial for recovering ~1.6M rows)
     # ---------------------------------------------------------
@@ -592,10 +694,10 @@ def apply_strict_normalization(master_df):
     
     if not trusted_df.empty:
         # Pincode -> State (Majority Vote)
-        pincode_state_map = trusted_df.groupby('pincode')['state'].agg(lambda x: x.value_counts().idxmax()).to_dict()
+        pincode_state_map = majority_map(trusted_df.groupby(['pincode', 'state']).size().reset_index(name='count'), 'pincode', 'state')
         
         # Pincode -> District (Majority Vote)
-        pincode_dist_map = trusted_df.groupby('pincode')['district'].agg(lambda x: x.value_counts().idxmax()).to_dict()
+        pincode_dist_map = majority_map(trusted_df.groupby(['pincode', 'district']).size().reset_index(name='count'), 'pincode', 'district')
         
         # Apply Recovery
         
@@ -609,15 +711,35 @@ def apply_strict_normalization(master_df):
         mask_bad_dist = (master_df['district'] == 'Unknown') | (master_df['district'].isna())
         master_df.loc[mask_bad_dist, 'district'] = master_df.loc[mask_bad_dist, 'pincode'].map(pincode_dist_map).fillna(master_df.loc[mask_bad_dist, 'district'])
         
+        if quality is not None:
+            # Only the rows that needed recovery are re-checked
+            new_states = master_df.loc[mask_bad_state, 'state']
+            new_districts = master_df.loc[mask_bad_dist, 'district']
+            dist_fixed = new_districts.notna() & (new_districts != 'Unknown')
+            quality.observe_recovery(
+                new_states.index[new_states.isin(VALID_STATES)],
+                new_districts.index[dist_fixed],
+                new_districts.index[~dist_fixed]
+            )
         print("Pincode Recovery Complete.")
     else:
         print("Warning: Not enough trusted data for Pincode Recovery.")
+        if quality is not None:
+            quality.observe_recovery([], [], master_df.index[master_df['district'] == 'Unknown'])
 
+    return master_df
+
+def filter_invalid_states(master_df, quality=None):
     # 4. Final Strict Filter: Keep only Valid States
     print("Filtering invalid states...")
     before_count = len(master_df)
-    # Filter only rows where state is in VALID_STATES
-    master_df = master_df[master_df['state'].isin(VALID_STATES)]
+    # Filter only rows where state is in VALID_STATES (code -1 otherwise); the
+    # codes double as the per-state grouping of the quality report
+    states = sorted(VALID_STATES)
+    state_codes = pd.Index(states).get_indexer(master_df['state'])
+    if quality is not None:
+        quality.observe_states(master_df.index, state_codes, states)
+    master_df = master_df[state_codes >= 0]
     dropped_count = before_count - len(master_df)
     if dropped_count > 0:
         print(f"Dropped {dropped_count} rows with invalid/garbage state names.")
@@ -627,42 +749,195 @@ def apply_strict_normalization(master_df):
     
     return master_df
 
-if __name__ == "__main__":
-    print("Starting Aadhaar Data Processing Pipeline...")
-    
-    # Integrate
-    master_df = integrate_datasets()
-    
-    # Normalize
-    master_df = apply_strict_normalization(master_df)
-    
-    # Final cleanup of columns if needed
-    
-    # Save Master Dataset
-    output_path = "public/master_dataset_final.csv"
+def write_outputs(master, output_path="public/master_dataset_final.csv", datasets_dir="public/datasets"):
+    # Wide rows are built one source at a time, so only one source's padded
+    # layout is in memory; the master CSV is the three written back to back.
     print(f"Saving Master Dataset to {output_path}...")
-    master_df.to_csv(output_path, index=False)
-    
-    # Save Individual Normalized Datasets (Split by source)
     print("Saving Individual Normalized Datasets...")
     datasets_map = {
         'Biometric': 'biometric_full.csv',
-        'Enrollment': 'enrollment_full.csv', 
-        'Demographic': 'demographic_full.csv'
+        'Demographic': 'demographic_full.csv',
+        'Enrollment': 'enrollment_full.csv'
     }
     
     # Ensure output directory exists (it should, but safety first)
-    os.makedirs("public/datasets", exist_ok=True)
+    os.makedirs(datasets_dir, exist_ok=True)
     
-    for source_name, filename in datasets_map.items():
-        # Filter
-        subset_df = master_df[master_df['source_dataset'] == source_name].copy()
+    for i, (source_name, filename) in enumerate(datasets_map.items()):
+        subset_df = master.to_wide(source_name).astype({col: 'float64' for col in CSV_FLOAT_COLUMNS})
+        subset_df.to_csv(output_path, index=False, mode="w" if i == 0 else "a", header=i == 0)
         
         if not subset_df.empty:
-            file_path = os.path.join("public/datasets", filename)
+            file_path = os.path.join(datasets_dir, filename)
             print(f"Saving {source_name} dataset to {file_path} ({len(subset_df)} rows)...")
             subset_df.to_csv(file_path, index=False)
         else:
             print(f"Warning: No data found for source {source_name}")
 
+def write_columnar_store(batches, dictionaries, store_dir="public/columnar", archive_path="public/columnar_store.tar.gz"):
+    """
+    Writes the memory-mapped columnar store served by /api/query from wide
+    master batches, plus its release tarball.
+    """
+    print(f"Writing columnar store to {store_dir}...")
+    manifest = write_store_batches(batches, dictionaries, store_dir)
+    pack_store(store_dir, archive_path)
+    print(f"Packed {manifest['rows']} rows into {archive_path} ({os.path.getsize(archive_path) / 1e6:.1f} MB)")
+    return manifest
+
+class PandasEngine:
+    """
+    Eager, in-memory engine: each stage is a pandas pass over the
+    MasterDataset. See duckdb_engine.DuckDBEngine for the out-of-core one;
+    both produce the same artifacts.
+    """
+
+    name = "pandas"
+
+    def __init__(self, quality):
+        self.quality = quality
+        self.frames = None
+        self.master = None
+
+    def load(self, base_dir):
+        self.frames = load_datasets(base_dir)
+        return sum(len(df) for df in self.frames)
+
+    def integrate(self):
+        self.master = merge_datasets(*self.frames)
+        self.frames = None
+        self.quality.observe_integrated(self.master)
+        return len(self.master), self.master.memory_usage()
+
+    # Name stages work on the shared key frame only
+    def normalize(self):
+        self.master.keys = normalize_names(self.master.keys, self.quality)
+        return len(self.master)
+
+    def unknown_districts(self):
+        return int((self.master.keys['district'] == 'Unknown').sum())
+
+    def recover(self):
+        self.master.keys = recover_locations_by_pincode(self.master.keys, self.quality)
+        return len(self.master)
+
+    def filter(self):
+        self.master = self.master.select(filter_invalid_states(self.master.keys, self.quality))
+        return len(self.master)
+
+    def write(self, output_path, datasets_dir):
+        write_outputs(self.master, output_path, datasets_dir)
+
+    def write_columnar(self, store_dir, archive_path):
+        wide = self.master.to_wide()
+        write_columnar_store([wide], store_dictionaries(wide), store_dir, archive_path)
+
+    def close(self):
+        pass
+
+
+ENGINES = ("pandas", "duckdb")
+
+def get_engine(name, quality, **options):
+    """Instantiates a processing engine by name; DuckDB is an optional dependency."""
+    if name == "pandas":
+        return PandasEngine(quality)
+    if name == "duckdb":
+        from duckdb_engine import DuckDBEngine
+        return DuckDBEngine(quality, **options)
+    raise ValueError(f"Unknown engine '{name}'. Available: {ENGINES}")
+
+def run_pipeline(run, base_dir="public/datasets", output_path="public/master_dataset_final.csv", datasets_dir="public/datasets",
+                 store_dir="public/columnar", store_archive="public/columnar_store.tar.gz",
+                 quality_path="public/data_quality_report.json", partitions_dir="public/partitions",
+                 samples_dir="public/samples", engine="pandas", engine_options=None):
+    """Runs every stage under `run` (a RunReport) with the named engine and returns the engine."""
+    quality = QualityTracker()
+    engine = get_engine(engine, quality, **(engine_options or {}))
+
+    try:
+        with run.stage("load") as stage:
+            stage.rows_out = engine.load(base_dir)
+
+        with run.stage("integrate", rows_in=stage.rows_out) as stage:
+            rows, memory = engine.integrate()
+            stage.rows_out = rows
+            stage["memory_mb"] = round(memory / 1024 / 1024, 1)
+
+        print("Applying Strict Name Normalization...")
+        with run.stage("normalize", rows_in=rows) as stage:
+            stage.rows_out = engine.normalize()
+
+        with run.stage("pincode_recovery", rows_in=stage.rows_out) as stage:
+            unknown_before = engine.unknown_districts()
+            stage.rows_out = engine.recover()
+            stage["districts_recovered"] = unknown_before - engine.unknown_districts()
+
+        with run.stage("filter", rows_in=stage.rows_out) as stage:
+            stage.rows_out = rows = engine.filter()
+
+        with run.stage("quality", rows_in=rows) as stage:
+            report = quality.write(quality_path)
+            stage.rows_out = rows
+            stage["unmapped_district_spellings"] = len(report["unmapped_districts"])
+
+        with run.stage("write", rows_in=rows) as stage:
+            engine.write(output_path, datasets_dir)
+            stage.rows_out = rows
+
+        # Month files for incremental refresh, split from the written master CSV
+        with run.stage("partitions", rows_in=rows) as stage:
+            manifest = write_partitions(output_path, partitions_dir)
+            stage.rows_out = sum(p["rows"] for p in manifest["partitions"])
+            stage["months"] = len(manifest["partitions"])
+
+        with run.stage("samples", rows_in=rows) as stage:
+            manifest = write_samples(output_path, samples_dir)
+            stage.rows_out = manifest["files"]["master"][f"{max(manifest['rates']):g}"]["rows"]
+
+        with run.stage("columnar", rows_in=rows) as stage:
+            engine.write_columnar(store_dir, store_archive)
+            stage.rows_out = rows
+            stage["bytes_written"] = os.path.getsize(store_archive)
+    finally:
+        engine.close()
+
+    return engine
+
+def run_pipeline_in(run, data_dir, output_dir, engine="pandas", engine_options=None):
+    """run_pipeline() on the raw CSVs in `data_dir`, writing every artifact under `output_dir`."""
+    return run_pipeline(
+        run,
+        base_dir=data_dir,
+        output_path=os.path.join(output_dir, "master_dataset_final.csv"),
+        datasets_dir=output_dir,
+        store_dir=os.path.join(output_dir, "columnar"),
+        store_archive=os.path.join(output_dir, "columnar_store.tar.gz"),
+        quality_path=os.path.join(output_dir, "data_quality_report.json"),
+        partitions_dir=os.path.join(output_dir, "partitions"),
+        samples_dir=os.path.join(output_dir, "samples"),
+        engine=engine,
+        engine_options=engine_options
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aadhaar data processing pipeline")
+    parser.add_argument("--report", default="public/processing_report.json", help="Where to write the per-stage run report")
+    parser.add_argument("--profile", action="store_true", help="Profile each stage and dump the results to --profile-dir")
+    parser.add_argument("--profile-dir", default="profiles")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+    parser.add_argument("--engine", choices=ENGINES, default="pandas",
+                        help="pandas (in memory) or duckdb (out-of-core, multi-threaded; needs the duckdb package)")
+    parser.add_argument("--memory-limit", help="DuckDB memory limit before spilling to disk, e.g. 4GB. "
+                             "The columnar store build still holds its encoded columns (~50 bytes a row) in memory")
+    parser.add_argument("--threads", type=int, help="DuckDB worker threads (default: all cores)")
+    args = parser.parse_args()
+
+    print("Starting Aadhaar Data Processing Pipeline...")
+    run = RunReport(profile_dir=args.profile_dir if args.profile else None, profiler=args.profiler)
+    
+    engine_options = {"memory_limit": args.memory_limit, "threads": args.threads} if args.engine == "duckdb" else {}
+    run_pipeline(run, engine=args.engine, engine_options=engine_options)
+
+    run.write(args.report, engine=args.engine, pandas=pd.__version__, numpy=np.__version__)
     print("Processing Complete.")
@@ -0,0 +1,255 @@
+"""
+Parallel, resumable downloads of release assets.
+
+Assets are listed through the GitHub Releases API (GITHUB_API_URL, so the
+local stand-in in mock_github_server.py works too) and fetched from their
+API url in ranged segments of SEGMENT_SIZE bytes. Segments of all requested
+files share one pool of connections. A file is written in place to
+`<name>.part`, with the indices of its completed segments recorded in
+`<name>.part.json`; an interrupted run picks up from the segments still
+missing, and a dropped connection inside a segment resumes from the byte it
+reached. The finished file is checked against the release's sha256 digest
+before it replaces `<name>`, and assets whose local copy already matches
+are not downloaded again.
+"""
+import argparse
+import concurrent.futures
+import datetime
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+SEGMENT_SIZE = 8 * 1024 * 1024
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+READ_SIZE = 1024 * 1024
+TIMEOUT = (10, 60)
+
+
+class RangeNotSupported(Exception):
+    pass
+
+
+def file_sha256(path, chunk_size=READ_SIZE):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class ReleaseFetcher:
+    def __init__(self, repo, api_url=None, token=None, segment_size=SEGMENT_SIZE,
+                 workers=MAX_WORKERS, retries=MAX_RETRIES, retry_delay=1.0):
+        self.repo = repo
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL", "https://api.github.com")).rstrip("/")
+        self.token = token if token is not None else (os.getenv("GH_TOKEN") or os.getenv("GH_PAT"))
+        self.segment_size = segment_size
+        self.workers = workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _headers(self, accept="application/vnd.github.v3+json"):
+        headers = {"Accept": accept}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        return headers
+
+    def release_assets(self, tag):
+        url = f"{self.api_url}/repos/{self.repo}/releases/tags/{tag}"
+        resp = self._session().get(url, headers=self._headers(), timeout=TIMEOUT)
+        resp.raise_for_status()
+        return resp.json().get("assets", [])
+
+    def fetch(self, tag, patterns, output_dir):
+        """
+        Downloads the assets of release `tag` matching any of the glob
+        `patterns` into `output_dir`. Returns {asset name: "present",
+        "downloaded" or the error}; patterns matching no asset are reported.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        assets = [a for a in self.release_assets(tag) if any(fnmatch.fnmatch(a["name"], p) for p in patterns)]
+        for pattern in patterns:
+            if not any(fnmatch.fnmatch(a["name"], pattern) for a in assets):
+                print(f"Note: no asset matching {pattern} in {self.repo} @ {tag}.")
+
+        results, jobs = {}, []
+        for asset in assets:
+            job = self._plan(asset, os.path.join(output_dir, asset["name"]))
+            if job is None:
+                print(f"✔ {asset['name']} is up to date.")
+                results[asset["name"]] = "present"
+            else:
+                jobs.append(job)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._fetch_segment, job, index): job for job in jobs for index in job["todo"]}
+            for future in concurrent.futures.as_completed(pending):
+                job = pending[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    job["error"] = job.get("error") or e
+
+        for job in jobs:
+            name = job["asset"]["name"]
+            if isinstance(job.get("error"), RangeNotSupported):
+                # One whole-file segment; a dropped connection restarts it
+                job = self._plan(job["asset"], job["path"], segment_size=max(job["asset"]["size"], 1))
+                try:
+                    self._fetch_segment(job, 0)
+                except Exception as e:
+                    job["error"] = e
+            if job.get("error") is None:
+                try:
+                    self._finish(job)
+                except Exception as e:
+                    job["error"] = e
+            if job.get("error") is None:
+                print(f"✅ Downloaded {name} ({job['asset']['size']:,} bytes)")
+                results[name] = "downloaded"
+            else:
+                print(f"❌ Failed to download {name}: {job['error']}")
+                results[name] = str(job["error"])
+        return results
+
+    def _is_current(self, asset, path):
+        if not os.path.exists(path) or os.path.getsize(path) != asset["size"]:
+            return False
+        digest = (asset.get("digest") or "").partition("sha256:")[2]
+        if digest:
+            return file_sha256(path) == digest
+        # Older assets carry no digest: trust a same-size copy written after the upload
+        updated = asset.get("updated_at")
+        if not updated:
+            return False
+        uploaded = datetime.datetime.fromisoformat(updated.replace("Z", "+00:00")).timestamp()
+        return os.path.getmtime(path) >= uploaded
+
+    def _plan(self, asset, path, segment_size=None):
+        """The download job for an asset (None when the local copy is current), reusing finished segments."""
+        if segment_size is None:
+            if self._is_current(asset, path):
+                return None
+            segment_size = self.segment_size
+        size = asset["size"]
+        identity = {
+            "id": asset["id"], "size": size, "digest": asset.get("digest"),
+            "updated_at": asset.get("updated_at"), "segment_size": segment_size,
+        }
+        part, state_path = f"{path}.part", f"{path}.part.json"
+        state = _load_json(state_path)
+        if state and state.get("identity") == identity and os.path.exists(part) and os.path.getsize(part) == size:
+            done = set(state["done"])
+        else:
+            done = set()
+            with open(part, "wb") as f:
+                f.truncate(size)
+            _save_json(state_path, {"identity": identity, "done": []})
+        segments = max(1, -(-size // segment_size))
+        return {
+            "asset": asset, "path": path, "part": part, "state": state_path, "identity": identity,
+            "segment_size": segment_size, "segments": segments, "done": done,
+            "todo": [i for i in range(segments) if i not in done], "error": None,
+        }
+
+    def _fetch_segment(self, job, index):
+        if job.get("error") is not None:
+            return
+        size = job["asset"]["size"]
+        start = index * job["segment_size"]
+        end = min(size, start + job["segment_size"])
+        whole = start == 0 and end == size
+        pos = start
+        for attempt in range(self.retries + 1):
+            headers = self._headers(accept="application/octet-stream")
+            if not whole or pos > start:
+                headers["Range"] = f"bytes={pos}-{end - 1}"
+            try:
+                with self._session().get(job["asset"]["url"], headers=headers, stream=True, timeout=TIMEOUT) as resp:
+                    if resp.status_code == 200:
+                        if not whole:
+                            raise RangeNotSupported(f"{job['asset']['name']}: server ignored the Range header")
+                        pos = start
+                    elif resp.status_code != 206:
+                        resp.raise_for_status()
+                        raise requests.HTTPError(f"Unexpected status {resp.status_code}", response=resp)
+                    with open(job["part"], "r+b") as f:
+                        f.seek(pos)
+                        for chunk in resp.iter_content(READ_SIZE):
+                            chunk = chunk[:end - pos]
+                            f.write(chunk)
+                            pos += len(chunk)
+                            if pos >= end:
+                                break
+                if pos < end:
+                    raise requests.ConnectionError(f"Connection closed at byte {pos} of {start}-{end - 1}")
+                break
+            except RangeNotSupported:
+                raise
+            except (requests.RequestException, OSError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if attempt == self.retries or (status is not None and 400 <= status < 500 and status != 429):
+                    raise
+                time.sleep(self.retry_delay * (attempt + 1))
+
+        with self._lock:
+            job["done"].add(index)
+            _save_json(job["state"], {"identity": job["identity"], "done": sorted(job["done"])})
+
+    def _finish(self, job):
+        """Verifies a fully downloaded part file and moves it into place."""
+        digest = (job["asset"].get("digest") or "").partition("sha256:")[2]
+        if digest:
+            actual = file_sha256(job["part"])
+            if actual != digest:
+                os.remove(job["part"])
+                os.remove(job["state"])
+                raise ValueError(f"checksum mismatch (expected {digest}, got {actual})")
+        os.replace(job["part"], job["path"])
+        os.remove(job["state"])
+
+
+if __name__ == "__main__":
+    from github_utils import STORAGE_REPO
+
+    parser = argparse.ArgumentParser(description="Download release assets in parallel, resumably.")
+    parser.add_argument("patterns", nargs="+", help="Asset names or glob patterns")
+    parser.add_argument("--tag", default="dataset-raw")
+    parser.add_argument("--dir", default="public/datasets")
+    parser.add_argument("--repo", default=STORAGE_REPO)
+    parser.add_argument("--segment-mb", type=float, default=SEGMENT_SIZE / (1024 * 1024))
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    fetcher = ReleaseFetcher(args.repo, segment_size=int(args.segment_mb * 1024 * 1024), workers=args.workers)
+    results = fetcher.fetch(args.tag, args.patterns, args.dir)
+    raise SystemExit(0 if all(r in ("present", "downloaded") for r in results.values()) else 1)
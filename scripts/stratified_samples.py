@@ -0,0 +1,67 @@
+import json
+import os
+
+import pandas as pd
+
+SAMPLE_RATES = (0.001, 0.01, 0.1)
+STRATA = ["state", "source_dataset"]
+MANIFEST = "samples.json"
+
+# Per-source sample files, named after the processed datasets
+DATASET_SOURCES = {"biometric": "Biometric", "demographic": "Demographic", "enrollment": "Enrollment"}
+
+HASH_SCALE = float(2 ** 64)
+
+
+def sample_asset(dataset, rate):
+    return f"sample_{dataset}_{rate * 100:g}pct.csv"
+
+
+def write_samples(master_csv, out_dir, rates=SAMPLE_RATES, chunksize=1_000_000):
+    """
+    Writes deterministic samples of the master CSV stratified by
+    state x source_dataset, in one streaming pass over it.
+
+    Every row gets a fixed 64-bit hash of its contents. At rate r a stratum
+    keeps the rows whose hash falls below r (so each stratum is sampled at r,
+    and smaller samples are subsets of larger ones), plus its lowest-hash row
+    so no stratum is missing from any sample. `sample_weight` is the
+    stratum's rows per sampled row, for scaling sums back up.
+    Returns the manifest.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    top = max(rates)
+    candidates, lowest, counts = [], [], []
+    for chunk in pd.read_csv(master_csv, dtype=str, keep_default_na=False, chunksize=chunksize):
+        header = list(chunk.columns)
+        u = pd.util.hash_pandas_object(chunk, index=False).to_numpy() / HASH_SCALE
+        chunk["_u"] = u
+        counts.append(chunk.groupby(STRATA, sort=False).size())
+        candidates.append(chunk[u < top])
+        lowest.append(chunk.loc[chunk.groupby(STRATA, sort=False)["_u"].idxmin()])
+
+    sizes = pd.concat(counts).groupby(level=[0, 1]).sum().rename("_n")
+    firsts = pd.concat(lowest).sort_values("_u", kind="stable").drop_duplicates(STRATA)
+    # Master file order; a lowest-hash row may also be a candidate
+    pool = pd.concat(candidates + [firsts])
+    pool = pool[~pool.index.duplicated()].sort_index()
+
+    manifest = {"rates": list(rates), "strata": STRATA, "rows": int(sizes.sum()), "files": {}}
+    for rate in rates:
+        chosen = pool[(pool["_u"] < rate) | pool.index.isin(firsts.index)].copy()
+        per_stratum = chosen.groupby(STRATA, sort=False)["_u"].transform("size")
+        stratum_rows = chosen.join(sizes, on=STRATA)["_n"]
+        chosen["sample_weight"] = (stratum_rows / per_stratum).round(4)
+        chosen = chosen[header + ["sample_weight"]]
+
+        datasets = {"master": chosen}
+        for dataset, source in DATASET_SOURCES.items():
+            datasets[dataset] = chosen[chosen["source_dataset"] == source]
+        for dataset, frame in datasets.items():
+            asset = sample_asset(dataset, rate)
+            frame.to_csv(os.path.join(out_dir, asset), index=False)
+            manifest["files"].setdefault(dataset, {})[f"{rate:g}"] = {"asset": asset, "rows": len(frame)}
+
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -1,24 +1,63 @@
 import sys
 import os
+import json
 
-# Add scripts directory to path to import utils
+# Add scripts directory to path to import utils, and the repo root for the change-feed format
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from github_utils import upload_to_release
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.changes import expired_deltas
+from github_utils import delete_release_asset, list_release_assets, upload_to_release
 
 def upload_processed_data():
     files_to_upload = [
         "public/master_dataset_final.csv",
         "public/datasets/biometric_full.csv",
         "public/datasets/enrollment_full.csv",
-        "public/datasets/demographic_full.csv"
+        "public/datasets/demographic_full.csv",
+        "public/processing_report.json",
+        "public/data_quality_report.json",
+        "public/columnar_store.tar.gz"
     ]
+    # Month partitions for incremental refresh; the manifest goes last so it
+    # never lists a month that is not uploaded yet
+    manifest_path = "public/partitions/master_partitions.json"
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        files_to_upload += [os.path.join("public/partitions", p["asset"]) for p in manifest["partitions"]]
+        files_to_upload.append(manifest_path)
+    # Stratified samples, manifest last
+    samples_path = "public/samples/samples.json"
+    if os.path.exists(samples_path):
+        with open(samples_path) as f:
+            samples = json.load(f)
+        files_to_upload += [
+            os.path.join("public/samples", entry["asset"])
+            for by_rate in samples["files"].values() for entry in by_rate.values()
+        ]
+        files_to_upload.append(samples_path)
+    # Change feed: the new delta before the manifest that references it
+    changes_path = "public/changes/dataset_changes.json"
+    if os.path.exists(changes_path):
+        with open(changes_path) as f:
+            changes = json.load(f)
+        latest = changes["history"][-1] if changes["history"] else None
+        if latest and latest["version"] == changes["version"]:
+            files_to_upload.append(os.path.join("public/changes", latest["asset"]))
+        files_to_upload.append(changes_path)
     
     print("Starting upload of processed datasets to GitHub...")
+    uploaded = {}
     for file_path in files_to_upload:
         if os.path.exists(file_path):
-            upload_to_release(file_path, tag_name="dataset-latest")
+            uploaded[file_path] = upload_to_release(file_path, tag_name="dataset-latest")
         else:
             print(f"Warning: File not found {file_path}")
 
+    # Deltas trimmed from the history are only deleted once the manifest no longer lists them
+    if uploaded.get(changes_path):
+        for asset in expired_deltas(changes, list_release_assets("dataset-latest")):
+            delete_release_asset(asset, tag_name="dataset-latest")
+
 if __name__ == "__main__":
     upload_processed_data()
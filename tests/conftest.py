@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The processing scripts import each other as top-level modules, and app.* from the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
@@ -0,0 +1,167 @@
+import asyncio
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+httpx = pytest.importorskip("httpx")
+
+from app.core import cache as cache_module
+from app.core.cache import MemoryCache, RedisCache, TieredCache, UpstashCache, release_version, versioned_key
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def redis_cache(server):
+    return RedisCache(client=fakeredis.FakeAsyncRedis(server=server))
+
+
+def upstash_cache(server):
+    """UpstashCache whose REST calls are answered by a fake Redis server."""
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+    async def handler(request):
+        if request.headers["Authorization"] != "Bearer test-token":
+            return httpx.Response(401, json={"error": "Unauthorized"})
+        result = await redis.execute_command(*json.loads(request.content))
+        return httpx.Response(200, json={"result": result})
+
+    cache = UpstashCache("http://upstash.local/", "test-token")
+    cache._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), headers={"Authorization": "Bearer test-token"}
+    )
+    return cache
+
+
+@pytest.fixture(params=["redis", "upstash"])
+def shared(request):
+    server = fakeredis.FakeServer()
+    backend = redis_cache(server) if request.param == "redis" else upstash_cache(server)
+    backend.server = server
+    return backend
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_shared_hit_and_miss(shared):
+    async def scenario():
+        assert await shared.get("uidai:k") is None
+        await shared.set("uidai:k", {"rows": [1, 2], "name": "Bihar"}, ttl=60)
+        assert await shared.get("uidai:k") == {"rows": [1, 2], "name": "Bihar"}
+        await shared.delete("uidai:k")
+        assert await shared.get("uidai:k") is None
+        await shared.close()
+
+    run(scenario())
+
+
+def test_shared_ttl_is_set_on_the_server(shared):
+    async def scenario():
+        await shared.set("uidai:k", 1, ttl=90)
+        ttl = await fakeredis.FakeAsyncRedis(server=shared.server).ttl("uidai:k")
+        await shared.close()
+        return ttl
+
+    assert 0 < run(scenario()) <= 90
+
+
+def test_memory_cache_expires_and_evicts(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    local = MemoryCache(max_entries=2)
+
+    async def scenario():
+        await local.set("a", 1, ttl=10)
+        await local.set("b", 2, ttl=100)
+        clock.now += 11
+        assert await local.get("a") is None
+        assert await local.get("b") == 2
+        await local.set("c", 3, ttl=100)
+        await local.set("d", 4, ttl=100)
+        # LRU: "b" is the oldest entry once "c" and "d" are in
+        assert await local.get("b") is None
+        assert await local.get("c") == 3
+
+    run(scenario())
+
+
+def test_tiered_fills_local_from_shared(monkeypatch, shared):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    local = MemoryCache()
+    tiered = TieredCache(local, shared, local_ttl=30)
+
+    async def scenario():
+        # Written by another instance: only in the shared tier
+        await shared.set("uidai:k", "value", ttl=600)
+        assert await local.get("uidai:k") is None
+        assert await tiered.get("uidai:k") == "value"
+        assert await local.get("uidai:k") == "value"
+
+        # The local copy lives for local_ttl, then is refilled from the shared tier
+        await shared.set("uidai:k", "newer", ttl=600)
+        assert await tiered.get("uidai:k") == "value"
+        clock.now += 31
+        assert await tiered.get("uidai:k") == "newer"
+
+        # set() writes both tiers, the local one capped at local_ttl
+        await tiered.set("uidai:other", [1], ttl=600)
+        assert await shared.get("uidai:other") == [1]
+        clock.now += 31
+        assert await local.get("uidai:other") is None
+        assert await tiered.get("uidai:other") == [1]
+        await tiered.close()
+
+    run(scenario())
+
+
+def test_tiered_treats_shared_failures_as_misses():
+    class Broken(MemoryCache):
+        name = "broken"
+
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    tiered = TieredCache(MemoryCache(), Broken())
+
+    async def scenario():
+        assert await tiered.get("uidai:k") is None
+        await tiered.set("uidai:k", 1, ttl=60)
+        assert await tiered.get("uidai:k") == 1
+
+    run(scenario())
+
+
+def test_versioned_key_changes_with_release(shared):
+    release = {"id": 1, "assets": [
+        {"id": 11, "updated_at": "2026-01-01T00:00:00Z"},
+        {"id": 12, "updated_at": "2026-01-01T00:00:00Z"},
+    ]}
+    reuploaded = {"id": 1, "assets": [
+        {"id": 11, "updated_at": "2026-01-01T00:00:00Z"},
+        {"id": 13, "updated_at": "2026-02-01T00:00:00Z"},
+    ]}
+    version = release_version(release)
+    assert version == release_version({"id": 1, "assets": release["assets"][::-1]})
+    assert release_version(reuploaded) != version
+
+    tiered = TieredCache(MemoryCache(), shared)
+
+    async def scenario():
+        await tiered.set(versioned_key("rollup", version, "state", "Bihar"), {"total": 5}, ttl=600)
+        assert await tiered.get(versioned_key("rollup", version, "state", "Bihar")) == {"total": 5}
+        assert await tiered.get(versioned_key("rollup", release_version(reuploaded), "state", "Bihar")) is None
+        await tiered.close()
+
+    run(scenario())
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from data_quality import QualityTracker
+
+
+def test_unmapped_spellings_are_kept_per_state():
+    tracker = QualityTracker(top_n=2)
+    counts = pd.Series({
+        ("patna city", "Bihar"): 90,
+        ("gaya town", "Bihar"): 80,
+        ("arah", "Bihar"): 70,
+        ("panjim", "Goa"): 5,
+        ("vasco", "Goa"): 4,
+        ("margao", "Goa"): 3,
+    })
+    tracker.observe_spellings(counts, pd.Series({"orisa": 10}))
+
+    # Goa's spellings are below Bihar's, but its top two survive
+    assert [(d["spelling"], d["state"]) for d in tracker.unmapped_districts] == [
+        ("patna city", "Bihar"), ("gaya town", "Bihar"), ("panjim", "Goa"), ("vasco", "Goa"),
+    ]
+    assert [d["rows"] for d in tracker.unmapped_districts] == [90, 80, 5, 4]
@@ -0,0 +1,30 @@
+import contextlib
+import io
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from check_engine_parity import compare, run_engine
+from generate_synthetic_data import generate
+
+
+@pytest.fixture(scope="module")
+def raw_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("raw")
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Dirty spellings and garbage rows exercise normalization, recovery and filtering
+        generate(6000, str(path), seed=7, dirty_rate=0.2, garbage_rate=0.02)
+    return str(path)
+
+
+def test_duckdb_matches_pandas(raw_dir, tmp_path):
+    outputs = {}
+    for engine in ("pandas", "duckdb"):
+        outputs[engine] = tmp_path / engine
+        outputs[engine].mkdir()
+        options = {"memory_limit": "256MB", "threads": 2} if engine == "duckdb" else None
+        run_engine(engine, raw_dir, str(outputs[engine]), options)
+
+    assert compare(str(outputs["pandas"]), str(outputs["duckdb"])) == []
+
@@ -0,0 +1,129 @@
+import importlib
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from page_decoder import ColumnBuffer, ColumnWriter, decode_page
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+PAGES = ["biometric_offset_0.json", "biometric_offset_3.json"]
+FIELDS = ["date", "state", "district", "pincode", "bio_age_5_17", "bio_age_17_"]
+
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def dataframe_csv(raws):
+    """What the downloader wrote before pages were decoded into columns."""
+    frames = [pd.DataFrame(json.loads(raw).get("records", [])) for raw in raws]
+    return pd.concat(frames).to_csv(index=False)
+
+
+def test_decode_ok_page():
+    page = decode_page(read_page(PAGES[0]))
+    assert (page.status, page.total, page.message) == ("ok", 5, "Resource lists")
+    assert list(page.columns) == FIELDS
+    assert len(page) == 3
+    assert page.columns["district"][1] == "Spsr Nellore, Nellore"
+    assert page.columns["pincode"] == ["560001", "524001", "500047"]
+
+
+def test_decode_error_page():
+    page = decode_page(read_page("error_invalid_key.json"))
+    assert page.status == "error"
+    assert page.message == "Invalid API key"
+    assert page.total == 0
+    assert len(page) == 0
+
+
+def test_decode_with_fixed_fields():
+    raw = json.dumps({"status": "ok", "total": 2, "records": [
+        {"state": "Bihar", "date": "01-03-2025", "extra": "x"},
+        {"date": "02-03-2025"},
+    ]})
+    page = decode_page(raw, fields=["date", "state", "pincode"])
+    # Known fields keep their order, missing values are None, new fields go last
+    assert page.columns == {
+        "date": ["01-03-2025", "02-03-2025"],
+        "state": ["Bihar", None],
+        "pincode": [None, None],
+        "extra": ["x", None],
+    }
+
+
+def test_column_writer_matches_dataframe_path(tmp_path):
+    raws = [read_page(name) for name in PAGES]
+    out = tmp_path / "biometric.csv"
+    writer = ColumnWriter(str(out))
+    for raw in raws:
+        writer.append(decode_page(raw, writer.fields))
+    writer.close()
+
+    assert writer.rows == 5
+    assert out.read_text() == dataframe_csv(raws)
+    assert os.listdir(tmp_path) == ["biometric.csv"]
+
+
+def test_column_writer_rejects_changed_fields(tmp_path):
+    writer = ColumnWriter(str(tmp_path / "out.csv"))
+    writer.append(decode_page(read_page(PAGES[0])))
+    with pytest.raises(ValueError):
+        writer.append(decode_page(json.dumps({"status": "ok", "records": [{"date": "01-03-2025"}]})))
+    writer.abort()
+
+
+def test_column_writer_abort_leaves_no_truncated_file(tmp_path):
+    out = tmp_path / "biometric.csv"
+    out.write_text("previous complete download\n")
+
+    writer = ColumnWriter(str(out))
+    writer.append(decode_page(read_page(PAGES[0])))
+    writer.abort()
+
+    # The earlier file is untouched and no partial file is left behind
+    assert out.read_text() == "previous complete download\n"
+    assert os.listdir(tmp_path) == ["biometric.csv"]
+
+
+def test_column_buffer_matches_dataframe_path():
+    raws = [read_page(name) for name in PAGES]
+    raws.append(json.dumps({"status": "ok", "records": [{"date": "04-03-2025", "state": "Goa", "note": "late field"}]}))
+    buffer = ColumnBuffer()
+    for raw in raws:
+        buffer.append(decode_page(raw, list(buffer.columns) or None))
+
+    assert buffer.rows == 6
+    assert buffer.to_frame().to_csv(index=False) == dataframe_csv(raws)
+
+
+def test_fetch_chunk_handles_error_pages(monkeypatch):
+    monkeypatch.setenv("DATA_GOV_API_KEY", "test-key")
+    download_full_data = importlib.import_module("download_full_data")
+    monkeypatch.setattr(download_full_data.time, "sleep", lambda seconds: None)
+
+    class Response:
+        def __init__(self, content):
+            self.content = content
+
+        def raise_for_status(self):
+            pass
+
+    class Session:
+        def __init__(self, content):
+            self.content = content
+            self.calls = 0
+
+        def get(self, url, params=None, timeout=None):
+            self.calls += 1
+            return Response(self.content)
+
+    page, total = download_full_data.fetch_chunk(Session(read_page(PAGES[0])), "resource", 0, 3)
+    assert total == 5 and list(page.columns) == FIELDS
+
+    session = Session(read_page("error_invalid_key.json"))
+    assert download_full_data.fetch_chunk(session, "resource", 0, 3) == (None, 0)
+    assert session.calls == 3
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from app.core.columnar import ColumnarStore, write_store
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=["date", "state", "district", "pincode", "source_dataset", "total_activity"])
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    # No rows at all in 2025-04
+    rows = [
+        ("2025-03-10", "Bihar", "Patna", 800001, "Biometric", 100),
+        ("2025-03-11", "Bihar", "Gaya", 823001, "Biometric", 50),
+        ("2025-03-12", "Goa", "North Goa", 403001, "Enrollment", 10),
+        ("2025-05-10", "Bihar", "Patna", 800001, "Biometric", 300),
+        ("2025-05-11", "Bihar", "Gaya", 823001, "Biometric", 40),
+        ("2025-05-12", "Goa", "North Goa", 403001, "Enrollment", 20),
+        ("2025-06-10", "Bihar", "Patna", 800001, "Biometric", 150),
+        ("2025-06-11", "Bihar", "Gaya", 823001, "Biometric", 80),
+        ("2025-06-12", "Goa", "North Goa", 403001, "Enrollment", 20),
+    ]
+    path = tmp_path_factory.mktemp("store")
+    write_store(frame(rows), str(path))
+    return ColumnarStore(str(path))
+
+
+def test_period_axis_includes_months_without_data(store):
+    assert store.manifest["rollups"]["months"] == ["2025-03", "2025-04", "2025-05", "2025-06"]
+    assert [r["value"] for r in store.top("state", "total_activity", "2025-04")] == [0, 0]
+
+
+def test_growth_after_a_gap_month_is_not_reported(store):
+    # May follows April, which has no data: nothing to compare with, not March
+    assert store.growth("district", "total_activity", "2025-05") == []
+
+
+def test_growth_compares_consecutive_months(store):
+    results = store.growth("district", "total_activity", "2025-06")
+    assert [(r["district"], r["previous"], r["value"], r["growth"]) for r in results] == [
+        ("Gaya", 40, 80, 1.0),
+        ("North Goa", 20, 20, 0.0),
+        ("Patna", 300, 150, -0.5),
+    ]
+
+
+def test_state_filter(store):
+    districts = store.top("district", "total_activity", "all", state="Bihar")
+    assert [r["district"] for r in districts] == ["Patna", "Gaya"]
+    assert sum(r["share"] for r in districts) == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        store.top("state", "total_activity", "all", state="Bihar")
+    with pytest.raises(ValueError):
+        store.growth("state", "total_activity", "2025-06", state="Bihar")